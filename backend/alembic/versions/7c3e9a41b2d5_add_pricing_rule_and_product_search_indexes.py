@@ -0,0 +1,54 @@
+"""add pricing rule composite index and product trigram indexes
+
+Revision ID: 7c3e9a41b2d5
+Revises: 1fd7e3f3ebb6
+Create Date: 2026-10-16 10:12:44.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e9a41b2d5'
+down_revision = '1fd7e3f3ebb6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 顧客×商品での絞り込みと優先度順ソート用
+    op.create_index(
+        'ix_pricing_rules_customer_product_priority',
+        'pricing_rules',
+        ['customer_id', 'product_id', 'priority'],
+        unique=False
+    )
+    # customer_id 単独のインデックスは複合インデックスの先頭列で代替できるため削除
+    op.execute('DROP INDEX IF EXISTS ix_pricing_rules_customer_id')
+
+    # 商品名・SKUの部分一致検索（LIKE/ILIKE '%...%'）用のトライグラムインデックス
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_products_name_trgm',
+        'products',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_products_sku_trgm',
+        'products',
+        ['sku'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'sku': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_sku_trgm', table_name='products')
+    op.drop_index('ix_products_name_trgm', table_name='products')
+    op.create_index('ix_pricing_rules_customer_id', 'pricing_rules', ['customer_id'], unique=False)
+    op.drop_index('ix_pricing_rules_customer_product_priority', table_name='pricing_rules')
@@ -0,0 +1,46 @@
+"""add generated case_category column to order_items
+
+Revision ID: 9d41f6c2e8a7
+Revises: 7c3e9a41b2d5
+Create Date: 2026-10-16 11:52:07.604113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d41f6c2e8a7'
+down_revision = '7c3e9a41b2d5'
+branch_labels = None
+depends_on = None
+
+
+CASE_CATEGORY_SQL = (
+    "CASE"
+    " WHEN product_type LIKE '%ハードケース%'"
+    " AND (product_type LIKE '%手帳%' OR product_type LIKE '%カバー%' OR product_type LIKE '%mirror%')"
+    " THEN 'both'"
+    " WHEN product_type LIKE '%ハードケース%' THEN 'hard'"
+    " WHEN product_type LIKE '%手帳%' OR product_type LIKE '%カバー%' OR product_type LIKE '%mirror%'"
+    " THEN 'notebook'"
+    " ELSE 'other'"
+    " END"
+)
+
+
+def upgrade() -> None:
+    # STORED生成列のため既存行も追加時に計算される（バックフィル不要、PostgreSQL 12+）
+    op.add_column('order_items', sa.Column(
+        'case_category',
+        sa.String(length=20),
+        sa.Computed(CASE_CATEGORY_SQL, persisted=True),
+        nullable=True,
+        comment='ケース分類（hard/notebook/both/other、product_typeから自動生成）'
+    ))
+    op.create_index(op.f('ix_order_items_case_category'), 'order_items', ['case_category'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_order_items_case_category'), table_name='order_items')
+    op.drop_column('order_items', 'case_category')
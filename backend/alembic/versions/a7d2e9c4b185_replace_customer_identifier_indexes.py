@@ -0,0 +1,43 @@
+"""replace single-column customer_identifiers indexes with a covering index
+
+Revision ID: a7d2e9c4b185
+Revises: f4a8c1d6b392
+Create Date: 2026-10-16 14:19:52.316870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d2e9c4b185'
+down_revision = 'f4a8c1d6b392'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 稼働中のテーブルをロックしないよう CONCURRENTLY で作成（トランザクション外で実行）
+    with op.get_context().autocommit_block():
+        # 顧客ごとの識別情報の取得・重複チェック用（customer_id 単独のインデックスを置き換え）
+        op.create_index(
+            'ix_customer_identifiers_customer_type',
+            'customer_identifiers',
+            ['customer_id', 'identifier_type'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_include=['identifier_value'],
+            postgresql_concurrently=True
+        )
+
+        # uq_identifier_type_value・複合インデックスの先頭列で代替できるため削除
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_customer_identifiers_customer_id')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_customer_identifiers_identifier_type')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_customer_identifiers_identifier_value')
+
+
+def downgrade() -> None:
+    op.create_index('ix_customer_identifiers_identifier_value', 'customer_identifiers', ['identifier_value'], unique=False)
+    op.create_index('ix_customer_identifiers_identifier_type', 'customer_identifiers', ['identifier_type'], unique=False)
+    op.create_index('ix_customer_identifiers_customer_id', 'customer_identifiers', ['customer_id'], unique=False)
+    op.drop_index('ix_customer_identifiers_customer_type', table_name='customer_identifiers')
@@ -0,0 +1,59 @@
+"""add customer/date composite indexes to orders and invoices
+
+Revision ID: b6f2d8e4a913
+Revises: 9d41f6c2e8a7
+Create Date: 2026-10-16 12:31:18.420915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6f2d8e4a913'
+down_revision = '9d41f6c2e8a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 稼働中のテーブルをロックしないよう CONCURRENTLY で作成（トランザクション外で実行）
+    with op.get_context().autocommit_block():
+        # 取引先×期間での受注集計・一覧用
+        op.create_index(
+            'ix_orders_customer_date',
+            'orders',
+            ['customer_id', 'order_date'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+        # 取引先×集計期間、取引先×発行日での請求書検索用
+        op.create_index(
+            'ix_invoices_customer_period',
+            'invoices',
+            ['customer_id', 'period_start', 'period_end'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_invoices_customer_issue',
+            'invoices',
+            ['customer_id', 'issue_date'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+
+        # customer_id 単独のインデックスは複合インデックスの先頭列で代替できるため削除
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_orders_customer_id')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_invoices_customer_id')
+
+
+def downgrade() -> None:
+    op.create_index('ix_invoices_customer_id', 'invoices', ['customer_id'], unique=False)
+    op.create_index('ix_orders_customer_id', 'orders', ['customer_id'], unique=False)
+    op.drop_index('ix_invoices_customer_issue', table_name='invoices')
+    op.drop_index('ix_invoices_customer_period', table_name='invoices')
+    op.drop_index('ix_orders_customer_date', table_name='orders')
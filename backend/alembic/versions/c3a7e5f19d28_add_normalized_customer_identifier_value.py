@@ -0,0 +1,45 @@
+"""add normalized identifier value to customer_identifiers
+
+Revision ID: c3a7e5f19d28
+Revises: b6f2d8e4a913
+Create Date: 2026-10-16 12:48:52.771304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a7e5f19d28'
+down_revision = 'b6f2d8e4a913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 照合用の正規化値（STOREDの生成列、既存行も追加時に計算される）
+    op.add_column(
+        'customer_identifiers',
+        sa.Column(
+            'identifier_value_normalized',
+            sa.String(length=500),
+            sa.Computed("lower(replace(replace(identifier_value, ' ', ''), '　', ''))", persisted=True),
+            nullable=True,
+            comment='正規化した識別情報の値（identifier_valueから自動生成）'
+        )
+    )
+    # 稼働中のテーブルをロックしないよう CONCURRENTLY で作成（トランザクション外で実行）
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_customer_identifiers_type_normalized',
+            'customer_identifiers',
+            ['identifier_type', 'identifier_value_normalized'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customer_identifiers_type_normalized', table_name='customer_identifiers')
+    op.drop_column('customer_identifiers', 'identifier_value_normalized')
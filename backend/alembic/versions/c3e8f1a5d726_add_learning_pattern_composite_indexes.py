@@ -0,0 +1,96 @@
+"""add composite lookup indexes to size/product type patterns
+
+Revision ID: c3e8f1a5d726
+Revises: a7d2e9c4b185
+Create Date: 2026-10-16 18:42:07.315204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8f1a5d726'
+down_revision = 'a7d2e9c4b185'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 稼働中のテーブルをロックしないよう CONCURRENTLY で作成（トランザクション外で実行）
+    with op.get_context().autocommit_block():
+        # 学習時の既存パターン検索（pattern + size [+ device_name]）用
+        op.create_index(
+            'ix_size_patterns_lookup',
+            'size_patterns',
+            ['pattern', 'size', 'device_name'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+        # サイズ別一覧（信頼度順）用
+        op.create_index(
+            'ix_size_patterns_size_confidence',
+            'size_patterns',
+            ['size', 'confidence'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+        # 全件一覧（信頼度・使用回数順）用
+        op.create_index(
+            'ix_size_patterns_ranking',
+            'size_patterns',
+            ['confidence', 'usage_count'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+
+        op.create_index(
+            'ix_product_type_patterns_lookup',
+            'product_type_patterns',
+            ['pattern', 'product_type'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_product_type_patterns_type_confidence',
+            'product_type_patterns',
+            ['product_type', 'confidence'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_product_type_patterns_ranking',
+            'product_type_patterns',
+            ['confidence', 'usage_count'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+
+        # 単独インデックスは複合インデックスの先頭列で代替できるため削除
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_size_patterns_pattern')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_size_patterns_size')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_size_patterns_confidence')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_product_type_patterns_pattern')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_product_type_patterns_product_type')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_product_type_patterns_confidence')
+
+
+def downgrade() -> None:
+    op.create_index('ix_product_type_patterns_confidence', 'product_type_patterns', ['confidence'], unique=False)
+    op.create_index('ix_product_type_patterns_product_type', 'product_type_patterns', ['product_type'], unique=False)
+    op.create_index('ix_product_type_patterns_pattern', 'product_type_patterns', ['pattern'], unique=False)
+    op.create_index('ix_size_patterns_confidence', 'size_patterns', ['confidence'], unique=False)
+    op.create_index('ix_size_patterns_size', 'size_patterns', ['size'], unique=False)
+    op.create_index('ix_size_patterns_pattern', 'size_patterns', ['pattern'], unique=False)
+    op.drop_index('ix_product_type_patterns_ranking', table_name='product_type_patterns')
+    op.drop_index('ix_product_type_patterns_type_confidence', table_name='product_type_patterns')
+    op.drop_index('ix_product_type_patterns_lookup', table_name='product_type_patterns')
+    op.drop_index('ix_size_patterns_ranking', table_name='size_patterns')
+    op.drop_index('ix_size_patterns_size_confidence', table_name='size_patterns')
+    op.drop_index('ix_size_patterns_lookup', table_name='size_patterns')
@@ -0,0 +1,56 @@
+"""convert audit log and import job JSON columns to JSONB
+
+Revision ID: d8b1f4a6c2e7
+Revises: c3a7e5f19d28
+Create Date: 2026-10-16 13:05:26.184733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b1f4a6c2e7'
+down_revision = 'c3a7e5f19d28'
+branch_labels = None
+depends_on = None
+
+
+JSON_COLUMNS = [
+    ('audit_logs', 'diff_json'),
+    ('import_jobs', 'mapping_json'),
+    ('import_jobs', 'warnings'),
+    ('import_jobs', 'errors'),
+    ('import_jobs', 'result_data'),
+]
+
+
+def upgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_type=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::jsonb'
+        )
+
+    op.create_index('ix_audit_logs_diff_json_gin', 'audit_logs', ['diff_json'], unique=False, postgresql_using='gin')
+    op.create_index('ix_import_jobs_errors_gin', 'import_jobs', ['errors'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_import_jobs_errors_gin', table_name='import_jobs')
+    op.drop_index('ix_audit_logs_diff_json_gin', table_name='audit_logs')
+
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using=f'{column}::json'
+        )
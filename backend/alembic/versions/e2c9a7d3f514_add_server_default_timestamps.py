@@ -0,0 +1,49 @@
+"""add server-side defaults to created_at/updated_at
+
+Revision ID: e2c9a7d3f514
+Revises: d8b1f4a6c2e7
+Create Date: 2026-10-16 13:24:41.902376
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c9a7d3f514'
+down_revision = 'd8b1f4a6c2e7'
+branch_labels = None
+depends_on = None
+
+
+# TimestampMixin を使うテーブル
+TIMESTAMP_TABLES = [
+    'audit_logs',
+    'customer_companies',
+    'customer_identifiers',
+    'import_jobs',
+    'invoice_items',
+    'invoices',
+    'issuer_companies',
+    'mapping_templates',
+    'order_items',
+    'orders',
+    'pricing_rules',
+    'products',
+    'users',
+]
+
+# 既存データと同じ naive UTC の現在時刻
+UTC_NOW = sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)")
+
+
+def upgrade() -> None:
+    for table in TIMESTAMP_TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=UTC_NOW, existing_type=sa.DateTime(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    for table in TIMESTAMP_TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=None, existing_type=sa.DateTime(), existing_nullable=False)
@@ -0,0 +1,40 @@
+"""add check constraints to customer_companies and pricing_rules
+
+Revision ID: f4a8c1d6b392
+Revises: e2c9a7d3f514
+Create Date: 2026-10-16 14:02:17.583204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a8c1d6b392'
+down_revision = 'e2c9a7d3f514'
+branch_labels = None
+depends_on = None
+
+
+# (テーブル, 制約名, 条件)
+CHECK_CONSTRAINTS = [
+    ('customer_companies', 'ck_customer_companies_closing_day', 'closing_day BETWEEN 0 AND 31'),
+    ('customer_companies', 'ck_customer_companies_payment_day', 'payment_day BETWEEN 0 AND 31'),
+    ('customer_companies', 'ck_customer_companies_payment_month_offset', 'payment_month_offset BETWEEN 0 AND 12'),
+    ('pricing_rules', 'ck_pricing_rules_target', 'product_id IS NOT NULL OR product_type_keyword IS NOT NULL'),
+]
+
+
+def upgrade() -> None:
+    # NOT VALID で追加して書き込みを長時間ロックせず、既存行の検証は別トランザクションで行う
+    # （同じトランザクション内で VALIDATE すると ADD の排他ロックを保持したまま全行を走査する）
+    for table, name, condition in CHECK_CONSTRAINTS:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} CHECK ({condition}) NOT VALID')
+    with op.get_context().autocommit_block():
+        for table, name, _ in CHECK_CONSTRAINTS:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+
+
+def downgrade() -> None:
+    for table, name, _ in reversed(CHECK_CONSTRAINTS):
+        op.drop_constraint(name, table, type_='check')
@@ -1,14 +1,16 @@
 """Customer Company API endpoints."""
 
 from typing import List, Optional, Dict
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query, Body
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exists, or_, select
 from pydantic import BaseModel
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.cache import invalidate_cache
+from app.core.http_cache import make_etag, is_not_modified, set_cache_headers, not_modified
 from app.models.customer_company import CustomerCompany
-from app.models.customer_identifier import CustomerIdentifier
+from app.models.customer_identifier import CustomerIdentifier, normalize_identifier_value
 from app.schemas.customer_company import (
     CustomerCompanyCreate,
     CustomerCompanyUpdate,
@@ -20,45 +22,55 @@ router = APIRouter()
 
 
 @router.get("/", response_model=List[CustomerCompanyResponse])
-def list_customers(
+async def list_customers(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None, description="顧客名で検索"),
     is_individual: Optional[bool] = Query(None, description="個人フラグでフィルター"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get customers list."""
-    query = db.query(CustomerCompany)
+    query = select(CustomerCompany)
 
     if search:
-        query = query.filter(CustomerCompany.name.ilike(f"%{search}%"))
+        query = query.where(CustomerCompany.name.ilike(f"%{search}%"))
 
     if is_individual is not None:
-        query = query.filter(CustomerCompany.is_individual == is_individual)
+        query = query.where(CustomerCompany.is_individual == is_individual)
 
     query = query.order_by(CustomerCompany.name)
-    customers = query.offset(skip).limit(limit).all()
+    customers = (await db.scalars(query.offset(skip).limit(limit))).all()
 
     return customers
 
 
 @router.get("/{customer_id}", response_model=CustomerCompanyResponse)
-def get_customer(customer_id: int, db: Session = Depends(get_db)):
+async def get_customer(
+    customer_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get customer by ID."""
-    customer = db.query(CustomerCompany).filter(CustomerCompany.id == customer_id).first()
+    customer = await db.get(CustomerCompany, customer_id)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Customer {customer_id} not found"
         )
 
+    etag = make_etag(customer.id, customer.updated_at, weak=True)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+
     return customer
 
 
 @router.post("/", response_model=CustomerCompanyResponse, status_code=status.HTTP_201_CREATED)
-def create_customer(
+async def create_customer(
     customer_data: CustomerCompanyCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create new customer."""
     # Generate customer code if not provided
@@ -72,13 +84,12 @@ def create_customer(
         customer_code = f"CUS{timestamp}{random_suffix}"
 
         # Ensure uniqueness
-        while db.query(CustomerCompany).filter(CustomerCompany.code == customer_code).first():
+        while await db.scalar(select(exists().where(CustomerCompany.code == customer_code))):
             random_suffix = random.randint(1000, 9999)
             customer_code = f"CUS{timestamp}{random_suffix}"
     else:
         # Check if code already exists
-        existing = db.query(CustomerCompany).filter(CustomerCompany.code == customer_code).first()
-        if existing:
+        if await db.scalar(select(exists().where(CustomerCompany.code == customer_code))):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Customer with code '{customer_code}' already exists"
@@ -105,20 +116,20 @@ def create_customer(
     )
 
     db.add(customer)
-    db.commit()
-    db.refresh(customer)
+    await db.commit()
+    await db.refresh(customer)
 
     return customer
 
 
-@router.put("/{customer_id}", response_model=CustomerCompanyResponse)
-def update_customer(
+@router.put("/{customer_id}", response_model=CustomerCompanyResponse, dependencies=[Depends(invalidate_cache("/api/v1/products*", "/api/v1/pricing-rules*"))])
+async def update_customer(
     customer_id: int,
     customer_data: CustomerCompanyUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update customer."""
-    customer = db.query(CustomerCompany).filter(CustomerCompany.id == customer_id).first()
+    customer = await db.get(CustomerCompany, customer_id)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -127,8 +138,7 @@ def update_customer(
 
     # Check if updating code to existing code
     if customer_data.code and customer_data.code != customer.code:
-        existing = db.query(CustomerCompany).filter(CustomerCompany.code == customer_data.code).first()
-        if existing:
+        if await db.scalar(select(exists().where(CustomerCompany.code == customer_data.code))):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Customer with code '{customer_data.code}' already exists"
@@ -139,24 +149,25 @@ def update_customer(
     for field, value in update_data.items():
         setattr(customer, field, value)
 
-    db.commit()
-    db.refresh(customer)
+    await db.commit()
+    await db.refresh(customer)
 
     return customer
 
 
-@router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_customer(customer_id: int, db: Session = Depends(get_db)):
+@router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(invalidate_cache("/api/v1/products*", "/api/v1/pricing-rules*"))])
+async def delete_customer(customer_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete customer."""
-    customer = db.query(CustomerCompany).filter(CustomerCompany.id == customer_id).first()
+    customer = await db.get(CustomerCompany, customer_id)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Customer {customer_id} not found"
         )
 
-    db.delete(customer)
-    db.commit()
+    # 削除時のカスケード処理で関連行の遅延ロードが発生するため同期Sessionで実行
+    await db.run_sync(lambda session: session.delete(customer))
+    await db.commit()
 
     return None
 
@@ -185,9 +196,9 @@ class DetectCustomerResponse(BaseModel):
 
 
 @router.post("/detect", response_model=DetectCustomerResponse)
-def detect_customer(
+async def detect_customer(
     request: DetectCustomerRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """CSVデータから顧客を自動判別
 
@@ -211,15 +222,15 @@ def detect_customer(
 
     # 各識別情報でCustomerIdentifierテーブルを検索
     for identifier_type, identifier_value in search_criteria:
-        match = db.query(CustomerIdentifier).filter(
-            CustomerIdentifier.identifier_type == identifier_type,
-            CustomerIdentifier.identifier_value == identifier_value
-        ).first()
+        match = await db.scalar(
+            select(CustomerIdentifier).where(
+                CustomerIdentifier.identifier_type == identifier_type,
+                CustomerIdentifier.identifier_value_normalized == normalize_identifier_value(identifier_value)
+            ).order_by(CustomerIdentifier.id).limit(1)
+        )
 
         if match:
-            customer = db.query(CustomerCompany).filter(
-                CustomerCompany.id == match.customer_id
-            ).first()
+            customer = await db.get(CustomerCompany, match.customer_id)
 
             if customer:
                 return DetectCustomerResponse(
@@ -237,19 +248,18 @@ def detect_customer(
 
 
 @router.post("/{customer_id}/identifiers")
-def save_customer_identifiers(
+async def save_customer_identifiers(
     customer_id: int,
     identifiers: CustomerIdentifierData,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """顧客の識別情報を保存
 
     手動で顧客を選択した際に、CSVから抽出した識別情報を保存します。
     次回以降の自動判別に使用されます。
     """
-    # 顧客の存在確認
-    customer = db.query(CustomerCompany).filter(CustomerCompany.id == customer_id).first()
-    if not customer:
+    # 顧客の存在確認（行は使わないためEXISTSのみ）
+    if not await db.scalar(select(exists().where(CustomerCompany.id == customer_id))):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Customer {customer_id} not found"
@@ -272,11 +282,11 @@ def save_customer_identifiers(
 
     for identifier_type, identifier_value in identifier_list:
         # 既存の識別情報をチェック（重複を避ける）
-        existing = db.query(CustomerIdentifier).filter(
-            CustomerIdentifier.customer_id == customer_id,
+        # 正規化後の値で比較し、表記ゆれの同一識別情報を別の顧客にも紐付けない
+        existing = await db.scalar(select(exists().where(
             CustomerIdentifier.identifier_type == identifier_type,
-            CustomerIdentifier.identifier_value == identifier_value
-        ).first()
+            CustomerIdentifier.identifier_value_normalized == normalize_identifier_value(identifier_value)
+        )))
 
         if not existing:
             new_identifier = CustomerIdentifier(
@@ -287,7 +297,7 @@ def save_customer_identifiers(
             db.add(new_identifier)
             saved_count += 1
 
-    db.commit()
+    await db.commit()
 
     return {
         "success": True,
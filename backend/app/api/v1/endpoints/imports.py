@@ -14,6 +14,7 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.cache import invalidate_cache
 
 logger = logging.getLogger(__name__)
 from app.models.import_job import ImportJob
@@ -61,7 +62,7 @@ async def upload_file(
     """
     try:
         # Validate file extension
-        file_ext = Path(file.filename).suffix.lower()
+        file_ext = FileParserFactory.get_extension(Path(file.filename))
         if not FileParserFactory.is_supported(Path(file.filename)):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -110,7 +111,7 @@ async def preview_parse(
     try:
         # Reconstruct file path from upload_id
         upload_dir = Path(tempfile.gettempdir()) / "accusync_uploads"
-        file_ext = Path(request.filename).suffix.lower()
+        file_ext = FileParserFactory.get_extension(Path(request.filename))
         file_path = upload_dir / f"{request.upload_id}{file_ext}"
 
         if not file_path.exists():
@@ -154,15 +155,16 @@ async def preview_parse(
             )
 
         # Limit data for preview
-        preview_data = parse_result.data[:request.preview_rows]
+        preview_data = parse_result.head(request.preview_rows)
 
         # Extract keywords from product name for each row
         # 機種検出とサイズ抽出を実行（デザインマスター連携も含む）
         device_detector = DeviceDetectionService(db)
         device_master_service = DeviceMasterService(db)
-        product_type_learning_service = ProductTypeLearningService(db)
-        device_learning_service = DeviceLearningService(db)
-        size_learning_service = SizeLearningService(db)
+        # 学習パターンの使用回数は行ごとにコミットせず、ループ後にまとめて書き込む
+        product_type_learning_service = ProductTypeLearningService(db, defer_usage_updates=True)
+        device_learning_service = DeviceLearningService(db, defer_usage_updates=True)
+        size_learning_service = SizeLearningService(db, defer_usage_updates=True)
         rakuten_sku_service = RakutenSKUService()
         supabase_service = SupabaseService()
 
@@ -398,6 +400,10 @@ async def preview_parse(
                 except Exception as e:
                     logger.warning(f"⚠️ 価格マトリクス検索エラー: {str(e)}")
 
+        product_type_learning_service.flush_usage_updates()
+        device_learning_service.flush_usage_updates()
+        size_learning_service.flush_usage_updates()
+
         # Add extracted_memo, detected_brand, detected_device, detected_size, matrix_price, price_source to columns if not present
         columns_with_extras = parse_result.columns.copy()
         if 'extracted_memo' not in columns_with_extras:
@@ -444,7 +450,7 @@ async def create_import_job(
     try:
         # Verify upload exists
         upload_dir = Path(tempfile.gettempdir()) / "accusync_uploads"
-        file_ext = Path(request.filename).suffix.lower()
+        file_ext = FileParserFactory.get_extension(Path(request.filename))
         file_path = upload_dir / f"{request.upload_id}{file_ext}"
 
         if not file_path.exists():
@@ -529,7 +535,7 @@ async def list_import_jobs(
     return [ImportJobResponse.from_orm(job) for job in jobs]
 
 
-@router.post("/jobs/{job_id}/import", response_model=ImportDataResponse)
+@router.post("/jobs/{job_id}/import", response_model=ImportDataResponse, dependencies=[Depends(invalidate_cache("/api/v1/products*", "/api/v1/pricing-rules*", "/api/v1/product-types*", "/api/v1/stats*", "/api/v1/settings/stats*"))])
 async def import_data(
     job_id: int,
     request: ImportDataRequest,
@@ -610,7 +616,7 @@ async def delete_import_job(
     # Clean up uploaded file
     try:
         upload_dir = Path(tempfile.gettempdir()) / "accusync_uploads"
-        file_ext = Path(job.filename).suffix.lower()
+        file_ext = FileParserFactory.get_extension(Path(job.filename))
         file_path = upload_dir / f"{job.upload_id}{file_ext}"
         if file_path.exists():
             os.remove(file_path)
@@ -3,10 +3,11 @@ Invoice API Endpoints - 請求書API
 """
 
 from typing import List, Optional
-from datetime import date
+from datetime import date, datetime
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from pydantic import BaseModel, Field
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session, selectinload
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.core.database import get_db
 from app.models.invoice import Invoice, InvoiceItem
@@ -16,6 +17,13 @@ from app.services.invoice_service import InvoiceService
 
 router = APIRouter()
 
+# 請求書ステータス
+INVOICE_STATUS_ORDER = ('draft', 'issued', 'paid', 'void')
+VALID_INVOICE_STATUSES = frozenset(INVOICE_STATUS_ORDER)
+
+# 削除不可の請求書ステータス
+UNDELETABLE_INVOICE_STATUSES = ('issued', 'paid')
+
 
 # Pydantic schemas
 class InvoiceItemResponse(BaseModel):
@@ -30,8 +38,7 @@ class InvoiceItemResponse(BaseModel):
     tax_amount: float
     total_in_tax: float
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class InvoiceResponse(BaseModel):
@@ -51,11 +58,10 @@ class InvoiceResponse(BaseModel):
     notes: Optional[str]
     pdf_url: Optional[str]
     items: List[InvoiceItemResponse] = []
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class InvoiceCreateRequest(BaseModel):
@@ -165,7 +171,8 @@ def list_invoices(
         skip: スキップ件数
         limit: 取得件数上限
     """
-    query = db.query(Invoice)
+    # 明細はIN句の1クエリで一括ロード（joinedloadは明細数だけ行が増えるため使わない）
+    query = db.query(Invoice).options(selectinload(Invoice.items))
 
     if customer_id:
         query = query.filter(Invoice.customer_id == customer_id)
@@ -189,7 +196,9 @@ def get_invoice(
     """
     請求書詳細を取得
     """
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    invoice = db.query(Invoice).options(
+        selectinload(Invoice.items)
+    ).filter(Invoice.id == invoice_id).first()
 
     if not invoice:
         raise HTTPException(
@@ -215,31 +224,43 @@ def update_invoice(
         notes: 備考（任意）
         status_update: ステータス更新（任意）: draft, issued, paid, void
     """
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
-
-    if not invoice:
+    if status_update is not None and status_update not in VALID_INVOICE_STATUSES:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"請求書ID {invoice_id} が見つかりません"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"無効なステータス: {status_update}。有効な値: {', '.join(INVOICE_STATUS_ORDER)}"
         )
 
     # 更新
+    values = {}
     if notes is not None:
-        invoice.notes = notes
-
+        values['notes'] = notes
     if status_update is not None:
-        valid_statuses = ['draft', 'issued', 'paid', 'void']
-        if status_update not in valid_statuses:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"無効なステータス: {status_update}。有効な値: {', '.join(valid_statuses)}"
-            )
-        invoice.status = status_update
+        values['status'] = status_update
+
+    if values:
+        # UPDATE ... RETURNING で更新と取得を1往復で実行
+        invoice = db.execute(
+            update(Invoice)
+            .where(Invoice.id == invoice_id)
+            .values(**values)
+            .returning(Invoice)
+            # セッション内に既に読み込まれていてもRETURNINGの値で上書きする
+            .execution_options(populate_existing=True)
+        ).scalar_one_or_none()
+    else:
+        invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
 
-    db.commit()
-    db.refresh(invoice)
+    if not invoice:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"請求書ID {invoice_id} が見つかりません"
+        )
 
-    return invoice
+    # RETURNINGで取得した値からコミット前にレスポンスを組み立てる（コミット後の失効による再SELECTを避ける）
+    response = InvoiceResponse.model_validate(invoice)
+    if values:
+        db.commit()
+    return response
 
 
 @router.delete("/{invoice_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -252,22 +273,41 @@ def delete_invoice(
 
     ステータスが'issued', 'paid'の請求書は削除できません。
     """
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
-
-    if not invoice:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"請求書ID {invoice_id} が見つかりません"
-        )
+    # 削除可能な請求書のみを対象とする条件付きDELETE（事前SELECT不要）
+    deletable_conditions = (
+        Invoice.id == invoice_id,
+        Invoice.status.notin_(UNDELETABLE_INVOICE_STATUSES)
+    )
+
+    # 明細はFKで参照されているため先に削除
+    db.execute(
+        delete(InvoiceItem)
+        .where(InvoiceItem.invoice_id.in_(select(Invoice.id).where(*deletable_conditions)))
+        .execution_options(synchronize_session=False)
+    )
+    result = db.execute(
+        delete(Invoice)
+        .where(*deletable_conditions)
+        .execution_options(synchronize_session=False)
+    )
+
+    if result.rowcount == 0:
+        db.rollback()
+
+        # 削除できなかった場合のみ、404と400を区別するためステータスを取得
+        current_status = db.query(Invoice.status).filter(Invoice.id == invoice_id).scalar()
+        if current_status is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"請求書ID {invoice_id} が見つかりません"
+            )
 
-    # 発行済み・支払済みの請求書は削除不可
-    if invoice.status in ['issued', 'paid']:
+        # 発行済み・支払済みの請求書は削除不可
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"ステータスが'{invoice.status}'の請求書は削除できません"
+            detail=f"ステータスが'{current_status}'の請求書は削除できません"
         )
 
-    db.delete(invoice)
     db.commit()
 
 
@@ -2,12 +2,16 @@
 Mapping API endpoints.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional, Sequence
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.core.database import get_db
+from app.core.http_cache import make_etag, is_not_modified, set_cache_headers, not_modified
 from app.models.mapping_template import MappingTemplate
 from app.constants.mapping_fields import (
     STANDARD_FIELDS,
@@ -57,51 +61,50 @@ class MappingTemplateResponse(BaseModel):
     column_mapping: dict
     is_default: bool
     is_active: bool
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-@router.get("/fields", response_model=MappingFieldsResponse)
-async def get_mapping_fields():
-    """
-    利用可能なマッピングフィールド一覧を取得
-    """
-    required_keys = get_required_fields()
-    optional_keys = get_optional_fields()
-
-    required_fields = [
+def _build_field_infos(keys: Sequence[str], required: bool) -> List[FieldInfo]:
+    """STANDARD_FIELDSからFieldInfoリストを構築"""
+    return [
         FieldInfo(
             key=key,
             label=STANDARD_FIELDS[key]["label"],
-            required=True,
+            required=required,
             description=STANDARD_FIELDS[key]["description"],
             aliases=STANDARD_FIELDS[key]["aliases"]
         )
-        for key in required_keys
+        for key in keys
     ]
 
-    optional_fields = [
-        FieldInfo(
-            key=key,
-            label=STANDARD_FIELDS[key]["label"],
-            required=False,
-            description=STANDARD_FIELDS[key]["description"],
-            aliases=STANDARD_FIELDS[key]["aliases"]
-        )
-        for key in optional_keys
-    ]
 
-    return MappingFieldsResponse(
-        required_fields=required_fields,
-        optional_fields=optional_fields
-    )
+# フィールド定義は静的なため、インポート時に一度だけ構築する
+_MAPPING_FIELDS_RESPONSE = MappingFieldsResponse(
+    required_fields=_build_field_infos(get_required_fields(), required=True),
+    optional_fields=_build_field_infos(get_optional_fields(), required=False)
+)
+_MAPPING_FIELDS_ETAG = make_etag(STANDARD_FIELDS)
+
 
+@router.get("/fields", response_model=MappingFieldsResponse)
+async def get_mapping_fields(request: Request, response: Response):
+    """
+    利用可能なマッピングフィールド一覧を取得
+    """
+    if is_not_modified(request, _MAPPING_FIELDS_ETAG):
+        return not_modified(_MAPPING_FIELDS_ETAG)
 
-@router.get("/templates", response_model=List[MappingTemplateResponse])
+    set_cache_headers(response, _MAPPING_FIELDS_ETAG)
+    return _MAPPING_FIELDS_RESPONSE
+
+
+@router.get("/templates", response_model=List[MappingTemplateResponse], response_class=ORJSONResponse)
 async def list_templates(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     is_active: Optional[bool] = None,
     customer_id: Optional[int] = None
@@ -122,6 +125,16 @@ async def list_templates(
                 (MappingTemplate.customer_id == customer_id) | (MappingTemplate.customer_id.is_(None))
             )
 
+        # 件数と最終更新日時から弱いETagを生成（追加・更新・削除で変化）
+        last_updated, total = query.with_entities(
+            func.max(MappingTemplate.updated_at),
+            func.count(MappingTemplate.id)
+        ).one()
+        etag = make_etag(last_updated, total, weak=True)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        set_cache_headers(response, etag)
+
         templates = query.order_by(
             MappingTemplate.is_default.desc(),
             MappingTemplate.created_at.desc()
@@ -138,8 +151,8 @@ async def list_templates(
                 column_mapping=t.column_mapping,
                 is_default=t.is_default,
                 is_active=t.is_active,
-                created_at=t.created_at.isoformat() if t.created_at else "",
-                updated_at=t.updated_at.isoformat() if t.updated_at else ""
+                created_at=t.created_at,
+                updated_at=t.updated_at
             )
             for t in templates
         ]
@@ -153,6 +166,8 @@ async def list_templates(
 @router.get("/templates/{template_id}", response_model=MappingTemplateResponse)
 async def get_template(
     template_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
@@ -169,6 +184,11 @@ async def get_template(
                 detail=f"Template {template_id} not found"
             )
 
+        etag = make_etag(template.id, template.updated_at, weak=True)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        set_cache_headers(response, etag)
+
         return MappingTemplateResponse(
             id=template.id,
             template_name=template.template_name,
@@ -178,8 +198,8 @@ async def get_template(
             column_mapping=template.column_mapping,
             is_default=template.is_default,
             is_active=template.is_active,
-            created_at=template.created_at.isoformat() if template.created_at else "",
-            updated_at=template.updated_at.isoformat() if template.updated_at else ""
+            created_at=template.created_at,
+            updated_at=template.updated_at
         )
     except HTTPException:
         raise
@@ -209,9 +229,7 @@ async def create_template(
         else:
             existing_query = existing_query.filter(MappingTemplate.customer_id.is_(None))
 
-        existing = existing_query.first()
-
-        if existing:
+        if db.query(existing_query.exists()).scalar():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Template '{request.template_name}' already exists for this customer"
@@ -227,7 +245,8 @@ async def create_template(
             else:
                 default_query = default_query.filter(MappingTemplate.customer_id.is_(None))
 
-            default_query.update({"is_default": False})
+            # 一括UPDATEのみ発行（セッション内オブジェクトの同期は不要）
+            default_query.update({"is_default": False}, synchronize_session=False)
 
         # 新しいテンプレート作成
         template = MappingTemplate(
@@ -254,8 +273,8 @@ async def create_template(
             column_mapping=template.column_mapping,
             is_default=template.is_default,
             is_active=template.is_active,
-            created_at=template.created_at.isoformat() if template.created_at else "",
-            updated_at=template.updated_at.isoformat() if template.updated_at else ""
+            created_at=template.created_at,
+            updated_at=template.updated_at
         )
     except HTTPException:
         raise
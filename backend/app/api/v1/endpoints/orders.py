@@ -2,24 +2,29 @@
 Orders API endpoints.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from decimal import Decimal
 
 from app.core.database import get_db
+from app.core.cache import invalidate_cache
 from app.models.order import Order, OrderItem
 from app.models.customer_company import CustomerCompany
 from app.models.issuer_company import IssuerCompany
 from app.models.product import Product
+from app.schemas.common import DecimalStr
 from app.services.product_type_learning_service import ProductTypeLearningService
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 router = APIRouter()
 
+# 金額の最小単位（Numeric(15, 2)）
+_MINOR_UNIT = Decimal('0.01')
+
 
 class OrderItemResponse(BaseModel):
     """Order item response."""
@@ -28,17 +33,16 @@ class OrderItemResponse(BaseModel):
     product_name: str
     product_sku: str
     qty: int
-    unit_price: Decimal
-    subtotal_ex_tax: Decimal
-    tax_rate: Decimal
-    tax_amount: Decimal
-    total_in_tax: Decimal
+    unit_price: DecimalStr
+    subtotal_ex_tax: DecimalStr
+    tax_rate: DecimalStr
+    tax_amount: DecimalStr
+    total_in_tax: DecimalStr
     product_type: Optional[str] = None
     device_info: Optional[str] = None
     size_info: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OrderResponse(BaseModel):
@@ -55,73 +59,203 @@ class OrderResponse(BaseModel):
     source: str
     memo: str | None
     items: List[OrderItemResponse]
-    total_amount: Decimal
+    total_amount: DecimalStr
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OrderListRow(BaseModel):
+    """Lightweight order row (summary columns only)."""
+    id: int
+    order_no: str
+    order_date: date
+    customer_id: int
+    customer_name: str
+    customer_code: str
+    issuer_id: int | None
+    issuer_name: str | None
+    source: str
+    item_count: int
+    total_amount: DecimalStr
 
 
 class OrderSummary(BaseModel):
     """Order summary statistics."""
     total_orders: int
-    total_amount: Decimal
+    total_amount: DecimalStr
     customer_count: int
 
 
-@router.get("/", response_model=List[OrderResponse])
+def _list_order_rows(
+    db: Session,
+    customer_id: Optional[int],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    limit: int
+) -> List[OrderListRow]:
+    """
+    Fetch order summary rows with a single column-projection query.
+
+    Skips ORM instance materialization; item totals are aggregated in SQL.
+    """
+    totals = (
+        select(
+            OrderItem.order_id,
+            func.count(OrderItem.id).label("item_count"),
+            func.coalesce(func.sum(OrderItem.total_in_tax), 0).label("total_amount")
+        )
+        .group_by(OrderItem.order_id)
+        .subquery()
+    )
+
+    stmt = (
+        select(
+            Order.id,
+            Order.order_no,
+            Order.order_date,
+            Order.customer_id,
+            CustomerCompany.name.label("customer_name"),
+            CustomerCompany.code.label("customer_code"),
+            Order.issuer_company_id.label("issuer_id"),
+            IssuerCompany.name.label("issuer_name"),
+            Order.source,
+            func.coalesce(totals.c.item_count, 0).label("item_count"),
+            func.coalesce(totals.c.total_amount, 0).label("total_amount")
+        )
+        .outerjoin(CustomerCompany, CustomerCompany.id == Order.customer_id)
+        .outerjoin(IssuerCompany, IssuerCompany.id == Order.issuer_company_id)
+        .outerjoin(totals, totals.c.order_id == Order.id)
+    )
+
+    if customer_id:
+        stmt = stmt.where(Order.customer_id == customer_id)
+
+    if start_date:
+        stmt = stmt.where(Order.order_date >= start_date)
+
+    if end_date:
+        stmt = stmt.where(Order.order_date <= end_date)
+
+    stmt = stmt.order_by(Order.order_date.desc(), Order.id.desc()).limit(limit)
+
+    return [
+        OrderListRow(
+            id=row.id,
+            order_no=row.order_no,
+            order_date=row.order_date,
+            customer_id=row.customer_id,
+            customer_name=row.customer_name or "Unknown",
+            customer_code=row.customer_code or "",
+            issuer_id=row.issuer_id,
+            issuer_name=row.issuer_name,
+            source=row.source,
+            item_count=row.item_count,
+            total_amount=row.total_amount
+        )
+        for row in db.execute(stmt)
+    ]
+
+
+@router.get("/", response_model=Union[List[OrderResponse], List[OrderListRow]])
 async def list_orders(
     db: Session = Depends(get_db),
     customer_id: Optional[int] = Query(None, description="Filter by customer ID"),
     start_date: Optional[date] = Query(None, description="Filter by start date"),
     end_date: Optional[date] = Query(None, description="Filter by end date"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of orders to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of orders to return"),
+    detailed: bool = Query(True, description="Include order items (false returns summary columns only)")
 ):
     """
     Get list of orders with filters.
     """
     try:
-        query = db.query(Order)
+        if not detailed:
+            return _list_order_rows(db, customer_id, start_date, end_date, limit)
+
+        # レスポンスに必要な列だけを取得（ORMインスタンスは生成しない）
+        query = select(
+            Order.id,
+            Order.order_no,
+            Order.order_date,
+            Order.customer_id,
+            Order.issuer_company_id,
+            Order.source,
+            Order.memo
+        )
 
         # Apply filters
         if customer_id:
-            query = query.filter(Order.customer_id == customer_id)
+            query = query.where(Order.customer_id == customer_id)
         
         if start_date:
-            query = query.filter(Order.order_date >= start_date)
+            query = query.where(Order.order_date >= start_date)
         
         if end_date:
-            query = query.filter(Order.order_date <= end_date)
+            query = query.where(Order.order_date <= end_date)
 
         # Order by date descending
         query = query.order_by(Order.order_date.desc(), Order.id.desc())
 
         # Apply limit
-        orders = query.limit(limit).all()
+        orders = db.execute(query.limit(limit)).all()
+
+        # Batch-load related rows with one IN-list query per table (no per-row lookups)
+        order_ids = [o.id for o in orders]
+        customer_ids = {o.customer_id for o in orders}
+        issuer_ids = {o.issuer_company_id for o in orders if o.issuer_company_id}
+
+        customers = {
+            c.id: c for c in db.execute(
+                select(
+                    CustomerCompany.id,
+                    CustomerCompany.name,
+                    CustomerCompany.code,
+                    CustomerCompany.is_individual
+                ).where(CustomerCompany.id.in_(customer_ids))
+            )
+        } if customer_ids else {}
+        issuers = {
+            i.id: i for i in db.execute(
+                select(IssuerCompany.id, IssuerCompany.name).where(IssuerCompany.id.in_(issuer_ids))
+            )
+        } if issuer_ids else {}
+
+        items_by_order = {order_id: [] for order_id in order_ids}
+        if order_ids:
+            for item in db.execute(
+                select(
+                    OrderItem.id,
+                    OrderItem.order_id,
+                    OrderItem.product_id,
+                    OrderItem.qty,
+                    OrderItem.unit_price,
+                    OrderItem.subtotal_ex_tax,
+                    OrderItem.tax_rate,
+                    OrderItem.tax_amount,
+                    OrderItem.total_in_tax
+                ).where(OrderItem.order_id.in_(order_ids)).order_by(OrderItem.id)
+            ):
+                items_by_order[item.order_id].append(item)
+
+        product_ids = {item.product_id for items in items_by_order.values() for item in items}
+        products = {
+            p.id: p for p in db.execute(
+                select(Product.id, Product.name, Product.sku).where(Product.id.in_(product_ids))
+            )
+        } if product_ids else {}
 
         # Build response
         result = []
         for order in orders:
-            # Get customer info
-            customer = db.query(CustomerCompany).filter(
-                CustomerCompany.id == order.customer_id
-            ).first()
-
-            # Get issuer info
-            issuer = db.query(IssuerCompany).filter(
-                IssuerCompany.id == order.issuer_company_id
-            ).first()
-
-            # Get order items
-            items_query = db.query(OrderItem).filter(
-                OrderItem.order_id == order.id
-            ).all()
+            customer = customers.get(order.customer_id)
+            issuer = issuers.get(order.issuer_company_id)
+            items_query = items_by_order[order.id]
 
             items = []
-            total_amount = Decimal('0')
+            # 合計は整数（銭単位）で加算し、最後にDecimalへ戻す
+            total_minor = 0
             for item in items_query:
-                product = db.query(Product).filter(
-                    Product.id == item.product_id
-                ).first()
+                product = products.get(item.product_id)
 
                 items.append(OrderItemResponse(
                     id=item.id,
@@ -135,7 +269,7 @@ async def list_orders(
                     tax_amount=item.tax_amount,
                     total_in_tax=item.total_in_tax
                 ))
-                total_amount += item.total_in_tax
+                total_minor += int(item.total_in_tax.scaleb(2))
 
             result.append(OrderResponse(
                 id=order.id,
@@ -150,7 +284,7 @@ async def list_orders(
                 source=order.source,
                 memo=order.memo,
                 items=items,
-                total_amount=total_amount
+                total_amount=(Decimal(total_minor) / 100).quantize(_MINOR_UNIT)
             ))
 
         return result
@@ -226,7 +360,7 @@ class UpdateProductTypeRequest(BaseModel):
     product_type: str
 
 
-@router.put("/items/{order_item_id}/product-type")
+@router.put("/items/{order_item_id}/product-type", dependencies=[Depends(invalidate_cache("/api/v1/product-types*", "/api/v1/stats*"))])
 async def update_product_type(
     order_item_id: int,
     request: UpdateProductTypeRequest,
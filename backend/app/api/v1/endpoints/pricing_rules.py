@@ -2,13 +2,19 @@
 
 from typing import List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert, lambda_stmt
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
 
 from app.core.database import get_db
+from app.core.cache import cache_response, invalidate_cache
+from app.core.http_cache import make_etag, is_not_modified, set_cache_headers, not_modified
 from app.models.pricing_rule import PricingRule
 from app.models.customer_company import CustomerCompany
 from app.models.product import Product
+from app.services.pricing_service import PricingService
 from app.schemas.pricing_rule import (
     PricingRuleCreate,
     PricingRuleUpdate,
@@ -18,8 +24,12 @@ from app.schemas.pricing_rule import (
 
 router = APIRouter()
 
+# レスポンスキャッシュ（GETは5分キャッシュ＋期限切れ後10分は裏で更新、更新系は商品・価格ルールのキャッシュを破棄）
+CACHE_READ = [Depends(cache_response(max_age=300, stale_while_revalidate=600))]
+DROP_CATALOG_CACHE = [Depends(invalidate_cache("/api/v1/products*", "/api/v1/pricing-rules*"))]
 
-@router.get("/", response_model=List[PricingRuleResponse])
+
+@router.get("/", response_model=List[PricingRuleResponse], dependencies=CACHE_READ, response_class=ORJSONResponse)
 def list_pricing_rules(
     customer_id: Optional[int] = Query(None, description="顧客IDでフィルター"),
     product_id: Optional[int] = Query(None, description="商品IDでフィルター"),
@@ -28,72 +38,57 @@ def list_pricing_rules(
     db: Session = Depends(get_db)
 ):
     """Get pricing rules list."""
-    query = db.query(PricingRule)
+    # Single joined Core SELECT returning rows (no ORM hydration, no N+1).
+    # Built as a lambda statement so the construct and its compiled SQL are
+    # cached per filter combination; filter values become bound parameters.
+    stmt = lambda_stmt(lambda: PricingService.rule_rows_select())
 
     if customer_id:
-        query = query.filter(PricingRule.customer_id == customer_id)
+        stmt += lambda s: s.where(PricingRule.customer_id == customer_id)
     if product_id:
-        query = query.filter(PricingRule.product_id == product_id)
-
-    rules = query.offset(skip).limit(limit).all()
-
-    # Enrich with customer and product names
-    result = []
-    for rule in rules:
-        customer = db.query(CustomerCompany).filter(CustomerCompany.id == rule.customer_id).first()
-        product = db.query(Product).filter(Product.id == rule.product_id).first() if rule.product_id else None
-
-        rule_dict = {
-            "id": rule.id,
-            "customer_id": rule.customer_id,
-            "product_id": rule.product_id,
-            "product_type_keyword": rule.product_type_keyword,
-            "price": rule.price,
-            "min_qty": rule.min_qty,
-            "start_date": rule.start_date,
-            "end_date": rule.end_date,
-            "priority": rule.priority,
-            "customer_name": customer.name if customer else None,
-            "product_name": product.name if product else None,
-            "product_sku": product.sku if product else None,
-        }
-        result.append(PricingRuleResponse(**rule_dict))
-
-    return result
-
-
-@router.get("/{rule_id}", response_model=PricingRuleResponse)
-def get_pricing_rule(rule_id: int, db: Session = Depends(get_db)):
+        stmt += lambda s: s.where(PricingRule.product_id == product_id)
+
+    stmt += lambda s: s.order_by(PricingRule.id).offset(skip).limit(limit)
+
+    rows = db.execute(stmt)
+
+    return [PricingRuleResponse.model_validate(row) for row in rows]
+
+
+@router.get("/{rule_id}", response_model=PricingRuleResponse, dependencies=CACHE_READ)
+def get_pricing_rule(
+    rule_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
     """Get pricing rule by ID."""
-    rule = db.query(PricingRule).filter(PricingRule.id == rule_id).first()
+    rule = db.query(PricingRule).options(
+        joinedload(PricingRule.customer),
+        joinedload(PricingRule.product)
+    ).filter(PricingRule.id == rule_id).first()
     if not rule:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Pricing rule {rule_id} not found"
         )
 
-    customer = db.query(CustomerCompany).filter(CustomerCompany.id == rule.customer_id).first()
-    product = db.query(Product).filter(Product.id == rule.product_id).first() if rule.product_id else None
-
-    rule_dict = {
-        "id": rule.id,
-        "customer_id": rule.customer_id,
-        "product_id": rule.product_id,
-        "product_type_keyword": rule.product_type_keyword,
-        "price": rule.price,
-        "min_qty": rule.min_qty,
-        "start_date": rule.start_date,
-        "end_date": rule.end_date,
-        "priority": rule.priority,
-        "customer_name": customer.name if customer else None,
-        "product_name": product.name if product else None,
-        "product_sku": product.sku if product else None,
-    }
+    # Customer/product names are part of the body, so their timestamps count too
+    etag = make_etag(
+        rule.id,
+        rule.updated_at,
+        rule.customer.updated_at,
+        rule.product.updated_at if rule.product else None,
+        weak=True
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
 
-    return PricingRuleResponse(**rule_dict)
+    return PricingRuleResponse.model_validate(rule)
 
 
-@router.post("/", response_model=PricingRuleResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=PricingRuleResponse, status_code=status.HTTP_201_CREATED, dependencies=DROP_CATALOG_CACHE)
 def create_pricing_rule(
     rule_data: PricingRuleCreate,
     db: Session = Depends(get_db)
@@ -106,59 +101,37 @@ def create_pricing_rule(
             detail="Either product_id or product_type_keyword must be provided"
         )
 
-    # Verify customer exists
-    customer = db.query(CustomerCompany).filter(CustomerCompany.id == rule_data.customer_id).first()
-    if not customer:
+    # Verify customer and product (if provided) exist in one round trip
+    found = db.execute(
+        PricingService.reference_names_select(rule_data.customer_id, rule_data.product_id)
+    ).one()
+    if found.customer_name is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Customer {rule_data.customer_id} not found"
         )
+    if rule_data.product_id and found.product_sku is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product {rule_data.product_id} not found"
+        )
 
-    # Verify product exists if product_id is provided
-    product = None
-    if rule_data.product_id:
-        product = db.query(Product).filter(Product.id == rule_data.product_id).first()
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Product {rule_data.product_id} not found"
-            )
-
-    # Create pricing rule
-    rule = PricingRule(
-        customer_id=rule_data.customer_id,
-        product_id=rule_data.product_id,
-        product_type_keyword=rule_data.product_type_keyword,
-        price=rule_data.price,
-        min_qty=rule_data.min_qty,
-        start_date=rule_data.start_date,
-        end_date=rule_data.end_date,
-        priority=rule_data.priority
-    )
+    # Create pricing rule (INSERT ... RETURNING, no refresh SELECT)
+    try:
+        rule = db.execute(
+            insert(PricingRule)
+            .values(**rule_data.model_dump())
+            .returning(*PricingService.rule_columns())
+        ).one()
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise _constraint_violation(e)
+
+    return PricingRuleResponse.model_validate({**rule._mapping, **found._mapping})
 
-    db.add(rule)
-    db.commit()
-    db.refresh(rule)
 
-    rule_dict = {
-        "id": rule.id,
-        "customer_id": rule.customer_id,
-        "product_id": rule.product_id,
-        "product_type_keyword": rule.product_type_keyword,
-        "price": rule.price,
-        "min_qty": rule.min_qty,
-        "start_date": rule.start_date,
-        "end_date": rule.end_date,
-        "priority": rule.priority,
-        "customer_name": customer.name,
-        "product_name": product.name if product else None,
-        "product_sku": product.sku if product else None,
-    }
-
-    return PricingRuleResponse(**rule_dict)
-
-
-@router.put("/{rule_id}", response_model=PricingRuleResponse)
+@router.put("/{rule_id}", response_model=PricingRuleResponse, dependencies=DROP_CATALOG_CACHE)
 def update_pricing_rule(
     rule_id: int,
     rule_data: PricingRuleUpdate,
@@ -177,31 +150,25 @@ def update_pricing_rule(
     for field, value in update_data.items():
         setattr(rule, field, value)
 
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise _constraint_violation(e)
     db.refresh(rule)
 
-    customer = db.query(CustomerCompany).filter(CustomerCompany.id == rule.customer_id).first()
-    product = db.query(Product).filter(Product.id == rule.product_id).first() if rule.product_id else None
+    return PricingRuleResponse.model_validate(rule)
 
-    rule_dict = {
-        "id": rule.id,
-        "customer_id": rule.customer_id,
-        "product_id": rule.product_id,
-        "product_type_keyword": rule.product_type_keyword,
-        "price": rule.price,
-        "min_qty": rule.min_qty,
-        "start_date": rule.start_date,
-        "end_date": rule.end_date,
-        "priority": rule.priority,
-        "customer_name": customer.name if customer else None,
-        "product_name": product.name if product else None,
-        "product_sku": product.sku if product else None,
-    }
 
-    return PricingRuleResponse(**rule_dict)
+def _constraint_violation(error: IntegrityError) -> HTTPException:
+    """制約違反（CHECK・NOT NULL・外部キーなど）を400エラーに変換"""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Pricing rule violates a database constraint: {error.orig}"
+    )
 
 
-@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=DROP_CATALOG_CACHE)
 def delete_pricing_rule(rule_id: int, db: Session = Depends(get_db)):
     """Delete pricing rule."""
     rule = db.query(PricingRule).filter(PricingRule.id == rule_id).first()
@@ -217,7 +184,7 @@ def delete_pricing_rule(rule_id: int, db: Session = Depends(get_db)):
     return None
 
 
-@router.get("/customer/{customer_id}/products", response_model=List[PricingRuleResponse])
+@router.get("/customer/{customer_id}/products", response_model=List[PricingRuleResponse], dependencies=CACHE_READ, response_class=ORJSONResponse)
 def get_customer_pricing_rules(
     customer_id: int,
     db: Session = Depends(get_db)
@@ -231,26 +198,11 @@ def get_customer_pricing_rules(
             detail=f"Customer {customer_id} not found"
         )
 
-    rules = db.query(PricingRule).filter(PricingRule.customer_id == customer_id).all()
-
-    result = []
-    for rule in rules:
-        product = db.query(Product).filter(Product.id == rule.product_id).first() if rule.product_id else None
-
-        rule_dict = {
-            "id": rule.id,
-            "customer_id": rule.customer_id,
-            "product_id": rule.product_id,
-            "product_type_keyword": rule.product_type_keyword,
-            "price": rule.price,
-            "min_qty": rule.min_qty,
-            "start_date": rule.start_date,
-            "end_date": rule.end_date,
-            "priority": rule.priority,
-            "customer_name": customer.name,
-            "product_name": product.name if product else None,
-            "product_sku": product.sku if product else None,
-        }
-        result.append(PricingRuleResponse(**rule_dict))
-
-    return result
+    # customer is already in the identity map, so its selectinload emits no SQL
+    rules = db.query(PricingRule).options(
+        selectinload(PricingRule.customer).load_only(CustomerCompany.name),
+        selectinload(PricingRule.product).load_only(Product.name, Product.sku),
+        raiseload("*")
+    ).filter(PricingRule.customer_id == customer_id).all()
+
+    return [PricingRuleResponse.model_validate(rule) for rule in rules]
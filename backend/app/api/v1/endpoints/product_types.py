@@ -3,14 +3,18 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.core.database import get_db
+from app.core.cache import cache_response, invalidate_cache
 from app.services.product_type_learning_service import ProductTypeLearningService
 from app.models.product_type_pattern import ProductTypePattern
 
 router = APIRouter()
 
+# パターン更新時に商品タイプ関連のキャッシュを破棄
+DROP_PATTERN_CACHE = [Depends(invalidate_cache("/api/v1/product-types*"))]
+
 
 # Pydantic models
 class ProductTypeLearnRequest(BaseModel):
@@ -37,8 +41,7 @@ class ProductTypePatternResponse(BaseModel):
     source: str
     usage_count: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProductTypeStatisticsResponse(BaseModel):
@@ -48,7 +51,7 @@ class ProductTypeStatisticsResponse(BaseModel):
     total_usage: int
 
 
-@router.post("/learn", status_code=status.HTTP_201_CREATED)
+@router.post("/learn", status_code=status.HTTP_201_CREATED, dependencies=DROP_PATTERN_CACHE)
 async def learn_product_type(
     request: ProductTypeLearnRequest,
     db: Session = Depends(get_db)
@@ -117,7 +120,7 @@ async def predict_product_type(
     """
     try:
         learning_service = ProductTypeLearningService(db)
-        result = learning_service.predict_product_type(request.product_name)
+        result = learning_service.predict_product_type_cached(request.product_name)
 
         if result:
             product_type, confidence, method = result
@@ -140,7 +143,7 @@ async def predict_product_type(
         )
 
 
-@router.get("/patterns", response_model=List[ProductTypePatternResponse])
+@router.get("/patterns", response_model=List[ProductTypePatternResponse], dependencies=[Depends(cache_response(max_age=3600))])
 async def get_all_patterns(db: Session = Depends(get_db)):
     """
     すべての学習パターンを取得
@@ -180,7 +183,7 @@ async def get_patterns_by_type(
         )
 
 
-@router.delete("/patterns/{pattern_id}")
+@router.delete("/patterns/{pattern_id}", dependencies=DROP_PATTERN_CACHE)
 async def delete_pattern(
     pattern_id: int,
     db: Session = Depends(get_db)
@@ -207,7 +210,7 @@ async def delete_pattern(
         )
 
 
-@router.get("/statistics", response_model=ProductTypeStatisticsResponse)
+@router.get("/statistics", response_model=ProductTypeStatisticsResponse, dependencies=[Depends(cache_response(max_age=300))])
 async def get_statistics(db: Session = Depends(get_db)):
     """
     学習パターンの統計情報を取得
@@ -3,20 +3,28 @@ Products API endpoints.
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, exists, func, insert, lambda_stmt, select, update
 from decimal import Decimal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.cache import cache_response, invalidate_cache
+from app.core.http_cache import make_etag, is_not_modified, set_cache_headers, not_modified
 from app.models.product import Product
 from app.models.pricing_rule import PricingRule
-from app.models.customer_company import CustomerCompany
+from app.services.pricing_service import PricingService
 
 
 router = APIRouter()
 
+# レスポンスキャッシュ（GETは5分キャッシュ＋期限切れ後10分は裏で更新、更新系は商品・価格ルールのキャッシュを破棄）
+CACHE_READ = [Depends(cache_response(max_age=300, stale_while_revalidate=600))]
+DROP_CATALOG_CACHE = [Depends(invalidate_cache("/api/v1/products*", "/api/v1/pricing-rules*"))]
+
 
 class ProductCreate(BaseModel):
     """商品作成リクエスト"""
@@ -49,11 +57,10 @@ class ProductResponse(BaseModel):
     tax_category: str
     unit: str
     is_active: bool
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PricingRuleCreate(BaseModel):
@@ -68,8 +75,8 @@ class PricingRuleCreate(BaseModel):
     product_type_keyword: Optional[str] = Field(None, max_length=200, description="商品タイプキーワード（例: ハードケース、手帳型カバー/mirror）")
     price: Decimal = Field(..., gt=0, description="適用単価")
     min_qty: Optional[int] = Field(None, gt=0, description="最小数量")
-    start_date: Optional[str] = Field(None, description="適用開始日（YYYY-MM-DD）")
-    end_date: Optional[str] = Field(None, description="適用終了日（YYYY-MM-DD）")
+    start_date: Optional[date] = Field(None, description="適用開始日（YYYY-MM-DD）")
+    end_date: Optional[date] = Field(None, description="適用終了日（YYYY-MM-DD）")
     priority: int = Field(0, description="優先度")
 
 
@@ -84,17 +91,23 @@ class PricingRuleResponse(BaseModel):
     product_name: str | None
     price: Decimal
     min_qty: int | None
-    start_date: str | None
-    end_date: str | None
+    start_date: date | None
+    end_date: date | None
     priority: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+def _escape_like(value: str) -> str:
+    """LIKEパターンのワイルドカード（%, _）とエスケープ文字をエスケープ"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
-@router.get("/", response_model=List[ProductResponse])
+@router.get("/", response_model=List[ProductResponse], dependencies=CACHE_READ, response_class=ORJSONResponse)
 async def list_products(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     search: Optional[str] = Query(None, description="商品名またはSKUで検索"),
     is_active: Optional[bool] = Query(None, description="有効/無効フィルター"),
     limit: int = Query(100, ge=1, le=1000)
@@ -103,36 +116,46 @@ async def list_products(
     商品一覧を取得
     """
     try:
-        query = db.query(Product)
-
+        conditions = []
         if search:
-            query = query.filter(
+            # ILIKEの部分一致はpg_trgmのGINインデックス（ix_products_*_trgm）で処理される
+            pattern = f"%{_escape_like(search)}%"
+            conditions.append(
                 or_(
-                    Product.name.contains(search),
-                    Product.sku.contains(search)
+                    Product.name.ilike(pattern, escape="\\"),
+                    Product.sku.ilike(pattern, escape="\\")
                 )
             )
-
         if is_active is not None:
-            query = query.filter(Product.is_active == is_active)
-
-        products = query.order_by(Product.created_at.desc()).limit(limit).all()
-
-        return [
-            ProductResponse(
-                id=p.id,
-                sku=p.sku,
-                name=p.name,
-                default_price=p.default_price,
-                tax_rate=p.tax_rate,
-                tax_category=p.tax_category,
-                unit=p.unit,
-                is_active=p.is_active,
-                created_at=p.created_at.isoformat() if p.created_at else "",
-                updated_at=p.updated_at.isoformat() if p.updated_at else ""
-            )
-            for p in products
-        ]
+            conditions.append(Product.is_active == is_active)
+
+        # 件数と最終更新日時から弱いETagを生成（追加・更新・無効化で変化）
+        last_updated, total = (await db.execute(
+            select(func.max(Product.updated_at), func.count(Product.id)).where(*conditions)
+        )).one()
+        etag = make_etag(last_updated, total, limit, weak=True)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        set_cache_headers(response, etag)
+
+        # レスポンスに必要な列のみをCore SELECTで取得（ORMインスタンスを生成しない）
+        # lambda_stmtで組み立て、条件の組み合わせごとにSQLのコンパイル結果をキャッシュ
+        stmt = lambda_stmt(lambda: select(
+            Product.id,
+            Product.sku,
+            Product.name,
+            Product.default_price,
+            Product.tax_rate,
+            Product.tax_category,
+            Product.unit,
+            Product.is_active,
+            Product.created_at,
+            Product.updated_at
+        ))
+
+        stmt += lambda s: s.where(*conditions).order_by(Product.created_at.desc()).limit(limit)
+
+        return [ProductResponse.model_validate(row) for row in await db.execute(stmt)]
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -140,16 +163,18 @@ async def list_products(
         )
 
 
-@router.get("/{product_id}", response_model=ProductResponse)
+@router.get("/{product_id}", response_model=ProductResponse, dependencies=CACHE_READ)
 async def get_product(
     product_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     特定の商品を取得
     """
     try:
-        product = db.query(Product).filter(Product.id == product_id).first()
+        product = await db.get(Product, product_id)
 
         if not product:
             raise HTTPException(
@@ -157,18 +182,12 @@ async def get_product(
                 detail=f"Product {product_id} not found"
             )
 
-        return ProductResponse(
-            id=product.id,
-            sku=product.sku,
-            name=product.name,
-            default_price=product.default_price,
-            tax_rate=product.tax_rate,
-            tax_category=product.tax_category,
-            unit=product.unit,
-            is_active=product.is_active,
-            created_at=product.created_at.isoformat() if product.created_at else "",
-            updated_at=product.updated_at.isoformat() if product.updated_at else ""
-        )
+        etag = make_etag(product.id, product.updated_at, weak=True)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        set_cache_headers(response, etag)
+
+        return ProductResponse.model_validate(product)
     except HTTPException:
         raise
     except Exception as e:
@@ -178,70 +197,50 @@ async def get_product(
         )
 
 
-@router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED, dependencies=DROP_CATALOG_CACHE)
 async def create_product(
     request: ProductCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     新しい商品を作成
     """
     try:
         # SKUの重複チェック
-        existing = db.query(Product).filter(Product.sku == request.sku).first()
-        if existing:
+        if await db.scalar(select(exists().where(Product.sku == request.sku))):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Product with SKU '{request.sku}' already exists"
             )
 
-        product = Product(
-            sku=request.sku,
-            name=request.name,
-            default_price=request.default_price,
-            tax_rate=request.tax_rate,
-            tax_category=request.tax_category,
-            unit=request.unit,
-            is_active=request.is_active
+        # INSERT ... RETURNING で作成と取得を1往復で実行
+        product = await db.scalar(
+            insert(Product).values(**request.model_dump()).returning(Product)
         )
+        await db.commit()
 
-        db.add(product)
-        db.commit()
-        db.refresh(product)
-
-        return ProductResponse(
-            id=product.id,
-            sku=product.sku,
-            name=product.name,
-            default_price=product.default_price,
-            tax_rate=product.tax_rate,
-            tax_category=product.tax_category,
-            unit=product.unit,
-            is_active=product.is_active,
-            created_at=product.created_at.isoformat() if product.created_at else "",
-            updated_at=product.updated_at.isoformat() if product.updated_at else ""
-        )
+        return ProductResponse.model_validate(product)
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create product: {str(e)}"
         )
 
 
-@router.put("/{product_id}", response_model=ProductResponse)
+@router.put("/{product_id}", response_model=ProductResponse, dependencies=DROP_CATALOG_CACHE)
 async def update_product(
     product_id: int,
     request: ProductUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     商品を更新
     """
     try:
-        product = db.query(Product).filter(Product.id == product_id).first()
+        product = await db.get(Product, product_id)
 
         if not product:
             raise HTTPException(
@@ -263,101 +262,72 @@ async def update_product(
         if request.is_active is not None:
             product.is_active = request.is_active
 
-        db.commit()
-        db.refresh(product)
-
-        return ProductResponse(
-            id=product.id,
-            sku=product.sku,
-            name=product.name,
-            default_price=product.default_price,
-            tax_rate=product.tax_rate,
-            tax_category=product.tax_category,
-            unit=product.unit,
-            is_active=product.is_active,
-            created_at=product.created_at.isoformat() if product.created_at else "",
-            updated_at=product.updated_at.isoformat() if product.updated_at else ""
-        )
+        await db.commit()
+        await db.refresh(product)
+
+        return ProductResponse.model_validate(product)
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update product: {str(e)}"
         )
 
 
-@router.delete("/{product_id}")
+@router.delete("/{product_id}", dependencies=DROP_CATALOG_CACHE)
 async def delete_product(
     product_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     商品を削除（論理削除）
     """
     try:
-        product = db.query(Product).filter(Product.id == product_id).first()
+        # 論理削除（UPDATE ... RETURNING で存在確認と更新を1往復で実行）
+        deactivated_id = await db.scalar(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(is_active=False)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
 
-        if not product:
+        if deactivated_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Product {product_id} not found"
             )
 
-        # 論理削除
-        product.is_active = False
-        db.commit()
+        await db.commit()
 
         return {"success": True, "message": f"Product {product_id} deactivated"}
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete product: {str(e)}"
         )
 
 
-@router.get("/{product_id}/pricing", response_model=List[PricingRuleResponse])
+@router.get("/{product_id}/pricing", response_model=List[PricingRuleResponse], dependencies=CACHE_READ, response_class=ORJSONResponse)
 async def get_product_pricing_rules(
     product_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     特定商品の価格ルール一覧を取得
     """
     try:
-        rules = db.query(PricingRule).filter(
+        # 顧客名・商品名はJOINで取得し、ルール件数に関係なく1クエリで完結させる
+        stmt = PricingService.rule_rows_select().where(
             PricingRule.product_id == product_id
-        ).all()
-
-        result = []
-        for rule in rules:
-            customer = db.query(CustomerCompany).filter(
-                CustomerCompany.id == rule.customer_id
-            ).first()
-
-            product = db.query(Product).filter(
-                Product.id == rule.product_id
-            ).first()
-
-            result.append(PricingRuleResponse(
-                id=rule.id,
-                customer_id=rule.customer_id,
-                customer_name=customer.name if customer else "Unknown",
-                product_id=rule.product_id,
-                product_sku=product.sku if product else "",
-                product_name=product.name if product else "Unknown",
-                price=rule.price,
-                min_qty=rule.min_qty,
-                start_date=rule.start_date.isoformat() if rule.start_date else None,
-                end_date=rule.end_date.isoformat() if rule.end_date else None,
-                priority=rule.priority
-            ))
-
-        return result
+        )
+
+        return [PricingRuleResponse.model_validate(row) for row in await db.execute(stmt)]
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -365,54 +335,28 @@ async def get_product_pricing_rules(
         )
 
 
-@router.get("/pricing", response_model=List[PricingRuleResponse])
+@router.get("/pricing", response_model=List[PricingRuleResponse], dependencies=CACHE_READ, response_class=ORJSONResponse)
 async def list_pricing_rules(
     customer_id: Optional[int] = Query(None, description="取引先IDでフィルター"),
     product_type_keyword: Optional[str] = Query(None, description="商品タイプキーワードでフィルター"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     価格ルール一覧を取得
     """
     try:
-        query = db.query(PricingRule)
+        # 顧客名・商品名をJOINした1クエリで取得（ORMインスタンスを生成しない）
+        stmt = PricingService.rule_rows_select()
 
         if customer_id:
-            query = query.filter(PricingRule.customer_id == customer_id)
+            stmt = stmt.where(PricingRule.customer_id == customer_id)
 
         if product_type_keyword:
-            query = query.filter(PricingRule.product_type_keyword == product_type_keyword)
-
-        rules = query.order_by(PricingRule.priority.desc()).all()
-
-        result = []
-        for rule in rules:
-            customer = db.query(CustomerCompany).filter(
-                CustomerCompany.id == rule.customer_id
-            ).first()
-
-            product = None
-            if rule.product_id:
-                product = db.query(Product).filter(
-                    Product.id == rule.product_id
-                ).first()
-
-            result.append(PricingRuleResponse(
-                id=rule.id,
-                customer_id=rule.customer_id,
-                customer_name=customer.name if customer else "Unknown",
-                product_id=rule.product_id,
-                product_type_keyword=rule.product_type_keyword,
-                product_sku=product.sku if product else None,
-                product_name=product.name if product else None,
-                price=rule.price,
-                min_qty=rule.min_qty,
-                start_date=rule.start_date.isoformat() if rule.start_date else None,
-                end_date=rule.end_date.isoformat() if rule.end_date else None,
-                priority=rule.priority
-            ))
-
-        return result
+            stmt = stmt.where(PricingRule.product_type_keyword == product_type_keyword)
+
+        stmt = stmt.order_by(PricingRule.priority.desc())
+
+        return [PricingRuleResponse.model_validate(row) for row in await db.execute(stmt)]
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -420,10 +364,10 @@ async def list_pricing_rules(
         )
 
 
-@router.post("/pricing", response_model=PricingRuleResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/pricing", response_model=PricingRuleResponse, status_code=status.HTTP_201_CREATED, dependencies=DROP_CATALOG_CACHE)
 async def create_pricing_rule(
     request: PricingRuleCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     新しい価格ルールを作成
@@ -444,77 +388,50 @@ async def create_pricing_rule(
                 detail="product_id と product_type_keyword の両方を指定することはできません"
             )
 
-        # 顧客の存在確認
-        customer = db.query(CustomerCompany).filter(
-            CustomerCompany.id == request.customer_id
-        ).first()
-        if not customer:
+        # 顧客・商品（product_id指定時）の存在確認を1クエリで実行
+        found = (await db.execute(
+            PricingService.reference_names_select(request.customer_id, request.product_id)
+        )).one()
+        if found.customer_name is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Customer {request.customer_id} not found"
             )
+        if request.product_id and found.product_sku is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product {request.product_id} not found"
+            )
 
-        # product_idが指定されている場合は商品の存在確認
-        product = None
-        if request.product_id:
-            product = db.query(Product).filter(
-                Product.id == request.product_id
-            ).first()
-            if not product:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Product {request.product_id} not found"
-                )
-
-        rule = PricingRule(
-            customer_id=request.customer_id,
-            product_id=request.product_id,
-            product_type_keyword=request.product_type_keyword,
-            price=request.price,
-            min_qty=request.min_qty,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            priority=request.priority
-        )
+        # INSERT ... RETURNING で作成し、顧客名・商品名は存在確認の結果を使う
+        rule = (await db.execute(
+            insert(PricingRule)
+            .values(**request.model_dump())
+            .returning(*PricingService.rule_columns())
+        )).one()
+        await db.commit()
 
-        db.add(rule)
-        db.commit()
-        db.refresh(rule)
-
-        return PricingRuleResponse(
-            id=rule.id,
-            customer_id=rule.customer_id,
-            customer_name=customer.name,
-            product_id=rule.product_id,
-            product_type_keyword=rule.product_type_keyword,
-            product_sku=product.sku if product else None,
-            product_name=product.name if product else None,
-            price=rule.price,
-            min_qty=rule.min_qty,
-            start_date=rule.start_date.isoformat() if rule.start_date else None,
-            end_date=rule.end_date.isoformat() if rule.end_date else None,
-            priority=rule.priority
-        )
+        return PricingRuleResponse.model_validate({**rule._mapping, **found._mapping})
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create pricing rule: {str(e)}"
         )
 
 
-@router.delete("/pricing/{rule_id}")
+@router.delete("/pricing/{rule_id}", dependencies=DROP_CATALOG_CACHE)
 async def delete_pricing_rule(
     rule_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     価格ルールを削除
     """
     try:
-        rule = db.query(PricingRule).filter(PricingRule.id == rule_id).first()
+        rule = await db.get(PricingRule, rule_id)
 
         if not rule:
             raise HTTPException(
@@ -522,14 +439,14 @@ async def delete_pricing_rule(
                 detail=f"Pricing rule {rule_id} not found"
             )
 
-        db.delete(rule)
-        db.commit()
+        await db.delete(rule)
+        await db.commit()
 
         return {"success": True, "message": f"Pricing rule {rule_id} deleted"}
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete pricing rule: {str(e)}"
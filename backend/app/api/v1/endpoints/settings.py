@@ -2,25 +2,34 @@
 Settings API endpoints.
 """
 
-from typing import Dict, Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import AsyncIterator, Dict, Any, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import Select, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
 import os
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_async_read_db, get_async_read_sessionmaker
+from app.core.cache import cache_response
 from app.core.config import settings
 from app.models.customer_company import CustomerCompany
 from app.models.product import Product
 from app.models.order import Order
 from app.models.issuer_company import IssuerCompany
-from app.services.issuer_service import IssuerService
 from app.tasks.device_sync_tasks import sync_device_master_from_supabase, get_device_sync_status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# 全件取得時にDBから一度に取り出す行数
+STREAM_CHUNK_SIZE = 500
+
 
 class DatabaseStatsResponse(BaseModel):
     """Database statistics response."""
@@ -55,55 +64,116 @@ class IssuerInfoResponse(BaseModel):
     bank_info: str | None
     invoice_notes: str | None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# レスポンスの検証・JSON化はモジュール読み込み時に構築したアダプタで行う
+# （一覧はリスト全体を1回の検証・JSON化で処理する）
+_ISSUER_ADAPTER = TypeAdapter(IssuerInfoResponse)
+_ISSUER_LIST_ADAPTER = TypeAdapter(List[IssuerInfoResponse])
+
+
+def _issuer_response(issuer: IssuerCompany) -> Response:
+    """請求者会社をIssuerInfoResponseのJSONレスポンスに変換"""
+    validated = _ISSUER_ADAPTER.validate_python(issuer, from_attributes=True)
+    return Response(content=_ISSUER_ADAPTER.dump_json(validated), media_type="application/json")
+
 
+async def _get_default_issuer(db: AsyncSession) -> IssuerCompany | None:
+    """デフォルトの請求者会社を取得（IssuerService.get_default_issuer の非同期版）"""
+    return await db.scalar(select(IssuerCompany).limit(1))
 
-@router.get("/stats", response_model=DatabaseStatsResponse)
-async def get_database_stats(db: Session = Depends(get_db)):
+
+def _response_columns(model: type, schema: type[BaseModel]) -> Select:
+    """レスポンスのフィールドに対応する列のみを選択（ORMエンティティを生成しない）"""
+    return select(*(getattr(model, name) for name in schema.model_fields))
+
+
+async def _stream_json_list(stmt: Select, adapter: TypeAdapter) -> StreamingResponse:
+    """全件をサーバーサイドカーソルでチャンクごとに取得し、JSON配列としてストリーミング
+
+    レスポンス送信中もセッションを使うため、依存関数のセッションではなく専用のセッションを開き、
+    送信完了後（切断時も）に閉じる。クエリの実行と最初のチャンクの取得はステータス送信前に行うため、
+    DBエラーは呼び出し元で503になる。
+    """
+    db = get_async_read_sessionmaker()()
+    try:
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_CHUNK_SIZE))
+        partitions = result.mappings().partitions()
+        first_rows = await anext(partitions, None)
+    except BaseException:
+        await db.close()
+        raise
+
+    async def body() -> AsyncIterator[bytes]:
+        separator = b"["
+        rows = first_rows
+        while rows is not None:
+            validated = adapter.validate_python(rows)
+            yield separator + adapter.dump_json(validated)[1:-1]
+            separator = b","
+            rows = await anext(partitions, None)
+        yield b"[]" if separator == b"[" else b"]"
+
+    return StreamingResponse(body(), media_type="application/json", background=BackgroundTask(db.close))
+
+
+async def _list_response(
+    db: AsyncSession,
+    stmt: Select,
+    adapter: TypeAdapter,
+    limit: int | None,
+    offset: int
+) -> Response:
+    """limit指定時はそのページのみ、未指定時は全件をストリーミングで返す"""
+    if limit is None:
+        return await _stream_json_list(stmt.offset(offset), adapter)
+
+    rows = (await db.execute(stmt.limit(limit).offset(offset))).mappings().all()
+    validated = adapter.validate_python(rows)
+    return Response(content=adapter.dump_json(validated), media_type="application/json")
+
+
+@router.get("/stats", response_model=DatabaseStatsResponse, dependencies=[Depends(cache_response(max_age=60))])
+async def get_database_stats(db: AsyncSession = Depends(get_async_read_db)):
     """
     Get database statistics.
     """
     try:
-        # Count companies and individuals
-        companies_count = db.query(CustomerCompany).filter(
-            CustomerCompany.is_individual == False
-        ).count()
-
-        individuals_count = db.query(CustomerCompany).filter(
-            CustomerCompany.is_individual == True
-        ).count()
-
-        # Count products
-        products_count = db.query(Product).count()
-
-        # Count orders
-        orders_count = db.query(Order).count()
+        # All counts in one round trip: FILTERed aggregates for companies and
+        # individuals, scalar subqueries for products and orders
+        counts = (await db.execute(
+            select(
+                func.count().filter(CustomerCompany.is_individual.is_(False)).label("companies"),
+                func.count().filter(CustomerCompany.is_individual.is_(True)).label("individuals"),
+                select(func.count()).select_from(Product).scalar_subquery().label("products"),
+                select(func.count()).select_from(Order).scalar_subquery().label("orders"),
+            ).select_from(CustomerCompany)
+        )).one()
 
         return DatabaseStatsResponse(
-            companies=companies_count,
-            individuals=individuals_count,
-            products=products_count,
-            orders=orders_count,
+            companies=counts.companies,
+            individuals=counts.individuals,
+            products=counts.products,
+            orders=counts.orders,
             connection_status="connected"
         )
 
-    except Exception as e:
-        return DatabaseStatsResponse(
-            companies=0,
-            individuals=0,
-            products=0,
-            orders=0,
-            connection_status="error"
+    except SQLAlchemyError:
+        # ゼロ埋めの応答を返すとキャッシュ・ヘルスチェックが正常と誤認するため503にする
+        logger.warning("Failed to fetch database stats", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable"
         )
 
 
 @router.get("/issuer", response_model=IssuerInfoResponse)
-async def get_issuer_info(db: Session = Depends(get_db)):
+async def get_issuer_info(db: AsyncSession = Depends(get_async_db)):
     """
     Get default issuer company information.
     """
-    issuer = IssuerService.get_default_issuer(db)
+    issuer = await _get_default_issuer(db)
 
     if not issuer:
         raise HTTPException(
@@ -111,20 +181,20 @@ async def get_issuer_info(db: Session = Depends(get_db)):
             detail="Default issuer not found"
         )
 
-    return IssuerInfoResponse.from_orm(issuer)
+    return _issuer_response(issuer)
 
 
 @router.put("/issuer", response_model=IssuerInfoResponse)
 async def update_issuer_info(
     data: IssuerInfoUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update default issuer company information.
     """
     try:
         # Get or create default issuer
-        issuer = IssuerService.get_default_issuer(db)
+        issuer = await _get_default_issuer(db)
 
         if not issuer:
             # Create new issuer
@@ -151,13 +221,13 @@ async def update_issuer_info(
             if data.invoice_notes:
                 issuer.invoice_notes = data.invoice_notes
 
-        db.commit()
-        db.refresh(issuer)
+        await db.commit()
+        await db.refresh(issuer)
 
-        return IssuerInfoResponse.from_orm(issuer)
+        return _issuer_response(issuer)
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update issuer information: {str(e)}"
@@ -165,17 +235,26 @@ async def update_issuer_info(
 
 
 @router.get("/issuer/list", response_model=List[IssuerInfoResponse])
-async def list_issuers(db: Session = Depends(get_db)):
+async def list_issuers(
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int | None = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+):
     """
     Get list of all issuer companies.
+
+    Args:
+        limit: Page size. If None, all issuers are streamed.
+        offset: Number of issuers to skip.
     """
     try:
-        issuers = db.query(IssuerCompany).all()
-        return [IssuerInfoResponse.from_orm(issuer) for issuer in issuers]
-    except Exception as e:
+        stmt = _response_columns(IssuerCompany, IssuerInfoResponse).order_by(IssuerCompany.id)
+        return await _list_response(db, stmt, _ISSUER_LIST_ADAPTER, limit, offset)
+    except SQLAlchemyError:
+        logger.warning("Failed to retrieve issuer list", exc_info=True)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve issuer list: {str(e)}"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable"
         )
 
 
@@ -199,8 +278,10 @@ class CustomerCompanyResponse(BaseModel):
     phone: str | None
     email: str | None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+_CUSTOMER_LIST_ADAPTER = TypeAdapter(List[CustomerCompanyResponse])
 
 
 @router.get("/ai", response_model=AISettingsResponse)
@@ -226,27 +307,32 @@ async def get_ai_settings():
 
 @router.get("/customers", response_model=List[CustomerCompanyResponse])
 async def list_customers(
-    db: Session = Depends(get_db),
-    is_individual: bool | None = None
+    db: AsyncSession = Depends(get_async_read_db),
+    is_individual: bool | None = None,
+    limit: int | None = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
 ):
     """
     Get list of customer companies.
 
     Args:
         is_individual: Filter by individual (True) or company (False). If None, return all.
+        limit: Page size. If None, all customers are streamed.
+        offset: Number of customers to skip.
     """
     try:
-        query = db.query(CustomerCompany)
+        query = _response_columns(CustomerCompany, CustomerCompanyResponse)
 
         if is_individual is not None:
-            query = query.filter(CustomerCompany.is_individual == is_individual)
+            query = query.where(CustomerCompany.is_individual == is_individual)
 
-        customers = query.order_by(CustomerCompany.name).all()
-        return [CustomerCompanyResponse.from_orm(customer) for customer in customers]
-    except Exception as e:
+        stmt = query.order_by(CustomerCompany.name, CustomerCompany.id)
+        return await _list_response(db, stmt, _CUSTOMER_LIST_ADAPTER, limit, offset)
+    except SQLAlchemyError:
+        logger.warning("Failed to retrieve customer list", exc_info=True)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve customer list: {str(e)}"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable"
         )
 
 
@@ -2,21 +2,107 @@
 Statistics API endpoints - 注文統計エンドポイント
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import CTE, Select, and_, case, desc, func, literal, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_async_read_db
+from app.core.cache import cache_response
 from app.models.order import Order, OrderItem
 from app.models.product import Product
 
 router = APIRouter()
 
+# ダッシュボードのポーリング向けに短時間キャッシュ（注文の更新・取込時に破棄）
+CACHE_STATS = [Depends(cache_response(max_age=60))]
 
-@router.get("/orders/detailed")
+# 手帳ケースの種類（商品名・商品タイプに含まれる最初のものを採用）
+NOTEBOOK_TYPES = ["キャメル", "coloer", "薄いタイプ", "厚いタイプ", "熱いタイプ", "mirror", "ベルト無し", "両面印刷"]
+
+# 商品タイプによる分類（インデックス付きの生成列 case_category を使用）
+_IS_HARDCASE = OrderItem.case_category.in_(('hard', 'both'))
+_IS_NOTEBOOK = OrderItem.case_category.in_(('notebook', 'both'))
+_DEVICE = func.coalesce(func.nullif(OrderItem.device_info, ''), '不明')
+
+# ハードケース統計への加算回数
+# ⚠️ 重要: 手帳型カバーは「手帳サイズ + ハードケース」で構成されるため、
+#         在庫管理用に機種が分かる手帳ケースもハードケース統計に加算する
+_HARDCASE_WEIGHT = (
+    case((_IS_HARDCASE, 1), else_=0)
+    + case((and_(_IS_NOTEBOOK, _DEVICE != '不明'), 1), else_=0)
+)
+
+# 手帳ケースの種類（商品名はProductとの外部結合が必要）
+# 手帳ケース以外は種類を使わないため、最初の分岐で文字列照合をスキップする
+_NOTEBOOK_TYPE = case(
+    (~_IS_NOTEBOOK, None),
+    *[
+        (or_(func.coalesce(Product.name, '').contains(ntype), OrderItem.product_type.contains(ntype)), ntype)
+        for ntype in NOTEBOOK_TYPES
+    ],
+    else_="その他"
+)
+
+
+def _classified_items(customer_id: Optional[int], detailed: bool = False) -> CTE:
+    """注文アイテムを統計用に分類したCTEを生成
+
+    集計はこのCTEの列に対してGROUP BYで行い、明細をPythonに読み込みません。
+
+    Args:
+        customer_id: 取引先会社ID（指定すると特定の会社のみ）
+        detailed: 注文日・手帳ケース種類の列を含める場合True
+
+    Returns:
+        qty, device, size, hardcase_weight, is_notebook（detailed時は order_date, notebook_type）列を持つCTE
+    """
+    stmt = select(
+        OrderItem.qty.label("qty"),
+        _DEVICE.label("device"),
+        OrderItem.size_info.label("size"),
+        _HARDCASE_WEIGHT.label("hardcase_weight"),
+        case((_IS_NOTEBOOK, 1), else_=0).label("is_notebook")
+    ).select_from(OrderItem)
+
+    if detailed or customer_id:
+        stmt = stmt.join(Order, Order.id == OrderItem.order_id)
+
+    if detailed:
+        stmt = stmt.outerjoin(Product, Product.id == OrderItem.product_id).add_columns(
+            Order.order_date.label("order_date"),
+            _NOTEBOOK_TYPE.label("notebook_type")
+        )
+
+    # 会社フィルタ
+    if customer_id:
+        stmt = stmt.where(Order.customer_id == customer_id)
+
+    return stmt.cte("classified_items")
+
+
+def _size_known(size):
+    """サイズ情報が有効（空・'-'以外）かどうかの条件"""
+    return and_(size.isnot(None), size.notin_(['', '-']))
+
+
+def _top5(kind: str, key, quantity, condition) -> Select:
+    """key別の数量合計の上位5件（kind列でランキングの種類を識別）"""
+    ranked = (
+        select(literal(kind).label("kind"), key.label("key"), func.sum(quantity).label("count"))
+        .where(condition)
+        .group_by(key)
+        .order_by(desc("count"), key)
+        .limit(5)
+        .subquery()
+    )
+    return select(ranked.c.kind, ranked.c.key, ranked.c.count)
+
+
+@router.get("/orders/detailed", dependencies=CACHE_STATS, response_class=ORJSONResponse)
 async def get_detailed_order_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     customer_id: int = None
 ):
     """
@@ -27,99 +113,13 @@ async def get_detailed_order_stats(
     Args:
         customer_id: 取引先会社ID（指定すると特定の会社のみの統計）
     """
+    items = _classified_items(customer_id, detailed=True)
 
-    # 全注文アイテムと注文情報を取得
-    from app.models.order import Order
-    query = db.query(OrderItem, Order).join(Order)
-
-    # 会社フィルタ
-    if customer_id:
-        query = query.filter(Order.customer_id == customer_id)
-
-    order_items = query.all()
-
-    # 統計データの初期化
-    hardcase_by_device: Dict[str, Dict] = {}  # {device: {count, quantity, by_date}}
-    notebook_stats_by_type: Dict[str, Dict] = {}  # {type: {size_stats: {}, device_stats: {}}}
-    total_orders = 0
-
-    # 手帳ケースの種類を定義
-    notebook_types = ["キャメル", "coloer", "薄いタイプ", "厚いタイプ", "熱いタイプ", "mirror", "ベルト無し", "両面印刷"]
-
-    for item, order in order_items:
-        product_type = item.product_type or ""
-        product_name = item.product.name if item.product else ""
-        quantity = item.qty or 0
-        total_orders += quantity
-
-        # 注文日を取得
-        order_date = order.order_date.strftime('%Y-%m-%d') if order.order_date else "不明"
-
-        # ハードケースの場合：機種別に日付別カウント
-        if 'ハードケース' in product_type:
-            device = item.device_info or "不明"
-
-            if device not in hardcase_by_device:
-                hardcase_by_device[device] = {"count": 0, "quantity": 0, "by_date": {}}
-
-            hardcase_by_device[device]["count"] += 1  # 件数
-            hardcase_by_device[device]["quantity"] += quantity  # 個数
-
-            if order_date not in hardcase_by_device[device]["by_date"]:
-                hardcase_by_device[device]["by_date"][order_date] = {"count": 0, "quantity": 0}
-            hardcase_by_device[device]["by_date"][order_date]["count"] += 1  # 件数
-            hardcase_by_device[device]["by_date"][order_date]["quantity"] += quantity  # 個数
-
-        # 手帳ケースの場合：種類別にサイズ別・機種別にカウント
-        # ⚠️ 重要: 手帳型カバーは「手帳サイズ + ハードケース」で構成されるため、
-        #         手帳統計とハードケース統計の両方に加算する
-        if '手帳' in product_type or 'カバー' in product_type or 'mirror' in product_type:
-            # 手帳ケースの種類を判定（商品名から）
-            notebook_type = "その他"
-            for ntype in notebook_types:
-                if ntype in product_name or ntype in product_type:
-                    notebook_type = ntype
-                    break
-
-            # 種類別に初期化
-            if notebook_type not in notebook_stats_by_type:
-                notebook_stats_by_type[notebook_type] = {
-                    "size_stats": {},
-                    "device_stats": {}
-                }
-
-            # サイズ別カウント
-            size = item.size_info or "-"
-            if size and size != '-':
-                if size not in notebook_stats_by_type[notebook_type]["size_stats"]:
-                    notebook_stats_by_type[notebook_type]["size_stats"][size] = {"count": 0, "quantity": 0}
-                notebook_stats_by_type[notebook_type]["size_stats"][size]["count"] += 1  # 件数
-                notebook_stats_by_type[notebook_type]["size_stats"][size]["quantity"] += quantity  # 個数
-
-            # 機種別カウント
-            device = item.device_info or "不明"
-            if device not in notebook_stats_by_type[notebook_type]["device_stats"]:
-                notebook_stats_by_type[notebook_type]["device_stats"][device] = {"count": 0, "quantity": 0}
-            notebook_stats_by_type[notebook_type]["device_stats"][device]["count"] += 1  # 件数
-            notebook_stats_by_type[notebook_type]["device_stats"][device]["quantity"] += quantity  # 個数
-
-            # ⚠️ 在庫管理用: 手帳型カバーはハードケース部品も必要なため、
-            #    ハードケース統計にも同じ数量を加算する
-            if device and device != "不明":
-                if device not in hardcase_by_device:
-                    hardcase_by_device[device] = {"count": 0, "quantity": 0, "by_date": {}}
-
-                hardcase_by_device[device]["count"] += 1  # 件数
-                hardcase_by_device[device]["quantity"] += quantity  # 個数（手帳用ハードケース部品）
-
-                if order_date not in hardcase_by_device[device]["by_date"]:
-                    hardcase_by_device[device]["by_date"][order_date] = {"count": 0, "quantity": 0}
-                hardcase_by_device[device]["by_date"][order_date]["count"] += 1
-                hardcase_by_device[device]["by_date"][order_date]["quantity"] += quantity
+    total_orders = await db.scalar(select(func.coalesce(func.sum(items.c.qty), 0)))
 
     # データがない場合はサンプルデータを返す
     if total_orders == 0:
-        return {
+        return ORJSONResponse({
             "total_orders": 156,
             "hardcase_stats": [
                 {
@@ -189,53 +189,79 @@ async def get_detailed_order_stats(
                     ]
                 }
             }
-        }
-
-    # ハードケース統計を整形（個数の多い順）
-    hardcase_stats = []
-    for device, data in sorted(hardcase_by_device.items(), key=lambda x: x[1]["quantity"], reverse=True):
-        # 日付別データを整形（日付順）
-        by_date = [
-            {"date": date, "count": date_data["count"], "quantity": date_data["quantity"]}
-            for date, date_data in sorted(data["by_date"].items())
-        ]
-        hardcase_stats.append({
-            "device": device,
-            "count": data["count"],
-            "quantity": data["quantity"],
-            "by_date": by_date
         })
 
-    # 手帳ケース統計を種類別に整形
-    notebook_stats_formatted = {}
-    for notebook_type, stats in notebook_stats_by_type.items():
-        # サイズ別統計（個数の多い順）
-        size_stats = [
-            {"size": size, "count": data["count"], "quantity": data["quantity"]}
-            for size, data in sorted(stats["size_stats"].items(), key=lambda x: x[1]["quantity"], reverse=True)
-        ]
-
-        # 機種別統計（個数の多い順）
-        device_stats = [
-            {"device": device, "count": data["count"], "quantity": data["quantity"]}
-            for device, data in sorted(stats["device_stats"].items(), key=lambda x: x[1]["quantity"], reverse=True)
-        ]
-
-        notebook_stats_formatted[notebook_type] = {
-            "size_stats": size_stats,
-            "device_stats": device_stats
-        }
 
-    return {
+    # ハードケース統計：機種×日付で集計（件数は手帳ケース分の加算を含む）
+    hardcase_rows = (await db.execute(
+        select(
+            items.c.device,
+            items.c.order_date,
+            func.sum(items.c.hardcase_weight).label("count"),
+            func.sum(items.c.hardcase_weight * items.c.qty).label("quantity")
+        )
+        .where(items.c.hardcase_weight > 0)
+        .group_by(items.c.device, items.c.order_date)
+        .order_by(items.c.order_date)
+    )).all()
+
+    hardcase_by_device: Dict[str, Dict] = {}
+    for row in hardcase_rows:
+        data = hardcase_by_device.setdefault(row.device, {"device": row.device, "count": 0, "quantity": 0, "by_date": []})
+        data["count"] += row.count
+        data["quantity"] += row.quantity
+        data["by_date"].append({
+            "date": row.order_date.strftime('%Y-%m-%d') if row.order_date else "不明",
+            "count": row.count,
+            "quantity": row.quantity
+        })
+
+    # 個数の多い順
+    hardcase_stats: List[Dict] = sorted(hardcase_by_device.values(), key=lambda x: x["quantity"], reverse=True)
+
+    # 手帳ケース統計：種類別にサイズ別・機種別で集計（個数の多い順）
+    size_rows = (await db.execute(
+        select(
+            items.c.notebook_type,
+            items.c.size,
+            func.count().label("count"),
+            func.sum(items.c.qty).label("quantity")
+        )
+        .where(items.c.is_notebook == 1, _size_known(items.c.size))
+        .group_by(items.c.notebook_type, items.c.size)
+        .order_by(desc("quantity"))
+    )).all()
+
+    device_rows = (await db.execute(
+        select(
+            items.c.notebook_type,
+            items.c.device,
+            func.count().label("count"),
+            func.sum(items.c.qty).label("quantity")
+        )
+        .where(items.c.is_notebook == 1)
+        .group_by(items.c.notebook_type, items.c.device)
+        .order_by(desc("quantity"))
+    )).all()
+
+    notebook_stats_formatted: Dict[str, Dict] = {}
+    for row in device_rows:
+        stats = notebook_stats_formatted.setdefault(row.notebook_type, {"size_stats": [], "device_stats": []})
+        stats["device_stats"].append({"device": row.device, "count": row.count, "quantity": row.quantity})
+    for row in size_rows:
+        stats = notebook_stats_formatted.setdefault(row.notebook_type, {"size_stats": [], "device_stats": []})
+        stats["size_stats"].append({"size": row.size, "count": row.count, "quantity": row.quantity})
+
+    return ORJSONResponse({
         "total_orders": total_orders,
         "hardcase_stats": hardcase_stats,
         "notebook_stats_by_type": notebook_stats_formatted
-    }
+    })
 
 
-@router.get("/orders/summary")
+@router.get("/orders/summary", dependencies=CACHE_STATS, response_class=ORJSONResponse)
 async def get_order_summary(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     customer_id: int = None
 ):
     """
@@ -246,57 +272,24 @@ async def get_order_summary(
     Args:
         customer_id: 取引先会社ID（指定すると特定の会社のみの統計）
     """
-
-    # 全注文アイテムを取得
-    from app.models.order import Order
-    query = db.query(OrderItem).join(Product).join(Order)
-
-    # 会社フィルタ
-    if customer_id:
-        query = query.filter(Order.customer_id == customer_id)
-
-    order_items = query.all()
-
-    # 統計データの初期化
-    hardcase_by_device: Dict[str, int] = {}
-    notebook_by_size: Dict[str, int] = {}
-    notebook_by_device: Dict[str, int] = {}  # 手帳ケースの機種別統計
-    total_orders = 0
-
-    for item in order_items:
-        # 商品タイプ（product_type）から判定
-        product_type = item.product_type or ""
-
-        # 注文数をカウント
-        quantity = item.quantity or 0
-        total_orders += quantity
-
-        # ハードケースの場合：機種別にカウント
-        if 'ハードケース' in product_type:
-            device = item.device_info or "不明"
-            hardcase_by_device[device] = hardcase_by_device.get(device, 0) + quantity
-
-        # 手帳ケースの場合：サイズ別 AND 機種別にカウント
-        # ⚠️ 重要: 手帳型カバーは「手帳サイズ + ハードケース」で構成されるため、
-        #         手帳統計とハードケース統計の両方に加算する
-        if '手帳' in product_type or 'カバー' in product_type or 'mirror' in product_type:
-            # サイズ別カウント
-            size = item.size_info or "-"
-            if size and size != '-':
-                notebook_by_size[size] = notebook_by_size.get(size, 0) + quantity
-
-            # 機種別カウント（手帳統計用）
-            device = item.device_info or "不明"
-            notebook_by_device[device] = notebook_by_device.get(device, 0) + quantity
-
-            # ⚠️ 在庫管理用: 手帳型カバーはハードケース部品も必要なため、
-            #    ハードケース統計にも同じ数量を加算する
-            if device and device != "不明":
-                hardcase_by_device[device] = hardcase_by_device.get(device, 0) + quantity
+    items = _classified_items(customer_id)
+    is_notebook = items.c.is_notebook == 1
+    notebook_with_size = and_(is_notebook, _size_known(items.c.size))
+
+    # 合計値を1クエリで集計
+    totals = (await db.execute(
+        select(
+            func.coalesce(func.sum(items.c.qty), 0).label("total_orders"),
+            func.coalesce(func.sum(items.c.hardcase_weight * items.c.qty), 0).label("hardcase"),
+            func.coalesce(func.sum(case((notebook_with_size, items.c.qty), else_=0)), 0).label("notebook_size"),
+            func.coalesce(func.sum(case((is_notebook, items.c.qty), else_=0)), 0).label("notebook_device")
+        )
+    )).one()
+    total_orders = totals.total_orders
 
     # データがない場合はサンプルデータを返す
     if total_orders == 0:
-        return {
+        return ORJSONResponse({
             "total_orders": 156,
             "hardcase_by_device": {
                 "total": 78,
@@ -328,48 +321,38 @@ async def get_order_summary(
                     {"device": "Galaxy A54", "count": 10}
                 ]
             }
-        }
+        })
+
 
-    # 上位5件を抽出（注文数の多い順）
-    top_hardcase = sorted(
-        hardcase_by_device.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
-
-    top_notebook_size = sorted(
-        notebook_by_size.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
-
-    top_notebook_device = sorted(
-        notebook_by_device.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
-
-    return {
+    # 上位5件を抽出（注文数の多い順）: 3種類のランキングをUNION ALLで1往復にまとめる
+    # （分類済みアイテムはCTEとして1回だけ評価される）
+    rankings = union_all(
+        _top5("hardcase", items.c.device, items.c.hardcase_weight * items.c.qty, items.c.hardcase_weight > 0),
+        _top5("notebook_size", items.c.size, items.c.qty, notebook_with_size),
+        _top5("notebook_device", items.c.device, items.c.qty, is_notebook),
+    ).subquery()
+    top: Dict[str, List] = {"hardcase": [], "notebook_size": [], "notebook_device": []}
+    for row in (await db.execute(
+        select(rankings).order_by(rankings.c.kind, desc(rankings.c.count), rankings.c.key)
+    )).all():
+        top[row.kind].append(row)
+
+    top_hardcase = [{"device": row.key, "count": row.count} for row in top["hardcase"]]
+    top_notebook_size = [{"size": row.key, "count": row.count} for row in top["notebook_size"]]
+    top_notebook_device = [{"device": row.key, "count": row.count} for row in top["notebook_device"]]
+
+    return ORJSONResponse({
         "total_orders": total_orders,
         "hardcase_by_device": {
-            "total": sum(hardcase_by_device.values()),
-            "top_devices": [
-                {"device": device, "count": count}
-                for device, count in top_hardcase
-            ]
+            "total": totals.hardcase,
+            "top_devices": top_hardcase
         },
         "notebook_by_size": {
-            "total": sum(notebook_by_size.values()),
-            "top_sizes": [
-                {"size": size, "count": count}
-                for size, count in top_notebook_size
-            ]
+            "total": totals.notebook_size,
+            "top_sizes": top_notebook_size
         },
         "notebook_by_device": {
-            "total": sum(notebook_by_device.values()),
-            "top_devices": [
-                {"device": device, "count": count}
-                for device, count in top_notebook_device
-            ]
+            "total": totals.notebook_device,
+            "top_devices": top_notebook_device
         }
-    }
+    })
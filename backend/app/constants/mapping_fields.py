@@ -1,6 +1,7 @@
 """列マッピングフィールド定義"""
 
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Tuple
 
 # 標準フィールド定義
 STANDARD_FIELDS: Dict[str, Dict[str, any]] = {
@@ -144,14 +145,16 @@ STANDARD_FIELDS: Dict[str, Dict[str, any]] = {
 }
 
 
-def get_required_fields() -> List[str]:
+@lru_cache(maxsize=None)
+def get_required_fields() -> Tuple[str, ...]:
     """必須フィールドのリストを取得"""
-    return [key for key, value in STANDARD_FIELDS.items() if value["required"]]
+    return tuple(key for key, value in STANDARD_FIELDS.items() if value["required"])
 
 
-def get_optional_fields() -> List[str]:
+@lru_cache(maxsize=None)
+def get_optional_fields() -> Tuple[str, ...]:
     """オプションフィールドのリストを取得"""
-    return [key for key, value in STANDARD_FIELDS.items() if not value["required"]]
+    return tuple(key for key, value in STANDARD_FIELDS.items() if not value["required"])
 
 
 def get_field_label(field_key: str) -> str:
@@ -164,6 +167,7 @@ def get_field_description(field_key: str) -> str:
     return STANDARD_FIELDS.get(field_key, {}).get("description", "")
 
 
-def get_all_field_keys() -> List[str]:
+@lru_cache(maxsize=None)
+def get_all_field_keys() -> Tuple[str, ...]:
     """すべてのフィールドキーを取得"""
-    return list(STANDARD_FIELDS.keys())
+    return tuple(STANDARD_FIELDS.keys())
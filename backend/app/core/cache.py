@@ -0,0 +1,267 @@
+"""Redis-backed HTTP response cache
+
+GETレスポンスをRedisにキャッシュするASGIミドルウェアと、
+ルート単位でTTL・無効化対象を宣言するための依存関数を提供します。
+
+使い方:
+    @router.get("/", dependencies=[Depends(cache_response(max_age=300))])
+    @router.get("/", dependencies=[Depends(cache_response(max_age=300, stale_while_revalidate=600))])
+    @router.post("/", dependencies=[Depends(invalidate_cache("/api/v1/products*"))])
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode
+
+import redis
+import redis.asyncio as aioredis
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.http_cache import is_not_modified
+
+logger = logging.getLogger(__name__)
+
+# キャッシュキーのプレフィックス
+CACHE_KEY_PREFIX = "httpcache:"
+
+# キャッシュ対象とするパスのプレフィックス
+CACHEABLE_PATH_PREFIX = "/api/v1/"
+
+# 期限切れエントリのバックグラウンド更新を1件に絞るためのロック
+REFRESH_LOCK_PREFIX = "httpcache-refresh:"
+REFRESH_LOCK_SECONDS = 30
+
+# 条件付きリクエストのヘッダー（バックグラウンド更新では304にならないよう除外）
+_CONDITIONAL_HEADERS = (b"if-none-match", b"if-modified-since")
+
+_async_client: Optional[aioredis.Redis] = None
+
+# 実行中のバックグラウンド更新タスク（GCで破棄されないよう参照を保持）
+_refresh_tasks: Set[asyncio.Task] = set()
+
+
+def get_async_redis() -> aioredis.Redis:
+    """非同期Redisクライアントを取得（接続プールを共有）"""
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(settings.REDIS_URL, max_connections=20)
+    return _async_client
+
+
+def build_cache_key(path: str, query_string: str) -> str:
+    """パスとクエリパラメータからキャッシュキーを生成
+
+    クエリパラメータはソートして正規化するため、順序違いでも同じキーになります。
+    """
+    query = urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+    return f"{CACHE_KEY_PREFIX}{path}?{query}"
+
+
+def cache_response(max_age: int, stale_while_revalidate: int = 0) -> Callable[[Request], None]:
+    """GETレスポンスをキャッシュするTTLを宣言する依存関数を生成
+
+    Args:
+        max_age: キャッシュ有効期間（秒）
+        stale_while_revalidate: 有効期間切れ後も古いレスポンスを返しつつ
+            バックグラウンドで更新する猶予期間（秒）
+    """
+    def dependency(request: Request) -> None:
+        request.state.cache_max_age = max_age
+        request.state.cache_stale_while_revalidate = stale_while_revalidate
+
+    return dependency
+
+
+def invalidate_cache(*path_patterns: str) -> Callable[[Request], None]:
+    """成功時にキャッシュを無効化するパスパターンを宣言する依存関数を生成
+
+    Args:
+        path_patterns: 無効化するパスのglobパターン（例: "/api/v1/products*"）
+    """
+    def dependency(request: Request) -> None:
+        request.state.cache_drop_patterns = list(path_patterns)
+
+    return dependency
+
+
+async def drop_cached_paths(path_patterns: List[str]) -> None:
+    """パスパターンに一致するキャッシュを削除"""
+    client = get_async_redis()
+    for pattern in path_patterns:
+        keys = [key async for key in client.scan_iter(match=f"{CACHE_KEY_PREFIX}{pattern}", count=500)]
+        if keys:
+            await client.delete(*keys)
+
+
+def drop_cached_paths_sync(*path_patterns: str) -> None:
+    """パスパターンに一致するキャッシュを削除（Celeryタスクなど同期処理用）"""
+    try:
+        client = redis.Redis.from_url(settings.REDIS_URL)
+        for pattern in path_patterns:
+            keys = list(client.scan_iter(match=f"{CACHE_KEY_PREFIX}{pattern}", count=500))
+            if keys:
+                client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning("Failed to invalidate response cache: %s", e)
+
+
+class ResponseCacheMiddleware:
+    """GETレスポンスをRedisにキャッシュするASGIミドルウェア
+
+    - GET: キャッシュがあればアプリを呼ばずに返却。なければ実行し、
+      ルートが cache_response() を宣言していれば200レスポンスを保存。
+      有効期間切れ（stale_while_revalidate の猶予内）のエントリは
+      そのまま返し、バックグラウンドで再取得して差し替える
+    - その他: ルートが invalidate_cache() を宣言していれば、成功時に対象キャッシュを削除
+
+    Redisに接続できない場合はキャッシュなしで動作します。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(CACHEABLE_PATH_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        # ルートの依存関数が request.state に書き込む値をここから参照する
+        state = scope.setdefault("state", {})
+
+        if scope["method"] == "GET":
+            await self._handle_get(scope, receive, send, state)
+        else:
+            await self._handle_write(scope, receive, send, state)
+
+    async def _handle_get(self, scope, receive, send, state):
+        key = build_cache_key(scope["path"], scope.get("query_string", b"").decode("latin-1"))
+
+        try:
+            cached = await get_async_redis().get(key)
+        except redis.RedisError as e:
+            logger.warning("Response cache unavailable: %s", e)
+            await self.app(scope, receive, send)
+            return
+
+        if cached is not None:
+            entry = json.loads(cached)
+            headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in entry["headers"]]
+            fresh_until = entry.get("fresh_until")
+            if fresh_until is not None and time.time() >= fresh_until:
+                headers.append((b"x-cache", b"STALE"))
+                await self._schedule_refresh(scope, key)
+            else:
+                headers.append((b"x-cache", b"HIT"))
+
+            # キャッシュ済みのETagとIf-None-Matchが一致すれば本文なしの304を返す
+            etag = dict(entry["headers"]).get("etag")
+            if etag and is_not_modified(Request(scope), etag):
+                headers = [(k, v) for k, v in headers if k != b"content-type"]
+                await send({"type": "http.response.start", "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send({"type": "http.response.start", "status": entry["status"], "headers": headers})
+            await send({"type": "http.response.body", "body": entry["body"].encode("utf-8")})
+            return
+
+        start_message = {}
+        body_parts = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                start_message.update(message)
+            elif message["type"] == "http.response.body":
+                body_parts.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    await self._store(key, state, start_message, b"".join(body_parts))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _store(self, key, state, start_message, body):
+        max_age = state.get("cache_max_age")
+        if not max_age or start_message.get("status") != 200:
+            return
+
+        headers = [
+            (k.decode("latin-1"), v.decode("latin-1"))
+            for k, v in start_message.get("headers", [])
+            if k.lower() in (b"content-type", b"etag", b"cache-control")
+        ]
+        entry = {"status": 200, "headers": headers}
+        ttl = max_age
+        stale_while_revalidate = state.get("cache_stale_while_revalidate")
+        if stale_while_revalidate:
+            entry["fresh_until"] = time.time() + max_age
+            ttl += stale_while_revalidate
+        try:
+            entry["body"] = body.decode("utf-8")
+            await get_async_redis().set(key, json.dumps(entry), ex=ttl)
+        except (redis.RedisError, UnicodeDecodeError) as e:
+            logger.warning("Failed to store cached response: %s", e)
+
+    async def _schedule_refresh(self, scope, key):
+        """期限切れエントリの再取得をバックグラウンドで開始（同一キーは1件のみ）"""
+        try:
+            acquired = await get_async_redis().set(
+                f"{REFRESH_LOCK_PREFIX}{key}", b"1", nx=True, ex=REFRESH_LOCK_SECONDS
+            )
+        except redis.RedisError as e:
+            logger.warning("Response cache unavailable: %s", e)
+            return
+        if acquired:
+            task = asyncio.create_task(self._refresh(scope, key))
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+
+    async def _refresh(self, scope, key):
+        """クライアントなしでアプリを実行し、結果をキャッシュに保存"""
+        state = {}
+        refresh_scope = dict(
+            scope,
+            state=state,
+            headers=[(k, v) for k, v in scope["headers"] if k not in _CONDITIONAL_HEADERS]
+        )
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # クライアント切断は発生しないため、レスポンス完了まで待機させる
+            await asyncio.Future()
+
+        start_message = {}
+        body_parts = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                start_message.update(message)
+            elif message["type"] == "http.response.body":
+                body_parts.append(message.get("body", b""))
+
+        try:
+            await self.app(refresh_scope, receive, send)
+            await self._store(key, state, start_message, b"".join(body_parts))
+        except Exception:
+            logger.exception("Failed to refresh cached response: %s", key)
+
+    async def _handle_write(self, scope, receive, send, state):
+        async def send_wrapper(message):
+            # レスポンス送信前に無効化し、直後の再取得で古いキャッシュが返らないようにする
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                patterns = state.get("cache_drop_patterns")
+                if patterns:
+                    try:
+                        await drop_cached_paths(patterns)
+                    except redis.RedisError as e:
+                        logger.warning("Failed to invalidate response cache: %s", e)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -24,25 +24,40 @@ celery_app.conf.update(
     task_soft_time_limit=25 * 60,  # 25分
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    # 長時間タスクは完了後にACK（ワーカー異常終了時に再実行される。冪等でないタスクはタスク側で無効化）
+    task_acks_late=True,
+    # ブローカー接続をプールして再接続を抑制
+    broker_pool_limit=100,
+    # ACK前のタスクを再配信するまでの時間（task_time_limitより長くする）
+    broker_transport_options={'visibility_timeout': 3600},
+    # 監視UIを使わない場合のイベント送信を無効化
+    worker_send_task_events=False,
+    task_send_sent_event=False,
+    # CPU負荷の高いファイル解析・取込は専用キューに分離（docker-compose の celery_import_worker が処理）
+    task_routes={
+        'process_file_import': {'queue': 'imports'},
+        'import_parsed_data': {'queue': 'imports'},
+    },
 )
 
-# Celery Beat スケジュール設定
-celery_app.conf.beat_schedule = {
-    'auto-generate-invoices-daily': {
-        'task': 'auto_generate_invoices',
-        'schedule': 3600.0,  # 1時間ごと（テスト用）本番では86400.0（1日）に変更
-        'options': {
-            'expires': 3600,  # 1時間以内に実行されなければ期限切れ
-        }
-    },
-    'sync-device-master-daily': {
-        'task': 'sync_device_master_from_supabase',
-        'schedule': 86400.0,  # 毎日1回（24時間ごと）
-        'options': {
-            'expires': 7200,  # 2時間以内に実行されなければ期限切れ
-        }
-    },
-}
+# Celery Beat スケジュール設定（テスト環境・BEAT_ENABLED=False の場合は登録しない）
+if settings.BEAT_ENABLED and settings.ENVIRONMENT != "test":
+    celery_app.conf.beat_schedule = {
+        'auto-generate-invoices-daily': {
+            'task': 'auto_generate_invoices',
+            'schedule': 3600.0,  # 1時間ごと（テスト用）本番では86400.0（1日）に変更
+            'options': {
+                'expires': 3600,  # 1時間以内に実行されなければ期限切れ
+            }
+        },
+        'sync-device-master-daily': {
+            'task': 'sync_device_master_from_supabase',
+            'schedule': 86400.0,  # 毎日1回（24時間ごと）
+            'options': {
+                'expires': 7200,  # 2時間以内に実行されなければ期限切れ
+            }
+        },
+    }
 
 # タスク自動検出設定
 celery_app.autodiscover_tasks(['app.tasks'])
@@ -1,7 +1,9 @@
 """Application configuration"""
 
+import os
 from functools import lru_cache
 from typing import Optional
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import yaml
 from pathlib import Path
@@ -20,19 +22,38 @@ class Settings(BaseSettings):
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     API_RELOAD: bool = True
+    # uvicornワーカー数（API_RELOAD有効時は1）
+    API_WORKERS: int = Field(default_factory=lambda: 2 * (os.cpu_count() or 1) + 1)
 
     # Database
     DATABASE_URL: str
+    READ_DATABASE_URL: Optional[str] = None  # 読み取り専用レプリカ（未設定時はDATABASE_URL）
     POSTGRES_USER: str = "accusync"
     POSTGRES_PASSWORD: str = "accusync_pass"
     POSTGRES_DB: str = "accusync"
 
+    # Database connection pool (PostgreSQL only; ignored for SQLite)
+    # プロセス（uvicornワーカー・Celeryワーカー）ごとの値。
+    # ワーカー数 x (DB_POOL_SIZE + DB_MAX_OVERFLOW) が max_connections に収まるようにする
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # async def エンドポイント用エンジン（プライマリ・レプリカそれぞれ）のプール
+    DB_ASYNC_POOL_SIZE: int = 3
+    DB_ASYNC_MAX_OVERFLOW: int = 2
+    # APIプロセス全体で使ってよいプライマリへの接続数（Celery・管理用に max_connections から余裕を残す）
+    # ワーカーあたりの最大接続数から uvicorn のワーカー数の上限を決める
+    DB_MAX_CONNECTIONS: int = 90
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600  # seconds
+    DB_POOL_PRE_PING: bool = True
+
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    BEAT_ENABLED: bool = True  # Falseで定期実行スケジュールを登録しない（テスト・開発用）
 
     # Security
     SECRET_KEY: str
@@ -66,6 +87,9 @@ class Settings(BaseSettings):
     AI_TEMPERATURE: float = 0.1
     AI_MAX_TOKENS: int = 4000
 
+    # PDF Parsing
+    PDF_BACKEND: str = "pdfplumber"  # pdfplumber, pymupdf（PyMuPDFはAGPL-3.0のため任意。未インストール時は pdfplumber）
+
     # Email (Optional)
     SMTP_HOST: Optional[str] = None
     SMTP_PORT: int = 587
@@ -77,18 +101,29 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=True,
-        extra="ignore"
+        extra="ignore",
+        frozen=True
     )
 
     def load_ai_config(self) -> dict:
-        """Load AI configuration from YAML file"""
-        config_path = Path(__file__).parent.parent.parent.parent / "config" / "ai_settings.yaml"
+        """Load AI configuration from YAML file (parsed once per process)"""
+        return _load_ai_config()
+
+
+# libyamlがあればCローダーを使用（pure-Pythonのsafe_loadより高速）
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=1)
+def _load_ai_config() -> dict:
+    """Read and parse config/ai_settings.yaml"""
+    config_path = Path(__file__).parent.parent.parent.parent / "config" / "ai_settings.yaml"
 
-        if config_path.exists():
-            with open(config_path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f)
+    if config_path.exists():
+        with open(config_path, "r", encoding="utf-8") as f:
+            return yaml.load(f, Loader=_YAML_LOADER)
 
-        return {}
+    return {}
 
 
 @lru_cache()
@@ -0,0 +1,69 @@
+"""Lightweight CORS middleware
+
+全オリジンを許可するCORS処理のみを行う素のASGIミドルウェア。
+オリジンごとの許可リスト判定が不要なため、Starlette の CORSMiddleware より
+リクエストあたりの処理を減らしています。
+"""
+
+ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+# プリフライト結果をブラウザがキャッシュする秒数
+PREFLIGHT_MAX_AGE = b"600"
+
+
+class CORSLiteMiddleware:
+    """全オリジン許可のCORSヘッダーを付与するASGIミドルウェア
+
+    - プリフライト（OPTIONS + Access-Control-Request-Method）: アプリを呼ばずに204を返す
+    - その他: レスポンス開始メッセージにCORSヘッダーを追加
+
+    資格情報付きリクエストにも対応するため、Originはワイルドカードではなく
+    リクエストの値をそのまま返します。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                request_method = value
+            elif key == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = cors_headers + [
+                (b"access-control-allow-methods", ALLOW_METHODS),
+                (b"access-control-max-age", PREFLIGHT_MAX_AGE),
+            ]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
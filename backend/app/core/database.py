@@ -1,24 +1,146 @@
 """Database configuration and session management"""
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import StaticPool
+from typing import AsyncGenerator, Generator, Optional
 
 from app.core.config import settings
 
+
+def _engine_options(database_url: str, pool_size: int, max_overflow: int) -> dict:
+    """Build connection pool options for the given database URL
+
+    Each engine in each process gets its own pool, so the sizes are a
+    per-engine budget (see ``max_connections_per_worker``).
+
+    Args:
+        database_url: SQLAlchemy database URL
+        pool_size: Connections kept open in the pool
+        max_overflow: Extra connections allowed above pool_size
+
+    Returns:
+        Keyword arguments for ``create_engine``
+    """
+    if database_url.startswith("sqlite"):
+        # SQLite: keep connections alive (hot page cache) and allow
+        # sharing across FastAPI's worker threads
+        options = {"connect_args": {"check_same_thread": False}}
+        if database_url in ("sqlite://", "sqlite:///:memory:"):
+            # In-memory DB exists per connection: share a single one
+            options["poolclass"] = StaticPool
+        return options
+
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def _async_database_url(database_url: str) -> str:
+    """Map a sync database URL to its async driver equivalent
+
+    Args:
+        database_url: SQLAlchemy database URL (psycopg2 / sqlite)
+
+    Returns:
+        URL using asyncpg / aiosqlite
+    """
+    for prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if database_url.startswith(prefix):
+            return async_prefix + database_url[len(prefix):]
+    return database_url
+
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    **_engine_options(settings.DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 非同期エンジンは初回使用時に作成する（非同期ドライバーを使わないプロセスでは読み込まない）
+_async_engine: Optional[AsyncEngine] = None
+_async_read_engine: Optional[AsyncEngine] = None
+_async_sessionmaker: Optional[async_sessionmaker] = None
+_async_read_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def max_connections_per_worker() -> int:
+    """Upper bound of primary DB connections one API worker can open (sync + async pools)"""
+    if settings.DATABASE_URL.startswith("sqlite"):
+        return 0
+    return (
+        settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        + settings.DB_ASYNC_POOL_SIZE + settings.DB_ASYNC_MAX_OVERFLOW
+    )
+
+
+def _create_async_engine(database_url: str) -> AsyncEngine:
+    return create_async_engine(
+        _async_database_url(database_url),
+        echo=settings.DEBUG,
+        **_engine_options(database_url, settings.DB_ASYNC_POOL_SIZE, settings.DB_ASYNC_MAX_OVERFLOW)
+    )
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get the async engine for `async def` endpoints (does not block the event loop)"""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = _create_async_engine(settings.DATABASE_URL)
+    return _async_engine
+
+
+def get_async_read_engine() -> AsyncEngine:
+    """Get the async engine for read-only reporting endpoints (replica when configured)"""
+    global _async_read_engine
+    if _async_read_engine is None:
+        _async_read_engine = (
+            _create_async_engine(settings.READ_DATABASE_URL)
+            if settings.READ_DATABASE_URL
+            else get_async_engine()
+        )
+    return _async_read_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Get the session factory bound to the async engine"""
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(
+            get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_sessionmaker
+
+
+def get_async_read_sessionmaker() -> async_sessionmaker:
+    """Get the session factory bound to the async read engine"""
+    global _async_read_sessionmaker
+    if _async_read_sessionmaker is None:
+        _async_read_sessionmaker = async_sessionmaker(
+            get_async_read_engine(),
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_read_sessionmaker
+
+
 # Create base class for models
 Base = declarative_base()
 
@@ -36,6 +158,43 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session
+
+    Use from `async def` endpoints; sync endpoints keep using get_db.
+
+    Yields:
+        Async database session
+    """
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async read-only database session
+
+    Uses the READ_DATABASE_URL replica when configured, so reads may lag
+    slightly behind the primary. Use only for reporting / list endpoints.
+
+    Yields:
+        Async database session
+    """
+    async with get_async_read_sessionmaker()() as db:
+        yield db
+
+
 def init_db() -> None:
     """Initialize database tables"""
+    from app.models import load_all_models
+
+    load_all_models()
     Base.metadata.create_all(bind=engine)
+
+
+async def init_db_async() -> None:
+    """Initialize database tables on the async engine (for startup hooks)"""
+    from app.models import load_all_models
+
+    load_all_models()
+    async with get_async_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
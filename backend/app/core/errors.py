@@ -0,0 +1,59 @@
+"""Internal server error middleware
+
+未処理の例外を500のJSONレスポンスに変換する素のASGIミドルウェア。
+正常系ではRequest/Responseオブジェクトを生成しません。
+"""
+
+import orjson
+
+# 本番用の固定レスポンス（事前にエンコード）
+_GENERIC_ERROR_BODY = orjson.dumps({
+    "error": "Internal Server Error",
+    "message": "An unexpected error occurred"
+})
+
+_ERROR_HEADERS = [(b"content-type", b"application/json")]
+
+
+class InternalErrorMiddleware:
+    """未処理の例外を500のJSONレスポンスとして返すASGIミドルウェア
+
+    レスポンス送信前の例外のみ変換し、例外はログ出力のため再送出します
+    （Starlette の exception_handler(Exception) と同じ挙動）。
+
+    Args:
+        app: ASGIアプリケーション
+        debug: Trueの場合、例外メッセージをレスポンスに含める
+    """
+
+    def __init__(self, app, debug: bool = False):
+        self.app = app
+        self.debug = debug
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if not response_started:
+                body = self._error_body(exc)
+                headers = _ERROR_HEADERS + [(b"content-length", str(len(body)).encode("latin-1"))]
+                await send({"type": "http.response.start", "status": 500, "headers": headers})
+                await send({"type": "http.response.body", "body": body})
+            raise
+
+    def _error_body(self, exc: Exception) -> bytes:
+        if not self.debug:
+            return _GENERIC_ERROR_BODY
+        return orjson.dumps({"error": "Internal Server Error", "message": str(exc)})
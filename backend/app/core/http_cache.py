@@ -0,0 +1,65 @@
+"""HTTP conditional request helpers (ETag / If-None-Match)"""
+
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response
+
+# 既定のCache-Control（ブラウザ単位で短時間キャッシュ、以降はETagで再検証）
+DEFAULT_CACHE_CONTROL = "private, max-age=60"
+
+
+def make_etag(*parts: Any, weak: bool = False) -> str:
+    """値から安定したETagを生成
+
+    Args:
+        parts: ETagの元になる値（JSONシリアライズ可能な値）
+        weak: 弱いETag（W/"..."）を生成する場合True
+
+    Returns:
+        ETagヘッダー値
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """リクエストのIf-None-MatchがETagと一致するか判定
+
+    If-None-Matchの比較は弱い比較（W/プレフィックスを無視）で行います。
+
+    Args:
+        request: FastAPIリクエスト
+        etag: 現在のETag
+
+    Returns:
+        一致する場合True（304を返せる）
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str = DEFAULT_CACHE_CONTROL) -> None:
+    """レスポンスにETagとCache-Controlを設定"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str = DEFAULT_CACHE_CONTROL) -> Response:
+    """304 Not Modifiedレスポンスを生成"""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
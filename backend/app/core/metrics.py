@@ -0,0 +1,96 @@
+"""Prometheus metrics
+
+ルートごとのリクエスト数・レイテンシを記録する素のASGIミドルウェアと、
+/metrics 用のレスポンス生成関数を提供します。
+
+複数ワーカーで起動する場合は PROMETHEUS_MULTIPROC_DIR を設定すると
+全ワーカーの値を集計して返します。
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from starlette.routing import Match
+
+REQUEST_COUNT = Counter(
+    "http_requests_total",
+    "HTTP requests",
+    ["method", "route", "status"]
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+# ルーティングされなかったリクエストのラベル（生のパスを使うとラベル数が際限なく増える）
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """リクエスト数・レイテンシをルートのパステンプレート単位で記録するASGIミドルウェア
+
+    ラベルには "/api/v1/customers/{customer_id}" のようなテンプレートを使います。
+    キャッシュHITなどルーターを通らなかったリクエストは routes と照合して決定します。
+
+    Args:
+        app: ASGIアプリケーション
+        routes: 照合に使うルート一覧（app.router.routes）
+    """
+
+    def __init__(self, app, routes):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter_ns()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = (time.perf_counter_ns() - start) / 1e9
+            route = self._route_template(scope)
+            REQUEST_LATENCY.labels(scope["method"], route).observe(elapsed)
+            REQUEST_COUNT.labels(scope["method"], route, str(status_code)).inc()
+
+    def _route_template(self, scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return UNMATCHED_ROUTE
+
+
+def metrics_response_body() -> bytes:
+    """Prometheus のテキスト形式でメトリクスを出力"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
@@ -1,11 +1,26 @@
 """AccuSync FastAPI Application"""
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+import asyncio
+import logging
+from typing import Optional
 
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+
+from app.core.cache import ResponseCacheMiddleware
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.cors import CORSLiteMiddleware
+from app.core.errors import InternalErrorMiddleware
+from app.core.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, metrics_response_body
+from app.core.database import init_db_async, max_connections_per_worker
+
+logging.basicConfig(
+    level=logging.DEBUG if settings.DEBUG else logging.INFO,
+    format="%(asctime)s %(name)s %(levelname)s %(message)s"
+)
+logger = logging.getLogger("accusync")
 
 # Create FastAPI application
 app = FastAPI(
@@ -14,74 +29,114 @@ app = FastAPI(
     description="請求書作成システム - Invoice Management System",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    # orjsonでJSONエンコード（標準jsonより高速、datetime等も直接シリアライズ）
+    default_response_class=ORJSONResponse
 )
 
-# CORS設定
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # 本番環境では具体的なオリジンを指定
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# ミドルウェアは後に追加したものが外側になる
+
+# GETレスポンスのRedisキャッシュ（ルートごとにTTL・無効化対象を宣言）
+app.add_middleware(ResponseCacheMiddleware)
+
+# 1KB以上のレスポンスをgzip圧縮（キャッシュには非圧縮の本文を保存するため、キャッシュより外側に置く）
+# PDFはオブジェクトストレージから配信されるため対象外
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# 未処理の例外を500のJSONレスポンスに変換（CORSヘッダーが付くようCORSの内側に置く）
+app.add_middleware(InternalErrorMiddleware, debug=settings.DEBUG)
+
+# ルート別のリクエスト数・レイテンシ（キャッシュHITや500も含めて計測）
+app.add_middleware(MetricsMiddleware, routes=app.router.routes)
+
+# CORS設定（全オリジン許可。本番環境では具体的なオリジンを指定）
+# キャッシュHIT時のレスポンスにもヘッダーを付与するため最も外側に置く
+app.add_middleware(CORSLiteMiddleware)
+
+
+# 起動時のデータベース初期化タスク（/health で完了を確認する）
+_db_init_task: Optional[asyncio.Task] = None
+# 初期化に失敗した場合の例外（/health は503を返し続ける）
+_db_init_error: Optional[BaseException] = None
 
 
 @app.on_event("startup")
 async def startup_event():
     """アプリケーション起動時の処理"""
-    print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} is starting...")
-    print(f"📝 Environment: {settings.ENVIRONMENT}")
-    print(f"🗄️  Database: {settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'N/A'}")
-    print(f"🤖 AI Provider: {settings.AI_PROVIDER}")
+    logger.info("%s v%s is starting...", settings.APP_NAME, settings.APP_VERSION)
+    logger.info("Environment: %s", settings.ENVIRONMENT)
+    logger.info(
+        "Database: %s",
+        settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'N/A'
+    )
+    logger.info(
+        "DB pool: size=%s, max_overflow=%s, timeout=%ss",
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT
+    )
+    logger.info("AI Provider: %s", settings.AI_PROVIDER)
+
+    # テーブル作成は非同期エンジンで実行し、完了を待たずにリクエスト受付を開始する
+    global _db_init_task, _db_init_error
+    _db_init_error = None
+    _db_init_task = asyncio.create_task(_initialize_database())
+
 
-    # Initialize database
+async def _initialize_database() -> None:
+    """データベースを初期化（テーブル作成）"""
+    global _db_init_error
     try:
-        init_db()
-        print("✅ Database initialized successfully")
+        await init_db_async()
+        logger.info("Database initialized successfully")
     except Exception as e:
-        print(f"❌ Database initialization failed: {e}")
+        _db_init_error = e
+        logger.exception("Database initialization failed")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """アプリケーション終了時の処理"""
-    print(f"👋 {settings.APP_NAME} is shutting down...")
+    logger.info("%s is shutting down...", settings.APP_NAME)
+
+
+# 設定は起動後に変わらないため、固定レスポンスは起動時に一度だけエンコードする
+_ROOT_RESPONSE = orjson.dumps({
+    "app": settings.APP_NAME,
+    "version": settings.APP_VERSION,
+    "status": "running",
+    "environment": settings.ENVIRONMENT,
+    "docs": "/docs"
+})
+_HEALTH_PAYLOAD = {
+    "status": "healthy",
+    "app": settings.APP_NAME,
+    "version": settings.APP_VERSION
+}
+_HEALTH_RESPONSE = orjson.dumps(_HEALTH_PAYLOAD)
+_STARTING_RESPONSE = orjson.dumps({**_HEALTH_PAYLOAD, "status": "starting"})
+_UNHEALTHY_RESPONSE = orjson.dumps({**_HEALTH_PAYLOAD, "status": "unhealthy"})
 
 
 @app.get("/")
 async def root():
     """ルートエンドポイント"""
-    return {
-        "app": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "status": "running",
-        "environment": settings.ENVIRONMENT,
-        "docs": "/docs"
-    }
+    return Response(_ROOT_RESPONSE, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
-    """ヘルスチェックエンドポイント"""
-    return {
-        "status": "healthy",
-        "app": settings.APP_NAME,
-        "version": settings.APP_VERSION
-    }
-
-
-# Exception handlers
-@app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
-    """グローバル例外ハンドラー"""
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "Internal Server Error",
-            "message": str(exc) if settings.DEBUG else "An unexpected error occurred"
-        }
-    )
+    """ヘルスチェックエンドポイント（DB初期化中・初期化失敗時は503）"""
+    if _db_init_task is not None and not _db_init_task.done():
+        return Response(_STARTING_RESPONSE, status_code=503, media_type="application/json")
+    if _db_init_error is not None:
+        return Response(_UNHEALTHY_RESPONSE, status_code=503, media_type="application/json")
+
+    return Response(_HEALTH_RESPONSE, media_type="application/json")
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheusメトリクス"""
+    return Response(metrics_response_body(), media_type=CONTENT_TYPE_LATEST)
 
 
 # Import and include routers
@@ -178,11 +233,34 @@ app.include_router(
 # app.include_router(customers.router, prefix="/api/v1/customers", tags=["customers"])
 
 
+def _worker_count() -> int:
+    """uvicornワーカー数（ワーカー数 x ワーカーあたりの最大接続数が DB_MAX_CONNECTIONS に収まるよう制限）"""
+    if settings.API_RELOAD:
+        return 1
+
+    workers = settings.API_WORKERS
+    per_worker = max_connections_per_worker()
+    if per_worker:
+        limit = max(1, settings.DB_MAX_CONNECTIONS // per_worker)
+        if workers > limit:
+            logger.warning(
+                "API_WORKERS=%s would need up to %s DB connections; starting %s workers "
+                "(DB_MAX_CONNECTIONS=%s, %s per worker)",
+                workers, workers * per_worker, limit, settings.DB_MAX_CONNECTIONS, per_worker
+            )
+            workers = limit
+    return workers
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host=settings.API_HOST,
         port=settings.API_PORT,
-        reload=settings.API_RELOAD
+        reload=settings.API_RELOAD,
+        loop="uvloop",
+        http="httptools",
+        workers=_worker_count(),
+        log_level="warning"
     )
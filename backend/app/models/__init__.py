@@ -1,5 +1,7 @@
 """Database models"""
 
+import importlib
+
 from app.models.issuer_company import IssuerCompany
 from app.models.customer_company import CustomerCompany
 from app.models.customer_identifier import CustomerIdentifier
@@ -9,11 +11,16 @@ from app.models.order import Order, OrderItem
 from app.models.invoice import Invoice, InvoiceItem
 from app.models.user import User
 from app.models.audit_log import AuditLog
-from app.models.import_job import ImportJob
 from app.models.mapping_template import MappingTemplate
-from app.models.product_type_pattern import ProductTypePattern
-from app.models.device_pattern import DevicePattern
-from app.models.size_pattern import SizePattern
+
+# 他モデルからリレーションで参照されないモデルは初回アクセス時にインポートする
+# （使用するエンドポイント・サービスは各モジュールから直接インポートしている）
+_LAZY_MODELS = {
+    "ImportJob": "app.models.import_job",
+    "ProductTypePattern": "app.models.product_type_pattern",
+    "DevicePattern": "app.models.device_pattern",
+    "SizePattern": "app.models.size_pattern",
+}
 
 __all__ = [
     "IssuerCompany",
@@ -33,3 +40,18 @@ __all__ = [
     "DevicePattern",
     "SizePattern",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_MODELS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    model = getattr(importlib.import_module(module_name), name)
+    globals()[name] = model
+    return model
+
+
+def load_all_models() -> None:
+    """遅延インポート対象を含む全モデルをメタデータに登録（create_all 用）"""
+    for name in _LAZY_MODELS:
+        __getattr__(name)
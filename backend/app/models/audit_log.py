@@ -1,7 +1,7 @@
 """Audit Log model - 監査ログ"""
 
-from sqlalchemy import Column, String, Integer, Text, ForeignKey, JSON
-from app.models.base import BaseModel
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, Index
+from app.models.base import BaseModel, JSONType
 from sqlalchemy.orm import relationship
 
 
@@ -12,6 +12,10 @@ class AuditLog(BaseModel):
     """
 
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # 変更差分の内容での検索用（PostgreSQLのみGIN）
+        Index('ix_audit_logs_diff_json_gin', 'diff_json', postgresql_using='gin'),
+    )
 
     # アクター
     actor_user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True, comment="実行ユーザーID")
@@ -24,7 +28,7 @@ class AuditLog(BaseModel):
     target_id = Column(Integer, nullable=True, comment="対象レコードID")
 
     # 変更内容（JSON形式でBefore/After）
-    diff_json = Column(JSON, nullable=True, comment="変更差分（JSON）")
+    diff_json = Column(JSONType, nullable=True, comment="変更差分（JSON）")
 
     # Relationships
     actor = relationship("User", back_populates="audit_logs")
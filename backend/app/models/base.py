@@ -1,27 +1,57 @@
 """Base model with common fields"""
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy import Column, Integer, DateTime, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.sql.expression import FunctionElement
 
 from app.core.database import Base
 
+# JSON列の型（PostgreSQLではバイナリ形式のJSONBでGINインデックスも利用可能、その他はJSON）
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class utcnow(FunctionElement):
+    """DB側で評価する現在時刻（UTC、タイムゾーンなし）
+
+    既存データ（datetime.utcnow で保存）と同じ naive UTC の値になります。
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    # SQLite の CURRENT_TIMESTAMP は UTC
+    return "CURRENT_TIMESTAMP"
+
 
 class TimestampMixin:
-    """Mixin for created_at and updated_at timestamps"""
+    """Mixin for created_at and updated_at timestamps
+
+    時刻はINSERT/UPDATE文の中でDBが生成します（Python側で値を作りません）。
+    """
 
     @declared_attr
     def created_at(cls):
-        return Column(DateTime, default=datetime.utcnow, nullable=False)
+        return Column(DateTime, default=utcnow(), server_default=utcnow(), nullable=False)
 
     @declared_attr
     def updated_at(cls):
-        return Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+        return Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow(), nullable=False)
 
 
 class BaseModel(Base, TimestampMixin):
     """Base model with id and timestamps"""
 
     __abstract__ = True
+    # UPDATE時にDBが生成した updated_at をRETURNINGで取得（再読込のSELECTを省く）
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
@@ -1,6 +1,6 @@
 """Customer Company model - 取引先会社"""
 
-from sqlalchemy import Column, String, Text, Integer, Boolean
+from sqlalchemy import Column, String, Text, Integer, Boolean, CheckConstraint
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -14,6 +14,13 @@ class CustomerCompany(BaseModel):
 
     __tablename__ = "customer_companies"
 
+    __table_args__ = (
+        # 支払条件の値域（NULLは未設定として許可）
+        CheckConstraint("closing_day BETWEEN 0 AND 31", name="ck_customer_companies_closing_day"),
+        CheckConstraint("payment_day BETWEEN 0 AND 31", name="ck_customer_companies_payment_day"),
+        CheckConstraint("payment_month_offset BETWEEN 0 AND 12", name="ck_customer_companies_payment_month_offset"),
+    )
+
     # 基本情報
     name = Column(String(255), nullable=False, index=True, comment="会社名/氏名")
     code = Column(String(50), nullable=False, unique=True, index=True, comment="会社コード")
@@ -1,10 +1,19 @@
 """Customer Identifier model - 顧客識別情報"""
 
-from sqlalchemy import Column, String, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Computed, String, Integer, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
 
+# 照合用の正規化式（半角・全角スペースを除去して小文字化）
+# normalize_identifier_value() と同じ変換をDB側で行う
+IDENTIFIER_NORMALIZED_SQL = "lower(replace(replace(identifier_value, ' ', ''), '　', ''))"
+
+
+def normalize_identifier_value(value: str) -> str:
+    """識別情報の値を照合用に正規化（identifier_value_normalized 列と同じ変換）"""
+    return value.replace(' ', '').replace('　', '').lower()
+
 
 class CustomerIdentifier(BaseModel):
     """顧客識別情報
@@ -21,7 +30,6 @@ class CustomerIdentifier(BaseModel):
         Integer,
         ForeignKey("customer_companies.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
         comment="取引先ID"
     )
 
@@ -29,7 +37,6 @@ class CustomerIdentifier(BaseModel):
     identifier_type = Column(
         String(50),
         nullable=False,
-        index=True,
         comment="識別情報タイプ（csv_name, phone, address, email, etc.）"
     )
 
@@ -37,16 +44,32 @@ class CustomerIdentifier(BaseModel):
     identifier_value = Column(
         String(500),
         nullable=False,
-        index=True,
         comment="識別情報の値"
     )
 
+    # 照合用に正規化した値（表記ゆれを吸収して自動判別に使用）
+    identifier_value_normalized = Column(
+        String(500),
+        Computed(IDENTIFIER_NORMALIZED_SQL, persisted=True),
+        comment="正規化した識別情報の値（identifier_valueから自動生成）"
+    )
+
     # Relationships
     customer = relationship("CustomerCompany", back_populates="identifiers")
 
     # ユニーク制約（同じ識別情報を複数の顧客に紐付けない）
+    # タイプ・値での検索はこの制約のインデックスを使うため、列単独のインデックスは作らない
     __table_args__ = (
         UniqueConstraint('identifier_type', 'identifier_value', name='uq_identifier_type_value'),
+        # 顧客ごとの識別情報の取得用（値を含めてインデックスのみで完結）
+        Index(
+            'ix_customer_identifiers_customer_type',
+            'customer_id',
+            'identifier_type',
+            postgresql_include=['identifier_value']
+        ),
+        # 自動判別・保存時の重複チェック（タイプ＋正規化値での完全一致）用
+        Index('ix_customer_identifiers_type_normalized', 'identifier_type', 'identifier_value_normalized'),
     )
 
     def __repr__(self):
@@ -1,7 +1,7 @@
 """Import Job model - インポートジョブ"""
 
-from sqlalchemy import Column, String, Integer, DateTime, Text, JSON
-from app.models.base import BaseModel
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
+from app.models.base import BaseModel, JSONType
 
 
 class ImportJob(BaseModel):
@@ -11,6 +11,10 @@ class ImportJob(BaseModel):
     """
 
     __tablename__ = "import_jobs"
+    __table_args__ = (
+        # エラー内容での検索・集計用（PostgreSQLのみGIN）
+        Index('ix_import_jobs_errors_gin', 'errors', postgresql_using='gin'),
+    )
 
     # ジョブ情報
     job_type = Column(String(50), nullable=True, default="file_import", comment="ジョブタイプ: file_import, invoice_generation")
@@ -22,7 +26,7 @@ class ImportJob(BaseModel):
     file_type = Column(String(50), nullable=True, comment="ファイルタイプ: csv, excel, pdf, txt")
 
     # マッピング情報
-    mapping_json = Column(JSON, nullable=True, comment="マッピング情報（JSON）")
+    mapping_json = Column(JSONType, nullable=True, comment="マッピング情報（JSON）")
 
     # 処理結果
     total_rows = Column(Integer, nullable=True, default=0, comment="総行数")
@@ -30,11 +34,11 @@ class ImportJob(BaseModel):
     error_count = Column(Integer, nullable=True, default=0, comment="エラー行数")
 
     # 警告とエラー
-    warnings = Column(JSON, nullable=True, default=list, comment="警告リスト")
-    errors = Column(JSON, nullable=True, default=list, comment="エラーリスト")
+    warnings = Column(JSONType, nullable=True, default=list, comment="警告リスト")
+    errors = Column(JSONType, nullable=True, default=list, comment="エラーリスト")
 
     # 結果データ
-    result_data = Column(JSON, nullable=True, comment="処理結果データ（JSON）")
+    result_data = Column(JSONType, nullable=True, comment="処理結果データ（JSON）")
 
     # エラー情報（後方互換性のため保持）
     error_report_url = Column(String(500), nullable=True, comment="エラーレポートURL")
@@ -1,6 +1,6 @@
 """Invoice models - 請求書"""
 
-from sqlalchemy import Column, String, Integer, Date, Text, ForeignKey, Numeric
+from sqlalchemy import Column, String, Integer, Date, Text, ForeignKey, Index, Numeric
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -13,13 +13,18 @@ class Invoice(BaseModel):
     """
 
     __tablename__ = "invoices"
+    __table_args__ = (
+        # 取引先×集計期間（重複チェック・一覧）、取引先×発行日での絞り込み用
+        Index('ix_invoices_customer_period', 'customer_id', 'period_start', 'period_end'),
+        Index('ix_invoices_customer_issue', 'customer_id', 'issue_date'),
+    )
 
     # 請求書情報
     invoice_no = Column(String(100), nullable=False, unique=True, index=True, comment="請求書番号")
 
     # リレーション
     issuer_company_id = Column(Integer, ForeignKey("issuer_companies.id"), nullable=False, comment="発行会社ID")
-    customer_id = Column(Integer, ForeignKey("customer_companies.id"), nullable=False, index=True, comment="取引先ID")
+    customer_id = Column(Integer, ForeignKey("customer_companies.id"), nullable=False, comment="取引先ID")
 
     # 期間
     period_start = Column(Date, nullable=False, comment="集計期間開始日")
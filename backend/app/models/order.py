@@ -1,10 +1,24 @@
 """Order models - 受注"""
 
-from sqlalchemy import Column, String, Integer, Date, Text, ForeignKey, Numeric
+from sqlalchemy import Column, Computed, String, Integer, Date, Text, ForeignKey, Index, Numeric
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
 
+# 商品タイプからケース分類を算出するSQL式（order_items.case_category の生成列）
+# 手帳型カバーは「手帳 + ハードケース」の両方に該当しうるため 'both' を設ける
+CASE_CATEGORY_SQL = (
+    "CASE"
+    " WHEN product_type LIKE '%ハードケース%'"
+    " AND (product_type LIKE '%手帳%' OR product_type LIKE '%カバー%' OR product_type LIKE '%mirror%')"
+    " THEN 'both'"
+    " WHEN product_type LIKE '%ハードケース%' THEN 'hard'"
+    " WHEN product_type LIKE '%手帳%' OR product_type LIKE '%カバー%' OR product_type LIKE '%mirror%'"
+    " THEN 'notebook'"
+    " ELSE 'other'"
+    " END"
+)
+
 
 class Order(BaseModel):
     """受注ヘッダ
@@ -13,6 +27,10 @@ class Order(BaseModel):
     """
 
     __tablename__ = "orders"
+    __table_args__ = (
+        # 取引先×期間での絞り込み（請求書集計・受注一覧）用。customer_id単独の検索も兼ねる
+        Index('ix_orders_customer_date', 'customer_id', 'order_date'),
+    )
 
     # 受注情報
     source = Column(String(50), nullable=False, comment="取込元: csv, manual, api")
@@ -20,7 +38,7 @@ class Order(BaseModel):
     order_date = Column(Date, nullable=False, index=True, comment="注文日")
 
     # リレーション
-    customer_id = Column(Integer, ForeignKey("customer_companies.id"), nullable=False, index=True, comment="取引先ID")
+    customer_id = Column(Integer, ForeignKey("customer_companies.id"), nullable=False, comment="取引先ID")
     issuer_company_id = Column(Integer, ForeignKey("issuer_companies.id"), nullable=True, comment="発行会社ID")
 
     # その他
@@ -65,6 +83,12 @@ class OrderItem(BaseModel):
     product_type = Column(String(100), nullable=True, comment="商品タイプ（ハードケース/手帳型カバーなど）")
     device_info = Column(String(100), nullable=True, comment="機種情報（iPhone 15 Pro/AQUOS wish4など）")
     size_info = Column(String(50), nullable=True, comment="サイズ情報（L/i6/特大など）")
+    case_category = Column(
+        String(20),
+        Computed(CASE_CATEGORY_SQL, persisted=True),
+        index=True,
+        comment="ケース分類（hard/notebook/both/other、product_typeから自動生成）"
+    )
 
     # Relationships
     order = relationship("Order", back_populates="items")
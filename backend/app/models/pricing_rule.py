@@ -1,6 +1,7 @@
 """Pricing Rule model - 単価ルール"""
 
-from sqlalchemy import Column, Integer, Numeric, Date, ForeignKey, String
+from sqlalchemy import Column, Integer, Numeric, Date, ForeignKey, String, Index, CheckConstraint
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -19,8 +20,19 @@ class PricingRule(BaseModel):
 
     __tablename__ = "pricing_rules"
 
+    __table_args__ = (
+        # 顧客×商品での絞り込みと優先度順ソート（一覧・単価決定）用
+        Index('ix_pricing_rules_customer_product_priority', 'customer_id', 'product_id', 'priority'),
+        # 適用対象（商品または商品タイプ）のないルールは登録不可
+        CheckConstraint(
+            "product_id IS NOT NULL OR product_type_keyword IS NOT NULL",
+            name="ck_pricing_rules_target"
+        ),
+    )
+
     # リレーション
-    customer_id = Column(Integer, ForeignKey("customer_companies.id"), nullable=False, index=True, comment="取引先ID")
+    # customer_id 単独の検索は複合インデックス ix_pricing_rules_customer_product_priority の先頭列で行う
+    customer_id = Column(Integer, ForeignKey("customer_companies.id"), nullable=False, comment="取引先ID")
     product_id = Column(Integer, ForeignKey("products.id"), nullable=True, index=True, comment="商品ID（個別商品指定の場合）")
 
     # 商品タイプキーワード（extracted_memoの値）
@@ -41,5 +53,10 @@ class PricingRule(BaseModel):
     customer = relationship("CustomerCompany", back_populates="pricing_rules")
     product = relationship("Product", back_populates="pricing_rules")
 
+    # 関連先の表示用フィールド（レスポンスの from_attributes で参照）
+    customer_name = association_proxy("customer", "name")
+    product_name = association_proxy("product", "name")
+    product_sku = association_proxy("product", "sku")
+
     def __repr__(self):
         return f"<PricingRule(id={self.id}, customer_id={self.customer_id}, product_id={self.product_id}, price={self.price})>"
@@ -1,6 +1,6 @@
 """Product Type Pattern Model - Machine Learning based product type classification"""
 
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -22,11 +22,19 @@ class ProductTypePattern(Base):
     - source: "auto"（システムが自動学習）
     """
     __tablename__ = "product_type_patterns"
+    __table_args__ = (
+        # 学習時の既存パターン検索（pattern + product_type）用。pattern単独の検索も兼ねる
+        Index('ix_product_type_patterns_lookup', 'pattern', 'product_type'),
+        # 商品タイプ別一覧（信頼度順）用
+        Index('ix_product_type_patterns_type_confidence', 'product_type', 'confidence'),
+        # 全件一覧（信頼度・使用回数順）用
+        Index('ix_product_type_patterns_ranking', 'confidence', 'usage_count'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    pattern = Column(String(255), nullable=False, index=True)
-    product_type = Column(String(100), nullable=False, index=True)
-    confidence = Column(Float, nullable=False, default=1.0, index=True)
+    pattern = Column(String(255), nullable=False)
+    product_type = Column(String(100), nullable=False)
+    confidence = Column(Float, nullable=False, default=1.0)
     source = Column(String(50), nullable=False, default='manual')  # 'manual' or 'auto'
     usage_count = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
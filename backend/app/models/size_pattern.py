@@ -5,7 +5,7 @@
 手帳型カバーのみが対象です。
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -13,14 +13,22 @@ from app.core.database import Base
 class SizePattern(Base):
     """サイズ学習パターン"""
     __tablename__ = "size_patterns"
+    __table_args__ = (
+        # 学習時の既存パターン検索（pattern + size [+ device_name]）用。pattern単独の検索も兼ねる
+        Index('ix_size_patterns_lookup', 'pattern', 'size', 'device_name'),
+        # サイズ別一覧（信頼度順）用
+        Index('ix_size_patterns_size_confidence', 'size', 'confidence'),
+        # 全件一覧（信頼度・使用回数順）用。降順は逆方向スキャンで処理される
+        Index('ix_size_patterns_ranking', 'confidence', 'usage_count'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
     # 商品名のパターン（部分一致用）
-    pattern = Column(String(255), nullable=False, index=True)
+    pattern = Column(String(255), nullable=False)
 
     # 検出されたサイズ（例: "L", "M", "i6", "特大"）
-    size = Column(String(20), nullable=False, index=True)
+    size = Column(String(20), nullable=False)
 
     # 機種名（例: "iPhone 15 Pro"）- サイズと機種の組み合わせで学習
     device_name = Column(String(100), nullable=True, index=True)
@@ -30,7 +38,7 @@ class SizePattern(Base):
 
     # 信頼度（0.0-1.0）
     # 手動学習: 0.9、自動学習: 0.7
-    confidence = Column(Float, nullable=False, default=1.0, index=True)
+    confidence = Column(Float, nullable=False, default=1.0)
 
     # 学習元（'manual' or 'auto'）
     source = Column(String(50), nullable=False, default='manual')
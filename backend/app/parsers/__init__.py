@@ -1,21 +1,35 @@
 """
 File parsers package for AccuSync.
 Supports CSV, Excel, PDF, TXT, and image files.
+
+Parser classes are imported on first access (PEP 562), so importing
+the package does not load pandas, pdfplumber, openpyxl, etc.
 """
 
-from .base import FileParser, ParseResult
-from .csv_parser import CSVParser
-from .excel_parser import ExcelParser
-from .pdf_parser import PDFParser
-from .txt_parser import TXTParser
-from .factory import FileParserFactory
-
-__all__ = [
-    "FileParser",
-    "ParseResult",
-    "CSVParser",
-    "ExcelParser",
-    "PDFParser",
-    "TXTParser",
-    "FileParserFactory",
-]
+# 公開名 → 定義モジュール
+_EXPORTS = {
+    "FileParser": "base",
+    "ParseResult": "base",
+    "CSVParser": "csv_parser",
+    "ExcelParser": "excel_parser",
+    "PDFParser": "pdf_parser",
+    "TXTParser": "txt_parser",
+    "FileParserFactory": "factory",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
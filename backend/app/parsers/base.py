@@ -2,36 +2,106 @@
 Base parser class and common utilities.
 """
 
+import hashlib
+import json
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
+import pandas as pd
+
+from .extensions import COMPRESSION_EXTENSIONS, get_file_extension  # noqa: F401
+
+# 列指向（Arrow）での解析結果保持（オプション）
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# AIの列マッピング・品質チェック結果のキャッシュ
+# （同じ形式のファイルを繰り返し取り込む場合にAPI呼び出しを省く）
+AI_RESULT_CACHE_MAXSIZE = 1024
+# 品質チェックでプロバイダーに送られる先頭行数（キャッシュキーもこの行数から作る）
+QUALITY_CHECK_SAMPLE_ROWS = 10
+_mapping_cache: Dict[Tuple, Any] = {}
+_quality_cache: Dict[Tuple, List[Any]] = {}
+
+
+def _provider_cache_key(ai_provider) -> Tuple[str, Optional[str]]:
+    """プロバイダーの種類とモデル（モデルが変われば結果も変わるためキーに含める）"""
+    return type(ai_provider).__name__, getattr(ai_provider, 'model', None)
+
+
+def clear_ai_result_cache() -> None:
+    """AIの列マッピング・品質チェック結果のキャッシュを破棄"""
+    _mapping_cache.clear()
+    _quality_cache.clear()
+
 
-@dataclass
 class ParseResult:
     """
     Result of file parsing operation.
+
+    Tabular parsers keep the rows as an Arrow table (``table``) when PyArrow
+    is available; ``data`` is then built from it on first access.
+    Not a dataclass, so repr() / == never convert the table to dicts.
     """
 
-    success: bool
-    data: List[Dict[str, Any]]
-    columns: List[str]
-    row_count: int
-    file_type: str
-    encoding: Optional[str] = None
-    errors: List[str] = None
-    warnings: List[str] = None
-    metadata: Dict[str, Any] = None
-
-    def __post_init__(self):
-        if self.errors is None:
-            self.errors = []
-        if self.warnings is None:
-            self.warnings = []
-        if self.metadata is None:
-            self.metadata = {}
+    def __init__(
+        self,
+        success: bool,
+        data: Optional[List[Dict[str, Any]]],
+        columns: List[str],
+        row_count: int,
+        file_type: str,
+        encoding: Optional[str] = None,
+        errors: Optional[List[str]] = None,
+        warnings: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        table: Optional['pa.Table'] = None
+    ):
+        self.success = success
+        self._data = data
+        self.columns = columns
+        self.row_count = row_count
+        self.file_type = file_type
+        self.encoding = encoding
+        self.errors = errors if errors is not None else []
+        self.warnings = warnings if warnings is not None else []
+        self.metadata = metadata if metadata is not None else {}
+        self.table = table
+
+    @property
+    def data(self) -> List[Dict[str, Any]]:
+        """Rows as a list of dicts (built from table on first access)"""
+        if self._data is None:
+            self._data = self.table.to_pylist() if self.table is not None else []
+        return self._data
+
+    @data.setter
+    def data(self, value: Optional[List[Dict[str, Any]]]) -> None:
+        self._data = value
+
+    def head(self, n: int) -> List[Dict[str, Any]]:
+        """
+        Get the first n rows as dicts.
+
+        Only those rows are converted when the result holds an Arrow table.
+        """
+        if self._data is None and self.table is not None:
+            return self.table.slice(0, n).to_pylist()
+        return self.data[:n]
+
+    def __repr__(self) -> str:
+        storage = 'table' if self._data is None and self.table is not None else 'list'
+        return (
+            f"ParseResult(success={self.success!r}, file_type={self.file_type!r}, "
+            f"row_count={self.row_count!r}, columns={self.columns!r}, storage={storage!r}, "
+            f"errors={self.errors!r}, warnings={self.warnings!r})"
+        )
 
 
 class FileParser(ABC):
@@ -75,45 +145,71 @@ class FileParser(ABC):
         """
         pass
 
+    def _to_result_rows(
+        self,
+        df: pd.DataFrame
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional['pa.Table']]:
+        """
+        Convert parsed DataFrame into ParseResult rows.
+
+        Returns:
+            (data, table): an Arrow table when PyArrow is available (data is then None),
+            otherwise a list of dicts
+        """
+        if PYARROW_AVAILABLE:
+            try:
+                return None, pa.Table.from_pandas(df, preserve_index=False)
+            except pa.ArrowException:
+                # 列内に型が混在している場合などは dict のリストで保持
+                pass
+        return df.to_dict('records'), None
+
     async def _apply_ai_mapping(
         self,
-        data: List[Dict[str, Any]],
-        columns: List[str],
+        df: pd.DataFrame,
         target_fields: List[str]
-    ) -> List[Dict[str, Any]]:
+    ) -> pd.DataFrame:
         """
         Apply AI-based column mapping to data.
 
         Args:
-            data: Raw data from file
-            columns: Column names from file
+            df: Raw data from file
             target_fields: Target field names for mapping
 
         Returns:
-            Data with mapped column names
+            DataFrame with only the mapped columns, renamed to target fields
         """
         if not self.ai_provider:
-            return data
+            return df
 
-        # Use AI to map columns
-        mapping_result = await self.ai_provider.auto_map_columns(
-            column_names=columns,
-            target_fields=target_fields
+        # Use AI to map columns (同じ列構成・対象フィールドの結果はキャッシュから返す)
+        cache_key = (
+            _provider_cache_key(self.ai_provider),
+            tuple(sorted(df.columns)),
+            tuple(target_fields)
         )
+        mapping_result = _mapping_cache.get(cache_key)
+        if mapping_result is None:
+            mapping_result = await self.ai_provider.auto_map_columns(
+                column_names=df.columns.tolist(),
+                target_fields=target_fields
+            )
 
-        if not mapping_result.success:
-            return data
+            if not mapping_result.success:
+                return df
 
-        # Apply mapping
-        mapped_data = []
-        for row in data:
-            mapped_row = {}
-            for target_field, source_column in mapping_result.mappings.items():
-                if source_column in row:
-                    mapped_row[target_field] = row[source_column]
-            mapped_data.append(mapped_row)
+            if len(_mapping_cache) >= AI_RESULT_CACHE_MAXSIZE:
+                _mapping_cache.clear()
+            _mapping_cache[cache_key] = mapping_result
 
-        return mapped_data
+        # Apply mapping (列単位で選択・リネームし、行ごとのdictを作り直さない)
+        pairs = [
+            (target_field, source_column)
+            for target_field, source_column in mapping_result.mappings.items()
+            if source_column in df.columns
+        ]
+        mapped = df.loc[:, [source_column for _, source_column in pairs]]
+        return mapped.set_axis([target_field for target_field, _ in pairs], axis=1)
 
     async def _check_data_quality(
         self,
@@ -133,9 +229,29 @@ class FileParser(ABC):
         if not self.ai_provider:
             return []
 
+        # プロバイダーが参照する先頭行とルールのハッシュをキーにする（全データはキーにしない）
+        digest = hashlib.sha1(
+            json.dumps(
+                [data[:QUALITY_CHECK_SAMPLE_ROWS], rules],
+                sort_keys=True,
+                ensure_ascii=False,
+                default=str
+            ).encode('utf-8')
+        ).hexdigest()
+        cache_key = (_provider_cache_key(self.ai_provider), digest)
+        cached = _quality_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         quality_result = await self.ai_provider.check_data_quality(
             data=data,
             rules=rules
         )
 
-        return quality_result.issues if quality_result.success else []
+        if not quality_result.success:
+            return []
+
+        if len(_quality_cache) >= AI_RESULT_CACHE_MAXSIZE:
+            _quality_cache.clear()
+        _quality_cache[cache_key] = quality_result.issues
+        return list(quality_result.issues)
@@ -2,16 +2,39 @@
 CSV file parser with automatic encoding detection.
 """
 
+import asyncio
+import codecs
 import csv
-import chardet
+import gzip
+import io
+import logging
+import sys
+import zipfile
 import pandas as pd
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
-from .base import FileParser, ParseResult
+from .base import QUALITY_CHECK_SAMPLE_ROWS, FileParser, ParseResult, get_file_extension
 from app.services.device_detection_service import DeviceDetectionService
 
+logger = logging.getLogger(__name__)
+
+# 文字コード判定（C拡張の cchardet があれば使用、なければ純Pythonの chardet）
+try:
+    import cchardet as chardet
+except ImportError:
+    import chardet
+
+# PyArrow（マルチスレッドのCSVパーサー、オプション）
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
 class CSVParser(FileParser):
     """
@@ -19,12 +42,22 @@ class CSVParser(FileParser):
     Supports various encodings (UTF-8, Shift-JIS, etc.)
     """
 
-    SUPPORTED_EXTENSIONS = ['.csv']
+    SUPPORTED_EXTENSIONS = ['.csv', '.csv.gz', '.csv.zip']
     COMMON_ENCODINGS = ['utf-8', 'shift-jis', 'cp932', 'euc-jp', 'iso-2022-jp']
 
+    # 文字コード判定に読み込むバイト数
+    ENCODING_SNIFF_BYTES = 64 * 1024
+    # 候補の文字コードでのデコードを試すバイト数と、Shift_JIS とみなす第1バイトの割合
+    COMMON_ENCODING_SNIFF_BYTES = 8 * 1024
+    SJIS_LEAD_RATIO = 0.3
+
+    # このサイズ以上のファイルはチャンク単位で読み込む（ピークメモリを抑える）
+    CHUNKED_READ_MIN_BYTES = 64 * 1024 * 1024
+    READ_CHUNK_ROWS = 10_000
+
     def validate(self, file_path: Path) -> bool:
         """Validate if file is CSV."""
-        return file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS
+        return get_file_extension(file_path) in self.SUPPORTED_EXTENSIONS
 
     async def parse(
         self,
@@ -57,88 +90,77 @@ class CSVParser(FileParser):
         try:
             # Detect encoding if not provided
             if encoding is None:
-                encoding = self._detect_encoding(file_path)
+                encoding = await asyncio.to_thread(self._resolve_encoding, file_path)
                 if encoding is None:
-                    # Try common encodings
-                    encoding = self._try_common_encodings(file_path)
-                    if encoding is None:
-                        return ParseResult(
-                            success=False,
-                            data=[],
-                            columns=[],
-                            row_count=0,
-                            file_type='csv',
-                            errors=['Failed to detect file encoding']
-                        )
-
-            # Read CSV with pandas
-            df = pd.read_csv(
-                file_path,
-                encoding=encoding,
-                delimiter=delimiter,
-                skiprows=skip_rows,
-                keep_default_na=False,
-                dtype=str  # Read all as strings initially
-            )
+                    return ParseResult(
+                        success=False,
+                        data=[],
+                        columns=[],
+                        row_count=0,
+                        file_type='csv',
+                        errors=['Failed to detect file encoding']
+                    )
 
-            # Clean column names (strip whitespace)
-            df.columns = df.columns.str.strip()
+            # ファイル読み込み・検出処理はイベントループを止めないようスレッドで実行
+            # 大きなファイルはチャンク単位で読み込み、チャンクごとにマッピング・検出・変換する
+            reader = await asyncio.to_thread(self._read_csv_chunks, file_path, encoding, delimiter, skip_rows)
+            detector = await asyncio.to_thread(DeviceDetectionService, db_session) if db_session else None
 
-            # Convert to list of dicts
-            columns = df.columns.tolist()
-            data = df.to_dict('records')
+            map_columns = bool(apply_ai_mapping and self.ai_provider and target_fields)
+            columns = None
+            row_count = 0
+            parts = []
+            while True:
+                df = await asyncio.to_thread(next, reader, None)
+                if df is None:
+                    break
 
-            # Apply AI mapping if requested
-            if apply_ai_mapping and self.ai_provider and target_fields:
-                try:
-                    data = await self._apply_ai_mapping(data, columns, target_fields)
-                    warnings.append('AI column mapping applied')
-                except Exception as e:
-                    warnings.append(f'AI mapping failed: {str(e)}')
+                # Clean column names (strip whitespace)
+                df.columns = df.columns.str.strip()
 
-            # Apply device detection to all rows
-            if db_session:
-                try:
-                    detector = DeviceDetectionService(db_session)
-                    for row in data:
-                        # Detect device from row
-                        device, detection_method, brand = detector.detect_device_from_row(row)
-
-                        # Extract size from row (prioritize options column)
-                        product_name = row.get('商品名', '') or row.get('product_name', '')
-                        product_type = row.get('extracted_memo', '')
-                        size, size_method = detector.extract_size_from_product_name(
-                            product_name=product_name,
-                            product_type=product_type,
-                            brand=brand,
-                            device=device,
-                            row=row  # Pass row to check options column
-                        )
-
-                        # Store detected values in row
-                        row['detected_brand'] = brand or ''
-                        row['detected_device'] = device or ''
-                        row['detected_size'] = size or '-'
-                        row['detection_method'] = detection_method or ''
-                        row['size_detection_method'] = size_method or ''
-
-                    warnings.append(f'Device detection applied to {len(data)} rows')
-                except Exception as e:
-                    warnings.append(f'Device detection failed: {str(e)}')
+                if columns is None:
+                    columns = df.columns.tolist()
 
-            # Check data quality with AI
-            if self.ai_provider:
-                try:
-                    quality_issues = await self._check_data_quality(data)
-                    warnings.extend(quality_issues)
-                except Exception as e:
-                    warnings.append(f'Quality check failed: {str(e)}')
+                # Apply AI mapping if requested (2チャンク目以降はキャッシュ済みのマッピングを使用)
+                if map_columns:
+                    try:
+                        mapped = await self._apply_ai_mapping(df, target_fields)
+                    except Exception as e:
+                        warnings.append(f'AI mapping failed: {str(e)}')
+                        map_columns = False
+                    else:
+                        if not parts:
+                            warnings.append('AI column mapping applied')
+                        # マッピングが得られなかった場合は以降のチャンクで問い合わせない
+                        if mapped is df:
+                            map_columns = False
+                        df = mapped
 
-            return ParseResult(
+                # Apply device detection to all rows (検出結果は列として追加)
+                if detector is not None:
+                    try:
+                        detected = await asyncio.to_thread(self._detect_devices, df, detector)
+                        df = df.assign(**detected)
+                    except Exception as e:
+                        warnings.append(f'Device detection failed: {str(e)}')
+                        detector = None
+
+                # Arrow table (or list of dicts without PyArrow)
+                parts.append(self._to_result_rows(df))
+                row_count += len(df)
+
+            columns = columns or []
+            if detector is not None:
+                warnings.append(f'Device detection applied to {row_count} rows')
+
+            data, table = self._combine_result_rows(parts)
+
+            result = ParseResult(
                 success=True,
                 data=data,
+                table=table,
                 columns=columns,
-                row_count=len(data),
+                row_count=row_count,
                 file_type='csv',
                 encoding=encoding,
                 errors=errors,
@@ -150,6 +172,16 @@ class CSVParser(FileParser):
                 }
             )
 
+            # Check data quality with AI
+            if self.ai_provider:
+                try:
+                    quality_issues = await self._check_data_quality(result.head(QUALITY_CHECK_SAMPLE_ROWS))
+                    warnings.extend(quality_issues)
+                except Exception as e:
+                    warnings.append(f'Quality check failed: {str(e)}')
+
+            return result
+
         except Exception as e:
             errors.append(f'CSV parsing error: {str(e)}')
             return ParseResult(
@@ -162,9 +194,154 @@ class CSVParser(FileParser):
                 errors=errors
             )
 
-    def _detect_encoding(self, file_path: Path) -> Optional[str]:
+    def _detect_devices(self, df: pd.DataFrame, detector: DeviceDetectionService) -> Dict[str, List[str]]:
+        """Detect brand / device / size for each row and return them as columns"""
+        # 商品名（空なら product_name）・商品タイプは行ごとの dict 参照ではなく列単位で取り出す
+        blank = pd.Series('', index=df.index)
+        product_names = df['商品名'] if '商品名' in df.columns else blank
+        if 'product_name' in df.columns:
+            product_names = product_names.where(product_names != '', df['product_name'])
+        product_types = df['extracted_memo'] if 'extracted_memo' in df.columns else blank
+
+        detected = {
+            'detected_brand': [],
+            'detected_device': [],
+            'detected_size': [],
+            'detection_method': [],
+            'size_detection_method': []
+        }
+
+        rows = df.to_dict('records')
+        for row, product_name, product_type in zip(rows, product_names.to_numpy(), product_types.to_numpy()):
+            # Detect device from row
+            device, detection_method, brand = detector.detect_device_from_row(row)
+
+            # Extract size from row (prioritize options column)
+            size, size_method = detector.extract_size_from_product_name(
+                product_name=product_name,
+                product_type=product_type,
+                brand=brand,
+                device=device,
+                row=row  # Pass row to check options column
+            )
+
+            # 検出値は種類が少ないため intern して行間で同じ文字列オブジェクトを共有する
+            detected['detected_brand'].append(sys.intern(brand or ''))
+            detected['detected_device'].append(sys.intern(device or ''))
+            detected['detected_size'].append(sys.intern(size or '-'))
+            detected['detection_method'].append(sys.intern(detection_method or ''))
+            detected['size_detection_method'].append(sys.intern(size_method or ''))
+
+        return detected
+
+    def _combine_result_rows(
+        self,
+        parts: List[Tuple[Optional[List[Dict[str, Any]]], Optional['pa.Table']]]
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional['pa.Table']]:
+        """Join per-chunk (data, table) pairs from _to_result_rows into one"""
+        if len(parts) == 1:
+            return parts[0]
+        if parts and all(table is not None for _, table in parts):
+            return None, pa.concat_tables([table for _, table in parts], promote_options='default')
+
+        data = []
+        for chunk_data, table in parts:
+            data.extend(chunk_data if table is None else table.to_pylist())
+        return data, None
+
+    def _read_csv_chunks(
+        self,
+        file_path: Path,
+        encoding: str,
+        delimiter: str,
+        skip_rows: int
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read CSV as DataFrames of strings.
+
+        Files of CHUNKED_READ_MIN_BYTES or more (uncompressed) are read READ_CHUNK_ROWS
+        rows at a time with the pandas C engine (the PyArrow engine does not support
+        chunksize); smaller files are read at once with _read_csv.
+        """
+        size = _uncompressed_size(file_path)
+        if size is not None and size < self.CHUNKED_READ_MIN_BYTES:
+            return iter([self._read_csv(file_path, encoding, delimiter, skip_rows)])
+
+        return pd.read_csv(
+            file_path,
+            chunksize=self.READ_CHUNK_ROWS,
+            **self._read_csv_options(encoding, delimiter, skip_rows)
+        )
+
+    @staticmethod
+    def _read_csv_options(encoding: str, delimiter: str, skip_rows: int) -> Dict[str, Any]:
+        """Common pd.read_csv options (every cell as a string)"""
+        return dict(
+            encoding=encoding,
+            delimiter=delimiter,
+            skiprows=skip_rows,
+            keep_default_na=False,
+            compression='infer',  # .csv.gz / .csv.zip は拡張子から判定して展開
+            dtype=str  # Read all as strings initially
+        )
+
+    def _read_csv(self, file_path: Path, encoding: str, delimiter: str, skip_rows: int) -> pd.DataFrame:
+        """
+        Read CSV into a DataFrame of strings.
+
+        Uses pyarrow.csv when available and falls back to
+        the pandas C engine if PyArrow cannot parse the file.
+        """
+        if PYARROW_AVAILABLE:
+            try:
+                return self._read_csv_arrow(file_path, encoding, delimiter, skip_rows)
+            except (pa.ArrowException, ValueError) as e:
+                logger.warning("PyArrow CSV parsing failed, falling back to pandas: %s", e)
+
+        return pd.read_csv(file_path, **self._read_csv_options(encoding, delimiter, skip_rows))
+
+    @staticmethod
+    def _read_csv_arrow(file_path: Path, encoding: str, delimiter: str, skip_rows: int) -> pd.DataFrame:
+        """
+        Read CSV with pyarrow.csv, typing every column as string.
+
+        pd.read_csv(engine='pyarrow', dtype=str) lets Arrow infer types first and only
+        then casts to str ('0012' -> '12', '1.50' -> '1.5'), so the column types are
+        given to Arrow directly instead.
+        """
+        columns = _read_header(file_path, encoding, delimiter, skip_rows)
+        with _open_binary(file_path) as f:
+            table = pa_csv.read_csv(
+                f,
+                read_options=pa_csv.ReadOptions(
+                    encoding=encoding,
+                    skip_rows=skip_rows + 1,  # ヘッダー行は _read_header で読み込み済み
+                    column_names=columns
+                ),
+                parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types={name: pa.string() for name in columns},
+                    # keep_default_na=False と同様、空文字や 'NA' を欠損値にしない
+                    strings_can_be_null=False,
+                    quoted_strings_can_be_null=False
+                )
+            )
+        return table.to_pandas()
+
+    def _resolve_encoding(self, file_path: Path) -> Optional[str]:
+        """
+        Detect encoding (chardet, then common encodings).
+
+        The result is cached per (path, mtime, size), so re-parsing
+        an unchanged file skips detection.
+        """
+        stat = file_path.stat()
+        return _detect_encoding_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+    @classmethod
+    def _detect_encoding(cls, file_path: Path) -> Optional[str]:
         """
-        Detect file encoding using chardet.
+        Detect file encoding using cchardet (or chardet).
 
         Args:
             file_path: Path to file
@@ -173,16 +350,21 @@ class CSVParser(FileParser):
             Detected encoding or None
         """
         try:
-            with open(file_path, 'rb') as f:
-                raw_data = f.read(10000)  # Read first 10KB
+            with _open_binary(file_path) as f:
+                raw_data = f.read(cls.ENCODING_SNIFF_BYTES)
                 result = chardet.detect(raw_data)
-                if result['confidence'] > 0.7:
-                    return result['encoding']
+                if (result['confidence'] or 0) > 0.7:
+                    encoding = result['encoding']
+                    # Shift_JIS と判定されても機種依存文字（①、髙など）を含むことがあるため上位互換のCP932で読む
+                    if encoding.lower().replace('-', '_') == 'shift_jis':
+                        return 'cp932'
+                    return encoding
         except Exception:
             pass
         return None
 
-    def _try_common_encodings(self, file_path: Path) -> Optional[str]:
+    @classmethod
+    def _try_common_encodings(cls, file_path: Path) -> Optional[str]:
         """
         Try common encodings to read file.
 
@@ -192,11 +374,98 @@ class CSVParser(FileParser):
         Returns:
             Working encoding or None
         """
-        for encoding in self.COMMON_ENCODINGS:
+        # 先頭を1回だけ読み込み、各候補はメモリ上でデコードを試す
+        with _open_binary(file_path) as f:
+            buf = f.read(cls.COMMON_ENCODING_SNIFF_BYTES)
+
+        # BOM があれば確定
+        if buf.startswith(b'\xef\xbb\xbf'):
+            return 'utf-8-sig'
+        if buf.startswith((b'\xff\xfe', b'\xfe\xff')):
+            return 'utf-16'
+
+        encodings = cls.COMMON_ENCODINGS
+        # 非ASCIIバイトの多くが Shift_JIS の第1バイト（0x81-0x9F）なら、UTF-8 の次に CP932 を試す
+        # （EUC-JP・UTF-8 の日本語ではこの範囲が第1バイトになることはほぼない）
+        non_ascii = len(buf) - len(buf.translate(None, _NON_ASCII_BYTES))
+        if non_ascii:
+            sjis_lead = len(buf) - len(buf.translate(None, _SJIS_LEAD_BYTES))
+            if sjis_lead / non_ascii > cls.SJIS_LEAD_RATIO:
+                encodings = ['utf-8', 'cp932'] + [e for e in encodings if e not in ('utf-8', 'cp932')]
+
+        for encoding in encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    f.read(1000)  # Try to read 1000 chars
+                # 読み込み範囲の末尾で途切れたマルチバイト文字はエラーにしない
+                codecs.getincrementaldecoder(encoding)().decode(buf, final=False)
                 return encoding
             except (UnicodeDecodeError, UnicodeError):
                 continue
         return None
+
+
+# バイト列から削除して個数を数えるための補集合（bytes.translate の delete 引数）
+_NON_ASCII_BYTES = bytes(range(0x80, 0x100))
+_SJIS_LEAD_BYTES = bytes(range(0x81, 0xA0))
+
+
+def _uncompressed_size(file_path: Path) -> Optional[int]:
+    """
+    Size of the CSV data after decompression (None if unknown).
+
+    .gz は末尾の ISIZE が 4GiB で折り返すため正確なサイズが分からず None を返す。
+    """
+    suffix = file_path.suffix.lower()
+    if suffix == '.gz':
+        return None
+    if suffix == '.zip':
+        # _open_binary / pandas と同じくアーカイブ内の先頭ファイル
+        with zipfile.ZipFile(file_path) as archive:
+            return archive.infolist()[0].file_size
+    return file_path.stat().st_size
+
+
+def _read_header(file_path: Path, encoding: str, delimiter: str, skip_rows: int) -> List[str]:
+    """
+    Read the header row as column names the way pandas names them.
+
+    (BOM removed, blank -> 'Unnamed: n', duplicates -> 'name.1')
+    """
+    with _open_binary(file_path) as f:
+        reader = csv.reader(io.TextIOWrapper(f, encoding=encoding, newline=''), delimiter=delimiter)
+        for _ in range(skip_rows):
+            next(reader, None)
+        header = next(reader, None)
+    if not header:
+        raise ValueError('No columns to parse from file')
+
+    header[0] = header[0].lstrip('\ufeff')
+    columns = []
+    seen: Dict[str, int] = {}
+    for i, name in enumerate(header):
+        name = name or f'Unnamed: {i}'
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def _open_binary(file_path: Path):
+    """Open a CSV file for binary reading (.gz / .zip are decompressed)"""
+    suffix = file_path.suffix.lower()
+    if suffix == '.gz':
+        return gzip.open(file_path, 'rb')
+    if suffix == '.zip':
+        # pandas と同様、アーカイブ内の先頭ファイルを読む（メンバーを閉じるまでアーカイブは開いたまま）
+        with zipfile.ZipFile(file_path) as archive:
+            return archive.open(archive.namelist()[0])
+    return open(file_path, 'rb')
+
+
+@lru_cache(maxsize=256)
+def _detect_encoding_cached(path: str, mtime_ns: int, size: int) -> Optional[str]:
+    """Detect encoding of an unchanged file once (mtime_ns / size are part of the cache key)"""
+    file_path = Path(path)
+    return CSVParser._detect_encoding(file_path) or CSVParser._try_common_encodings(file_path)
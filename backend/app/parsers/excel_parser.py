@@ -2,11 +2,21 @@
 Excel file parser supporting both .xlsx and .xls formats.
 """
 
+import asyncio
+
 import pandas as pd
+from openpyxl import load_workbook
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+from .base import QUALITY_CHECK_SAMPLE_ROWS, FileParser, ParseResult
 
-from .base import FileParser, ParseResult
+# python-calamine（Rust実装のExcelリーダー、オプション。xls/xlsx/xlsm すべてに対応）
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
 
 
 class ExcelParser(FileParser):
@@ -17,6 +27,9 @@ class ExcelParser(FileParser):
 
     SUPPORTED_EXTENSIONS = ['.xlsx', '.xls', '.xlsm']
 
+    # openpyxl の読み取り専用モードで行単位に読み込む形式
+    STREAMING_EXTENSIONS = ['.xlsx', '.xlsm']
+
     def validate(self, file_path: Path) -> bool:
         """Validate if file is Excel format."""
         return file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS
@@ -49,63 +62,43 @@ class ExcelParser(FileParser):
         warnings = []
 
         try:
-            # Determine engine based on file extension
-            engine = 'openpyxl' if file_path.suffix.lower() == '.xlsx' else 'xlrd'
-
-            # Read Excel file
-            if sheet_name is None:
-                # Read first sheet
-                df = pd.read_excel(
-                    file_path,
-                    engine=engine,
-                    skiprows=skip_rows,
-                    header=header_row,
-                    keep_default_na=False,
-                    dtype=str
+            # 読み込みはイベントループを止めないようスレッドで実行
+            if CALAMINE_AVAILABLE:
+                engine = 'calamine'
+                df, sheet_name = await asyncio.to_thread(
+                    self._read_rows_pandas, file_path, engine, sheet_name, skip_rows, header_row
+                )
+            elif file_path.suffix.lower() in self.STREAMING_EXTENSIONS:
+                # .xlsx/.xlsm: ブック全体を展開せず1行ずつ読み込む
+                engine = 'openpyxl'
+                df, sheet_name = await asyncio.to_thread(
+                    self._read_rows_streaming, file_path, sheet_name, skip_rows, header_row
                 )
-                sheet_name = 'Sheet1'  # Default name
             else:
-                df = pd.read_excel(
-                    file_path,
-                    engine=engine,
-                    sheet_name=sheet_name,
-                    skiprows=skip_rows,
-                    header=header_row,
-                    keep_default_na=False,
-                    dtype=str
+                engine = 'xlrd'
+                df, sheet_name = await asyncio.to_thread(
+                    self._read_rows_pandas, file_path, engine, sheet_name, skip_rows, header_row
                 )
 
-            # Clean column names
-            df.columns = df.columns.astype(str).str.strip()
-
-            # Remove completely empty rows
-            df = df.dropna(how='all')
-
-            # Convert to list of dicts
             columns = df.columns.tolist()
-            data = df.to_dict('records')
 
             # Apply AI mapping if requested
             if apply_ai_mapping and self.ai_provider and target_fields:
                 try:
-                    data = await self._apply_ai_mapping(data, columns, target_fields)
+                    df = await self._apply_ai_mapping(df, target_fields)
                     warnings.append('AI column mapping applied')
                 except Exception as e:
                     warnings.append(f'AI mapping failed: {str(e)}')
 
-            # Check data quality with AI
-            if self.ai_provider:
-                try:
-                    quality_issues = await self._check_data_quality(data)
-                    warnings.extend(quality_issues)
-                except Exception as e:
-                    warnings.append(f'Quality check failed: {str(e)}')
+            # Arrow table (or list of dicts without PyArrow)
+            data, table = self._to_result_rows(df)
 
-            return ParseResult(
+            result = ParseResult(
                 success=True,
                 data=data,
+                table=table,
                 columns=columns,
-                row_count=len(data),
+                row_count=len(df),
                 file_type='excel',
                 errors=errors,
                 warnings=warnings,
@@ -118,6 +111,16 @@ class ExcelParser(FileParser):
                 }
             )
 
+            # Check data quality with AI
+            if self.ai_provider:
+                try:
+                    quality_issues = await self._check_data_quality(result.head(QUALITY_CHECK_SAMPLE_ROWS))
+                    warnings.extend(quality_issues)
+                except Exception as e:
+                    warnings.append(f'Quality check failed: {str(e)}')
+
+            return result
+
         except Exception as e:
             errors.append(f'Excel parsing error: {str(e)}')
             return ParseResult(
@@ -129,6 +132,109 @@ class ExcelParser(FileParser):
                 errors=errors
             )
 
+    def _read_rows_pandas(
+        self,
+        file_path: Path,
+        engine: str,
+        sheet_name: Optional[str],
+        skip_rows: int,
+        header_row: int
+    ) -> Tuple[pd.DataFrame, str]:
+        """
+        Read a sheet with pd.read_excel (calamine / xlrd).
+
+        Returns:
+            (DataFrame of strings, sheet name)
+        """
+        with pd.ExcelFile(file_path, engine=engine) as xl_file:
+            if sheet_name is None:
+                # Read first sheet
+                sheet_name = xl_file.sheet_names[0]
+            df = xl_file.parse(
+                sheet_name,
+                skiprows=skip_rows,
+                header=header_row,
+                keep_default_na=False,
+                dtype=str
+            )
+
+        # Clean column names
+        df.columns = df.columns.astype(str).str.strip()
+
+        # Remove completely empty rows (dtype=str のため空セルは NaN ではなく '')
+        df = df[(df != '').any(axis=1)]
+
+        return df, sheet_name
+
+    def _read_rows_streaming(
+        self,
+        file_path: Path,
+        sheet_name: Optional[str],
+        skip_rows: int,
+        header_row: int
+    ) -> Tuple[pd.DataFrame, str]:
+        """
+        Read a sheet row by row with openpyxl in read-only mode.
+
+        Cell values are converted to strings the same way as
+        pd.read_excel(dtype=str, keep_default_na=False).
+
+        Returns:
+            (DataFrame of strings, sheet name)
+        """
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+            rows = ws.iter_rows(min_row=skip_rows + header_row + 1, values_only=True)
+
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame(), ws.title
+
+            columns = self._make_columns(header)
+            width = len(columns)
+
+            data = []
+            for values in rows:
+                cells = [self._cell_to_str(v) for v in values[:width]]
+                # Remove completely empty rows
+                if not any(cells):
+                    continue
+                cells.extend([''] * (width - len(cells)))
+                data.append(cells)
+
+            return pd.DataFrame(data, columns=columns, dtype=object), ws.title
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _cell_to_str(value: Any) -> str:
+        """Convert a cell value to str (empty cell -> '', 2.0 -> '2')"""
+        if value is None:
+            return ''
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    @classmethod
+    def _make_columns(cls, header: tuple) -> List[str]:
+        """Build column names like pandas (blank -> 'Unnamed: n', duplicates -> 'name.1')"""
+        header = list(header)
+        while header and header[-1] is None:
+            header.pop()
+
+        columns = []
+        seen: Dict[str, int] = {}
+        for i, value in enumerate(header):
+            name = cls._cell_to_str(value).strip() or f'Unnamed: {i}'
+            if name in seen:
+                seen[name] += 1
+                name = f'{name}.{seen[name]}'
+            else:
+                seen[name] = 0
+            columns.append(name)
+        return columns
+
     async def get_sheet_names(self, file_path: Path) -> List[str]:
         """
         Get all sheet names in Excel file.
@@ -140,8 +246,17 @@ class ExcelParser(FileParser):
             List of sheet names
         """
         try:
-            engine = 'openpyxl' if file_path.suffix.lower() == '.xlsx' else 'xlrd'
-            xl_file = pd.ExcelFile(file_path, engine=engine)
-            return xl_file.sheet_names
+            if CALAMINE_AVAILABLE:
+                engine = 'calamine'
+            elif file_path.suffix.lower() in self.STREAMING_EXTENSIONS:
+                engine = 'openpyxl'
+            else:
+                engine = 'xlrd'
+            return await asyncio.to_thread(self._read_sheet_names, file_path, engine)
         except Exception:
             return []
+
+    @staticmethod
+    def _read_sheet_names(file_path: Path, engine: str) -> List[str]:
+        with pd.ExcelFile(file_path, engine=engine) as xl_file:
+            return xl_file.sheet_names
@@ -0,0 +1,24 @@
+"""
+File extension helpers for parser dispatch.
+
+Kept free of heavy imports so the factory can resolve file types
+without loading any parser.
+"""
+
+from pathlib import Path
+
+
+# 元の拡張子の後ろに付く圧縮形式の拡張子（例: .csv.gz）
+COMPRESSION_EXTENSIONS = ('.gz', '.zip')
+
+
+def get_file_extension(file_path: Path) -> str:
+    """
+    Get the lower-case file extension.
+
+    Compressed files keep the inner extension (data.csv.gz -> '.csv.gz').
+    """
+    suffixes = file_path.suffixes
+    if len(suffixes) >= 2 and suffixes[-1].lower() in COMPRESSION_EXTENSIONS:
+        return ''.join(suffixes[-2:]).lower()
+    return file_path.suffix.lower()
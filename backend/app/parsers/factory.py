@@ -2,14 +2,47 @@
 File parser factory for creating appropriate parser based on file type.
 """
 
+from importlib import import_module
 from pathlib import Path
-from typing import Optional
-
-from .base import FileParser
-from .csv_parser import CSVParser
-from .excel_parser import ExcelParser
-from .pdf_parser import PDFParser
-from .txt_parser import TXTParser
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Type
+
+from .extensions import get_file_extension
+
+if TYPE_CHECKING:
+    from .base import FileParser
+
+# 拡張子 → (モジュール名, パーサークラス名)
+# 各パーサーの依存（pdfplumber, openpyxl, 機種検出サービスなど）は使用時に初めて読み込む
+_PARSER_MAP: Dict[str, Tuple[str, str]] = {
+    '.csv': ('csv_parser', 'CSVParser'),
+    '.csv.gz': ('csv_parser', 'CSVParser'),
+    '.csv.zip': ('csv_parser', 'CSVParser'),
+    '.xlsx': ('excel_parser', 'ExcelParser'),
+    '.xls': ('excel_parser', 'ExcelParser'),
+    '.xlsm': ('excel_parser', 'ExcelParser'),
+    '.pdf': ('pdf_parser', 'PDFParser'),
+    '.txt': ('txt_parser', 'TXTParser'),
+    '.text': ('txt_parser', 'TXTParser'),
+}
+
+
+def load_parser_class(module_name: str, class_name: str) -> Type['FileParser']:
+    """app.parsers 配下のモジュールからパーサークラスを読み込む"""
+    return getattr(import_module(f'.{module_name}', __package__), class_name)
+
+
+# 拡張子 → ファイル種別名
+_FILE_TYPE_MAP: Dict[str, str] = {
+    '.csv': 'csv',
+    '.csv.gz': 'csv',
+    '.csv.zip': 'csv',
+    '.xlsx': 'excel',
+    '.xls': 'excel',
+    '.xlsm': 'excel',
+    '.pdf': 'pdf',
+    '.txt': 'txt',
+    '.text': 'txt',
+}
 
 
 class FileParserFactory:
@@ -17,22 +50,12 @@ class FileParserFactory:
     Factory for creating appropriate file parser based on file extension.
     """
 
-    _PARSER_MAP = {
-        '.csv': CSVParser,
-        '.xlsx': ExcelParser,
-        '.xls': ExcelParser,
-        '.xlsm': ExcelParser,
-        '.pdf': PDFParser,
-        '.txt': TXTParser,
-        '.text': TXTParser,
-    }
-
     @classmethod
     def create_parser(
         cls,
         file_path: Path,
         ai_provider=None
-    ) -> Optional[FileParser]:
+    ) -> Optional['FileParser']:
         """
         Create appropriate parser for file.
 
@@ -43,13 +66,25 @@ class FileParserFactory:
         Returns:
             FileParser instance or None if format not supported
         """
-        extension = file_path.suffix.lower()
-        parser_class = cls._PARSER_MAP.get(extension)
+        parser_path = _PARSER_MAP.get(get_file_extension(file_path))
 
-        if parser_class is None:
+        if parser_path is None:
             return None
 
-        return parser_class(ai_provider=ai_provider)
+        return load_parser_class(*parser_path)(ai_provider=ai_provider)
+
+    @staticmethod
+    def get_extension(file_path: Path) -> str:
+        """
+        Get file extension used for parser dispatch.
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            Lower-case extension ('.csv.gz' for compressed CSV)
+        """
+        return get_file_extension(file_path)
 
     @classmethod
     def get_supported_extensions(cls) -> list:
@@ -59,7 +94,7 @@ class FileParserFactory:
         Returns:
             List of supported extensions
         """
-        return list(cls._PARSER_MAP.keys())
+        return list(_PARSER_MAP.keys())
 
     @classmethod
     def is_supported(cls, file_path: Path) -> bool:
@@ -72,8 +107,7 @@ class FileParserFactory:
         Returns:
             True if format is supported
         """
-        extension = file_path.suffix.lower()
-        return extension in cls._PARSER_MAP
+        return get_file_extension(file_path) in _PARSER_MAP
 
     @classmethod
     def detect_file_type(cls, file_path: Path) -> str:
@@ -86,15 +120,4 @@ class FileParserFactory:
         Returns:
             File type name (csv, excel, pdf, txt) or 'unknown'
         """
-        extension = file_path.suffix.lower()
-
-        if extension == '.csv':
-            return 'csv'
-        elif extension in ['.xlsx', '.xls', '.xlsm']:
-            return 'excel'
-        elif extension == '.pdf':
-            return 'pdf'
-        elif extension in ['.txt', '.text']:
-            return 'txt'
-        else:
-            return 'unknown'
+        return _FILE_TYPE_MAP.get(get_file_extension(file_path), 'unknown')
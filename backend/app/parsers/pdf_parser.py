@@ -2,12 +2,217 @@
 PDF file parser with text extraction.
 """
 
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import pdfplumber
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
+from app.core.config import settings
 from .base import FileParser, ParseResult
 
+logger = logging.getLogger(__name__)
+
+# PyMuPDF（MuPDFのCバインディング、オプション）- pdfplumber より大幅に高速
+# AGPL-3.0 ライセンスのため requirements.txt には含めず、PDF_BACKEND=pymupdf の場合のみ使用する
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# このページ数以上のPDFは複数プロセスでページを分担して抽出する
+PARALLEL_MIN_PAGES = 40
+# 1プロセスあたりの最小ページ数（子プロセスはアプリのモジュールを読み込み直すため、起動コストに見合う分量にする）
+PAGES_PER_WORKER = 20
+MAX_PDF_WORKERS = os.cpu_count() or 1
+
+# ページ抽出用のプロセスプール（プロセス内の全リクエストで共有し、子プロセス数を MAX_PDF_WORKERS に制限）
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Get the shared page-extraction pool (created on first use)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # スレッドから起動するため fork ではなく spawn を使う
+            _pool = ProcessPoolExecutor(
+                max_workers=MAX_PDF_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a pool that is broken or could not start (the next large PDF creates a new one)"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    # 他のリクエストが投入済みのページ抽出は取り消さない
+    pool.shutdown(wait=False)
+
+
+def _resolve_backend() -> str:
+    """PDF_BACKEND 設定から抽出ライブラリを決定（PyMuPDFがなければ pdfplumber）"""
+    if settings.PDF_BACKEND == 'pymupdf' and PYMUPDF_AVAILABLE:
+        return 'pymupdf'
+    return 'pdfplumber'
+
+
+def _open_pdf(file_path: Path, backend: str):
+    """Open a PDF document (usable as a context manager)"""
+    if backend == 'pymupdf':
+        return pymupdf.open(file_path)
+    return pdfplumber.open(file_path)
+
+
+def _get_pages(pdf, backend: str):
+    """Sequence of pages (supports len(), indexing and iteration)"""
+    return pdf if backend == 'pymupdf' else pdf.pages
+
+
+def _extract_page(page, page_num: int, extract_tables: bool, extract_text: bool, backend: str) -> Dict[str, Any]:
+    """
+    Extract table rows (and raw text) from one PDF page.
+
+    Returns:
+        {'page': page number, 'rows': table rows, 'columns': table headers, 'text': page text or None}
+    """
+    rows = []
+    columns = []
+
+    # Extract tables if requested
+    if extract_tables:
+        if backend == 'pymupdf':
+            tables = [table.extract() for table in page.find_tables().tables]
+        else:
+            tables = page.extract_tables()
+        for table_num, table in enumerate(tables):
+            if table and len(table) > 1:
+                # Use first row as headers
+                headers = [str(h).strip() if h else f'Column_{i}'
+                          for i, h in enumerate(table[0])]
+
+                # Convert table to list of dicts
+                for row in table[1:]:
+                    if row:
+                        row_data = {}
+                        for i, value in enumerate(row):
+                            if i < len(headers):
+                                row_data[headers[i]] = str(value).strip() if value else ''
+                        if any(row_data.values()):  # Skip empty rows
+                            row_data['_page'] = page_num
+                            row_data['_table'] = table_num
+                            rows.append(row_data)
+
+                # Update columns
+                for header in headers:
+                    if header not in columns:
+                        columns.append(header)
+
+    return {
+        'page': page_num,
+        'rows': rows,
+        'columns': columns,
+        'text': _extract_text(page, backend) if extract_text else None
+    }
+
+
+def _extract_text(page, backend: str) -> str:
+    """Extract the plain text of one PDF page"""
+    if backend == 'pymupdf':
+        return page.get_text('text')
+    return page.extract_text()
+
+
+def _extract_page_range(
+    file_path: Path,
+    start: int,
+    end: int,
+    extract_tables: bool,
+    extract_text: bool,
+    backend: str
+) -> List[Dict[str, Any]]:
+    """Extract pages [start, end) (0-based); each worker process opens its own PDF"""
+    with _open_pdf(file_path, backend) as pdf:
+        pdf_pages = _get_pages(pdf, backend)
+        return [
+            _extract_page(pdf_pages[index], index + 1, extract_tables, extract_text, backend)
+            for index in range(start, end)
+        ]
+
+
+def _extract_pages(
+    file_path: Path,
+    extract_tables: bool,
+    extract_text: bool,
+    backend: str
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Extract all pages of a PDF (blocking; run in a worker thread).
+
+    Large PDFs are split into page ranges extracted in the shared process
+    pool (no state is shared between pages). Concurrent parses queue on the
+    same pool. Results are returned in page order.
+    """
+    with _open_pdf(file_path, backend) as pdf:
+        pdf_pages = _get_pages(pdf, backend)
+        page_count = len(pdf_pages)
+        workers = min(MAX_PDF_WORKERS, page_count // PAGES_PER_WORKER)
+        if page_count < PARALLEL_MIN_PAGES or workers < 2:
+            pages = [
+                _extract_page(page, page_num, extract_tables, extract_text, backend)
+                for page_num, page in enumerate(pdf_pages, 1)
+            ]
+            return page_count, pages
+
+    chunk_size = math.ceil(page_count / workers)
+    ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+
+    pool = None
+    futures = []
+    try:
+        pool = _get_pool()
+        for start, end in ranges:
+            futures.append(
+                pool.submit(_extract_page_range, file_path, start, end, extract_tables, extract_text, backend)
+            )
+    except (AssertionError, OSError, RuntimeError) as e:
+        # プールを起動できない場合は1プロセスで抽出
+        # （Celeryのワーカー（daemonプロセス）などでは子プロセスを作れない。
+        #   他のリクエストで壊れたプールへの投入時の BrokenProcessPool も RuntimeError のサブクラス）
+        logger.warning("Parallel PDF extraction unavailable, extracting sequentially: %s", e)
+        for future in futures:
+            future.cancel()
+        if pool is not None:
+            _discard_pool(pool)
+        return page_count, _extract_page_range(file_path, 0, page_count, extract_tables, extract_text, backend)
+
+    try:
+        pages = [page for future in futures for page in future.result()]
+    except BrokenProcessPool as e:
+        # 子プロセスが異常終了した場合のみプールを作り直す
+        logger.warning("PDF extraction pool broke, extracting sequentially: %s", e)
+        _discard_pool(pool)
+        pages = _extract_page_range(file_path, 0, page_count, extract_tables, extract_text, backend)
+    except BaseException:
+        # ページの抽出エラーはこのリクエストにだけ返す（共有プールと他のリクエストの抽出はそのまま）
+        for future in futures:
+            future.cancel()
+        raise
+
+    return page_count, pages
+
 
 class PDFParser(FileParser):
     """
@@ -47,61 +252,45 @@ class PDFParser(FileParser):
         columns = []
 
         try:
-            with pdfplumber.open(file_path) as pdf:
-                # Extract from all pages
-                for page_num, page in enumerate(pdf.pages, 1):
-                    # Extract tables if requested
-                    if extract_tables:
-                        tables = page.extract_tables()
-                        for table_num, table in enumerate(tables):
-                            if table and len(table) > 1:
-                                # Use first row as headers
-                                headers = [str(h).strip() if h else f'Column_{i}'
-                                          for i, h in enumerate(table[0])]
-
-                                # Convert table to list of dicts
-                                for row in table[1:]:
-                                    if row:
-                                        row_data = {}
-                                        for i, value in enumerate(row):
-                                            if i < len(headers):
-                                                row_data[headers[i]] = str(value).strip() if value else ''
-                                        if any(row_data.values()):  # Skip empty rows
-                                            row_data['_page'] = page_num
-                                            row_data['_table'] = table_num
-                                            all_data.append(row_data)
-
-                                # Update columns
-                                for header in headers:
-                                    if header not in columns:
-                                        columns.append(header)
-
-                    # Extract text if requested and use AI for extraction
-                    if extract_text and self.ai_provider:
-                        text = page.extract_text()
-                        if text:
-                            try:
-                                # Use AI to extract structured data from text
-                                extraction_result = await self.ai_provider.extract_data(
-                                    content=text,
-                                    file_type='pdf',
-                                    extract_fields=target_fields or []
-                                )
-
-                                if extraction_result.success and extraction_result.data:
-                                    for item in extraction_result.data:
-                                        item['_page'] = page_num
-                                        item['_source'] = 'text_extraction'
-                                        all_data.append(item)
-
-                                    # Update columns
-                                    for item in extraction_result.data:
-                                        for key in item.keys():
-                                            if key not in columns:
-                                                columns.append(key)
-
-                            except Exception as e:
-                                warnings.append(f'AI extraction failed on page {page_num}: {str(e)}')
+            # 表・テキストの抽出はイベントループを止めないようスレッドで実行
+            # （AIによる抽出はページ順にこのコルーチンで行う）
+            backend = _resolve_backend()
+            page_count, pages = await asyncio.to_thread(
+                _extract_pages, file_path, extract_tables, extract_text and self.ai_provider is not None, backend
+            )
+
+            for page in pages:
+                page_num = page['page']
+                all_data.extend(page['rows'])
+                for header in page['columns']:
+                    if header not in columns:
+                        columns.append(header)
+
+                # Extract text if requested and use AI for extraction
+                text = page['text']
+                if text:
+                    try:
+                        # Use AI to extract structured data from text
+                        extraction_result = await self.ai_provider.extract_data(
+                            content=text,
+                            file_type='pdf',
+                            extract_fields=target_fields or []
+                        )
+
+                        if extraction_result.success and extraction_result.data:
+                            for item in extraction_result.data:
+                                item['_page'] = page_num
+                                item['_source'] = 'text_extraction'
+                                all_data.append(item)
+
+                            # Update columns
+                            for item in extraction_result.data:
+                                for key in item.keys():
+                                    if key not in columns:
+                                        columns.append(key)
+
+                    except Exception as e:
+                        warnings.append(f'AI extraction failed on page {page_num}: {str(e)}')
 
             # Add metadata columns if not present
             if '_page' not in columns:
@@ -128,7 +317,8 @@ class PDFParser(FileParser):
                 errors=errors,
                 warnings=warnings,
                 metadata={
-                    'pages': len(pdf.pages),
+                    'pages': page_count,
+                    'backend': backend,
                     'extract_tables': extract_tables,
                     'extract_text': extract_text
                 }
@@ -3,12 +3,17 @@ Text file parser with AI-based data extraction.
 Handles unstructured text like notes, emails, or plain text orders.
 """
 
-import chardet
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 from .base import FileParser, ParseResult
 
+# cchardet（C拡張）があれば使用
+try:
+    import cchardet as chardet
+except ImportError:
+    import chardet
+
 
 class TXTParser(FileParser):
     """
@@ -149,7 +154,7 @@ class TXTParser(FileParser):
             with open(file_path, 'rb') as f:
                 raw_data = f.read()
                 result = chardet.detect(raw_data)
-                if result['confidence'] > 0.7:
+                if (result['confidence'] or 0) > 0.7:
                     return result['encoding']
         except Exception:
             pass
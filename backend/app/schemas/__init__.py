@@ -2,6 +2,7 @@
 Pydantic schemas for request/response validation.
 """
 
+from .common import DecimalStr
 from .import_job import (
     ImportJobStatus,
     FileUploadRequest,
@@ -15,6 +16,7 @@ from .import_job import (
 )
 
 __all__ = [
+    "DecimalStr",
     "ImportJobStatus",
     "FileUploadRequest",
     "FileUploadResponse",
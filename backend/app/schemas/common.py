@@ -0,0 +1,10 @@
+"""Shared schema types."""
+
+from decimal import Decimal
+from typing import Annotated
+
+from pydantic import PlainSerializer
+
+# 金額などのDecimalをJSONでは文字列として出力（精度を保ったまま一括シリアライズ）
+# （pydantic 2.5 は組み込み型 str のシグネチャを取得できないため関数で包む）
+DecimalStr = Annotated[Decimal, PlainSerializer(lambda v: str(v), return_type=str, when_used="json")]
@@ -3,7 +3,7 @@
 from typing import Optional
 from datetime import date
 from decimal import Decimal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class PricingRuleBase(BaseModel):
@@ -48,5 +48,4 @@ class PricingRuleResponse(PricingRuleBase):
     product_sku: Optional[str] = Field(None, description="商品SKU（product_id指定時）")
     product_type_keyword: Optional[str] = Field(None, description="商品タイプキーワード（商品タイプ指定時）")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
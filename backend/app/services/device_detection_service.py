@@ -105,6 +105,72 @@ class DeviceDetectionService:
         (r'F-\d+[A-Z]*', 'arrows'),
     ]
 
+    # コンパイル済みの機種検出パターン（優先度順）
+    COMPILED_DEVICE_PATTERNS = [(re.compile(pattern, re.IGNORECASE), brand) for pattern, brand in DEVICE_PATTERNS]
+
+    # 全機種パターンの和（1回の走査で「どれかに一致するか」を判定する前段フィルタ）
+    DEVICE_PREFILTER_PATTERN = re.compile(
+        '|'.join(f'(?:{pattern})' for pattern, _ in DEVICE_PATTERNS), re.IGNORECASE
+    )
+
+    # 商品名の "_" の後ろのサイズパターン
+    SIZE_PATTERN = re.compile(r'_([0-9]?[LiM]+\d*|特{1,3}大|大|中|小|SS|LL|2L|3L)')
+
+    # 選択肢列の機種・サイズ（楽天形式: 機種【ブランド】[:=]機種名[サイズ]、▼や-で始まるものは未選択）
+    OPTIONS_RAKUTEN_PATTERN = re.compile(r'機種【([^】]+)】[:=]([^▼\-\[\n\r&]+)\[([^\]]+)\]', re.MULTILINE)
+    # 選択肢列の機種・サイズ（ワーマ形式: 機種の選択(ブランド)=機種名[サイズ]）
+    OPTIONS_WOWMA_PATTERN = re.compile(r'機種.*?\(([^)]+)\)=([^\[&\n\r]+)\[([^\]]+)\]', re.MULTILINE)
+
+    # 括弧書き（型番・番号）の除去用
+    PARENTHESES_PATTERN = re.compile(r'\([^)]+\)')
+    LAZY_PARENTHESES_PATTERN = re.compile(r'\(.*?\)')
+
+    # 「いPhone」「スマQ いphone」の「い」の補正用
+    LEADING_HIRAGANA_I_PATTERN = re.compile(r'^い([Pp]hone)')
+    INNER_HIRAGANA_I_PATTERN = re.compile(r'\s+い([Pp]hone)')
+    WHITESPACE_PATTERN = re.compile(r'\s+')
+
+    # 機種名のひらがな・カタカナ→英語変換表
+    PRE_NORMALIZE_REPLACEMENTS = {
+        # ひらがな（商品名の誤表記対応）
+        'いふぉん': 'iPhone',
+        'あくおす': 'AQUOS',
+        'えくすぺりあ': 'Xperia',
+        'ぎゃらくしー': 'Galaxy',
+        'ぴくせる': 'Pixel',
+        # カタカナ
+        'アイフォン': 'iPhone',
+        'ギャラクシー': 'Galaxy',
+        'エクスペリア': 'Xperia',
+        'アクオス': 'AQUOS',
+        'ピクセル': 'Pixel',
+        'オッポ': 'OPPO',
+        'アローズ': 'arrows',
+    }
+    DEVICE_NAME_REPLACEMENTS = {
+        **PRE_NORMALIZE_REPLACEMENTS,
+        'プロ': ' Pro',
+        'プラス': ' Plus',
+        'ミニ': ' mini',
+        'マックス': ' Max',
+        'ウルトラ': ' Ultra',
+    }
+
+    # デザイン番号パターン（優先度順）
+    DESIGN_NUMBER_PATTERNS = [
+        # betty系（betty-001-lec-bu）
+        re.compile(r'betty-\d+-[a-z]+-[a-z]+'),
+
+        # color_design系（color_design_002-1）
+        re.compile(r'color_design_\d+-\d+'),
+
+        # 一般的な英数字パターン（rose-123, design-456）
+        re.compile(r'[a-zA-Z]+-\d+(?:-[a-zA-Z]+)?'),
+
+        # 日本語 + 番号（花-001）
+        re.compile(r'[ぁ-んァ-ヶー一-龠]+-\d+'),
+    ]
+
     # 機種関連の列名キーワード
     DEVICE_COLUMN_KEYWORDS = [
         '機種', '機種名', '対応機種', '端末', '端末名', 'デバイス',
@@ -114,6 +180,11 @@ class DeviceDetectionService:
 
     def __init__(self, db: Session):
         self.db = db
+        # 同一ファイル内で繰り返し現れる値の検出結果（インスタンス単位でキャッシュ）
+        self._device_pattern_cache: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._options_cache: Dict[str, Tuple[Optional[str], Optional[str], Optional[str]]] = {}
+        self._sku_size_cache: Dict[str, Optional[str]] = {}
+        self._device_size_cache: Dict[Tuple[str, str], Tuple[Optional[str], str]] = {}
         # DeviceMasterServiceを使用（ローカルDB優先、Supabaseはオプション）
         self.device_master = DeviceMasterService(db) if DEVICE_MASTER_AVAILABLE else None
         # DesignMasterServiceを使用（ローカルデザインマスターDB）
@@ -151,12 +222,19 @@ class DeviceDetectionService:
         if not options_text:
             return None, None, None
 
-        # パターン1: 楽天形式 - 機種【ブランド】[:=]機種名[サイズ]
-        # ▼や-で始まるものは選択されていないので除外
-        pattern1 = r'機種【([^】]+)】[:=]([^▼\-\[\n\r&]+)\[([^\]]+)\]'
-        matches = re.findall(pattern1, options_text, re.MULTILINE)
+        # 機種検出とサイズ抽出で同じ選択肢を2回解析するため、結果をキャッシュ
+        cached = self._options_cache.get(options_text)
+        if cached is None:
+            cached = self._parse_options(options_text)
+            self._options_cache[options_text] = cached
+        return cached
 
-        for brand_label, device_name, size in matches:
+    def _parse_options(self, options_text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """選択肢テキストを解析（extract_device_from_options の本体）"""
+        # パターン1: 楽天形式 - 機種【ブランド】[:=]機種名[サイズ]
+        match = self.OPTIONS_RAKUTEN_PATTERN.search(options_text)
+        if match:
+            brand_label, device_name, size = match.groups()
             # デバイス名をクリーンアップ
             device_name = device_name.strip()
             size = size.strip()
@@ -165,7 +243,7 @@ class DeviceDetectionService:
             brand = self._normalize_brand_label(brand_label)
 
             # 型番やカッコを削除（例: wish4(SH-52E) → AQUOS wish4）
-            device_clean = re.sub(r'\([^)]+\)', '', device_name).strip()
+            device_clean = self.PARENTHESES_PATTERN.sub('', device_name).strip()
 
             # ブランド名を追加（AQUOSやPixelなどブランド名が含まれていない場合）
             if brand and not device_clean.startswith(brand):
@@ -177,10 +255,9 @@ class DeviceDetectionService:
             return device_full, size, brand
 
         # パターン2: ワーマ形式 - 機種の選択(ブランド)=機種名[サイズ]
-        pattern2 = r'機種.*?\(([^)]+)\)=([^\[&\n\r]+)\[([^\]]+)\]'
-        matches2 = re.findall(pattern2, options_text, re.MULTILINE)
-
-        for brand_label, device_name, size in matches2:
+        match = self.OPTIONS_WOWMA_PATTERN.search(options_text)
+        if match:
+            brand_label, device_name, size = match.groups()
             # デバイス名をクリーンアップ
             device_name = device_name.strip()
             size = size.strip()
@@ -315,48 +392,74 @@ class DeviceDetectionService:
                 if value and any(keyword in col_name.lower() for keyword in ['sku', '商品番号', '商品コード', '管理番号']):
                     sku_or_product_number = str(value).strip()
                     if sku_or_product_number:
-                        # SKU番号で検索
-                        size_from_sku = self.rakuten_sku.get_size_by_sku(sku_or_product_number)
+                        size_from_sku = self._get_size_by_sku_cached(sku_or_product_number)
                         if size_from_sku:
-                            logger.info(f"📏 Size detected from 楽天SKU管理システム (SKU): {size_from_sku}")
                             return size_from_sku, "rakuten_sku_db"
 
-                        # 商品番号で検索
-                        size_from_pn = self.rakuten_sku.get_size_by_product_number(sku_or_product_number)
-                        if size_from_pn:
-                            logger.info(f"📏 Size detected from 楽天SKU管理システム (商品番号): {size_from_pn}")
-                            return size_from_pn, "rakuten_sku_db"
-
         if not product_name:
             return None, "not_found"
 
         # ステップ2: "_" の後ろのサイズパターンを抽出（正規表現）
-        size_pattern = r'_([0-9]?[LiM]+\d*|特{1,3}大|大|中|小|SS|LL|2L|3L)'
-        match = re.search(size_pattern, product_name)
+        match = self.SIZE_PATTERN.search(product_name)
         if match:
             size = match.group(1)
             # 括弧の前まで（番号を除外）
-            size = re.sub(r'\(.*?\)', '', size).strip()
+            size = self.LAZY_PARENTHESES_PATTERN.sub('', size).strip()
             logger.info(f"🔍 Size detected by regex: {size}")
             return size, "regex"
 
+        # ステップ3・4: 機種名からDBでサイズを検索（同じ機種は1回だけ問い合わせる）
+        if brand and device:
+            size, method = self._get_size_by_device_cached(brand, device)
+            if size:
+                return size, method
+
+        logger.debug(f"No size found for: {product_name}")
+        return None, "not_found"
+
+    def _get_size_by_sku_cached(self, sku_or_product_number: str) -> Optional[str]:
+        """楽天SKU管理システムDBからSKU・商品番号でサイズを取得（結果をキャッシュ）"""
+        if sku_or_product_number in self._sku_size_cache:
+            return self._sku_size_cache[sku_or_product_number]
+
+        # SKU番号で検索
+        size = self.rakuten_sku.get_size_by_sku(sku_or_product_number)
+        if size:
+            logger.info(f"📏 Size detected from 楽天SKU管理システム (SKU): {size}")
+        else:
+            # 商品番号で検索
+            size = self.rakuten_sku.get_size_by_product_number(sku_or_product_number)
+            if size:
+                logger.info(f"📏 Size detected from 楽天SKU管理システム (商品番号): {size}")
+
+        self._sku_size_cache[sku_or_product_number] = size
+        return size
+
+    def _get_size_by_device_cached(self, brand: str, device: str) -> Tuple[Optional[str], str]:
+        """機種名からサイズを取得（楽天SKU管理システム → Device Master DB、結果をキャッシュ）"""
+        key = (brand, device)
+        if key in self._device_size_cache:
+            return self._device_size_cache[key]
+
+        result = (None, "not_found")
+
         # ステップ3: 楽天SKU管理システムDBから機種名でサイズを検索
-        if brand and device and self.rakuten_sku:
+        if self.rakuten_sku:
             size_from_device = self.rakuten_sku.get_size_by_device(brand=brand, device_name=device)
             if size_from_device:
                 logger.info(f"📏 Size detected from 楽天SKU管理システム (機種名): {size_from_device}")
-                return size_from_device, "rakuten_sku_device"
+                result = (size_from_device, "rakuten_sku_device")
 
-        # ステップ4: Device Master DBからサイズを検索（brandとdeviceが指定されている場合）
+        # ステップ4: Device Master DBからサイズを検索
         # ローカルDB優先、Supabaseはオプション
-        if brand and device and self.device_master:
+        if result[0] is None and self.device_master:
             db_size = self.device_master.get_device_size(brand, device)
             if db_size:
                 logger.info(f"📊 Size detected from Device Master DB: {db_size}")
-                return db_size, "device_master_db"
+                result = (db_size, "device_master_db")
 
-        logger.debug(f"No size found for: {product_name}")
-        return None, "not_found"
+        self._device_size_cache[key] = result
+        return result
 
     def _detect_from_device_column(self, row: Dict) -> Tuple[Optional[str], str, Optional[str]]:
         """機種専用列から検出"""
@@ -413,20 +516,31 @@ class DeviceDetectionService:
         if not text or not isinstance(text, str):
             return None, None
 
+        cached = self._device_pattern_cache.get(text)
+        if cached is not None:
+            return cached
+
+        result = (None, None)
+
         # ステップ1: テキストの前処理（ひらがな→英語変換）
         # これにより「いphone14Pro」→「iPhone14Pro」のように変換される
         normalized_text = self._pre_normalize_text(text)
 
         # ステップ2: すべてのパターンを試す
-        for pattern, brand in self.DEVICE_PATTERNS:
-            match = re.search(pattern, normalized_text, re.IGNORECASE)
-            if match:
-                device = match.group(0)
-                # 最終正規化（ブランド名付加など）
-                device = self._normalize_device_name(device, brand)
-                return device, brand
-
-        return None, None
+        # どのパターンにも一致しないテキスト（価格・日付など大半の列）は前段フィルタの1回で除外し、
+        # 一致する場合のみ優先度順に検索する（先に一致したパターンを優先するため和の結果は使わない）
+        if self.DEVICE_PREFILTER_PATTERN.search(normalized_text):
+            for pattern, brand in self.COMPILED_DEVICE_PATTERNS:
+                match = pattern.search(normalized_text)
+                if match:
+                    device = match.group(0)
+                    # 最終正規化（ブランド名付加など）
+                    device = self._normalize_device_name(device, brand)
+                    result = (device, brand)
+                    break
+
+        self._device_pattern_cache[text] = result
+        return result
 
     def _pre_normalize_text(self, text: str) -> str:
         """
@@ -444,69 +558,30 @@ class DeviceDetectionService:
             return text
 
         # ひらがな・カタカナ→英語変換
-        replacements = {
-            # ひらがな（商品名の誤表記対応）
-            'いふぉん': 'iPhone',
-            'あくおす': 'AQUOS',
-            'えくすぺりあ': 'Xperia',
-            'ぎゃらくしー': 'Galaxy',
-            'ぴくせる': 'Pixel',
-            # カタカナ
-            'アイフォン': 'iPhone',
-            'ギャラクシー': 'Galaxy',
-            'エクスペリア': 'Xperia',
-            'アクオス': 'AQUOS',
-            'ピクセル': 'Pixel',
-            'オッポ': 'OPPO',
-            'アローズ': 'arrows',
-        }
-
-        for jp, en in replacements.items():
+        for jp, en in self.PRE_NORMALIZE_REPLACEMENTS.items():
             text = text.replace(jp, en)
 
         # 先頭の「い」を「i」に変換（いPhone → iPhone）
-        text = re.sub(r'^い([Pp]hone)', r'i\1', text)
+        text = self.LEADING_HIRAGANA_I_PATTERN.sub(r'i\1', text)
         # 「スマQ いphone」のような途中の「い」も変換
-        text = re.sub(r'\s+い([Pp]hone)', r' i\1', text)
+        text = self.INNER_HIRAGANA_I_PATTERN.sub(r' i\1', text)
 
         return text
 
     def _normalize_device_name(self, device: str, brand: str = None) -> str:
         """機種名を正規化してブランド名を付加"""
         # スペース統一
-        device = re.sub(r'\s+', ' ', device.strip())
+        device = self.WHITESPACE_PATTERN.sub(' ', device.strip())
 
         # ひらがな・カタカナ→英語変換（念のため再度実行）
-        replacements = {
-            # ひらがな（商品名の誤表記対応）
-            'いふぉん': 'iPhone',
-            'あくおす': 'AQUOS',
-            'えくすぺりあ': 'Xperia',
-            'ぎゃらくしー': 'Galaxy',
-            'ぴくせる': 'Pixel',
-            # カタカナ
-            'アイフォン': 'iPhone',
-            'ギャラクシー': 'Galaxy',
-            'エクスペリア': 'Xperia',
-            'アクオス': 'AQUOS',
-            'ピクセル': 'Pixel',
-            'オッポ': 'OPPO',
-            'アローズ': 'arrows',
-            'プロ': ' Pro',
-            'プラス': ' Plus',
-            'ミニ': ' mini',
-            'マックス': ' Max',
-            'ウルトラ': ' Ultra',
-        }
-
-        for jp, en in replacements.items():
+        for jp, en in self.DEVICE_NAME_REPLACEMENTS.items():
             device = device.replace(jp, en)
 
         # 先頭の「い」を削除（いPhone → iPhone）
-        device = re.sub(r'^い([Pp]hone)', r'i\1', device)
+        device = self.LEADING_HIRAGANA_I_PATTERN.sub(r'i\1', device)
 
         # 連続スペースを削除
-        device = re.sub(r'\s+', ' ', device.strip())
+        device = self.WHITESPACE_PATTERN.sub(' ', device.strip())
 
         # ブランド名を追加（既にブランド名が含まれていない場合）
         if brand and brand not in ['iPhone', 'Pixel']:  # iPhone, Pixel は既にブランド名が含まれている
@@ -547,7 +622,7 @@ class DeviceDetectionService:
             if len(parts) >= 2:
                 structure = parts[1].strip()
                 # 括弧やデザイン名を除去
-                structure = re.sub(r'\(.*?\)', '', structure).strip()
+                structure = self.LAZY_PARENTHESES_PATTERN.sub('', structure).strip()
                 if structure and len(structure) < 30:  # 長すぎる場合は除外
                     return structure
 
@@ -572,23 +647,8 @@ class DeviceDetectionService:
         if not product_name:
             return None
 
-        # デザイン番号パターン（優先度順）
-        design_patterns = [
-            # betty系（betty-001-lec-bu）
-            r'betty-\d+-[a-z]+-[a-z]+',
-
-            # color_design系（color_design_002-1）
-            r'color_design_\d+-\d+',
-
-            # 一般的な英数字パターン（rose-123, design-456）
-            r'[a-zA-Z]+-\d+(?:-[a-zA-Z]+)?',
-
-            # 日本語 + 番号（花-001）
-            r'[ぁ-んァ-ヶー一-龠]+-\d+',
-        ]
-
-        for pattern in design_patterns:
-            match = re.search(pattern, product_name)
+        for pattern in self.DESIGN_NUMBER_PATTERNS:
+            match = pattern.search(product_name)
             if match:
                 design_no = match.group(0)
                 logger.debug(f"🎨 Extracted design number: {design_no} from {product_name}")
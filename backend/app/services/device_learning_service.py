@@ -10,6 +10,7 @@ import re
 from typing import Optional, Tuple, List, Dict
 from sqlalchemy.orm import Session
 from app.models.device_pattern import DevicePattern
+from app.services.pattern_matcher import PatternUsageBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +18,10 @@ logger = logging.getLogger(__name__)
 class DeviceLearningService:
     """機種学習サービス"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, defer_usage_updates: bool = False):
         self.db = db
+        # Trueの場合、予測ヒット時の更新を溜めて flush_usage_updates() でまとめて書き込む
+        self._usage_buffer = PatternUsageBuffer(DevicePattern, confidence_step=0.05) if defer_usage_updates else None
 
     def learn_from_product_name(
         self,
@@ -109,26 +112,36 @@ class DeviceLearningService:
         # 商品名にパターンが含まれているかチェック（部分一致）
         for pattern_obj in patterns:
             if pattern_obj.pattern.lower() in product_name.lower():
-                # 使用回数をインクリメント
-                pattern_obj.usage_count += 1
-
-                # 信頼度を微増（最大1.0）
-                if pattern_obj.confidence < 1.0:
-                    pattern_obj.confidence = min(pattern_obj.confidence + 0.05, 1.0)
-
-                self.db.commit()
+                # 使用回数をインクリメントし信頼度を微増
+                confidence = self._record_usage(pattern_obj)
 
                 method = f"ml_{pattern_obj.source}"
                 logger.info(
                     f"🎯 機種予測成功: {product_name[:30]}... → {pattern_obj.device_name} "
-                    f"(パターン: {pattern_obj.pattern}, 信頼度: {pattern_obj.confidence:.2f}, 方法: {method})"
+                    f"(パターン: {pattern_obj.pattern}, 信頼度: {confidence:.2f}, 方法: {method})"
                 )
 
-                return pattern_obj.device_name, pattern_obj.brand, pattern_obj.confidence, method
+                return pattern_obj.device_name, pattern_obj.brand, confidence, method
 
         logger.debug(f"機種予測失敗: {product_name[:50]}...")
         return None
 
+    def _record_usage(self, pattern_obj) -> float:
+        """使用回数をインクリメントし信頼度を微増（最大1.0）、反映後の信頼度を返す"""
+        if self._usage_buffer is not None:
+            return self._usage_buffer.record(pattern_obj)
+
+        pattern_obj.usage_count += 1
+        if pattern_obj.confidence < 1.0:
+            pattern_obj.confidence = min(pattern_obj.confidence + 0.05, 1.0)
+        self.db.commit()
+        return pattern_obj.confidence
+
+    def flush_usage_updates(self) -> None:
+        """defer_usage_updates=True で溜めた使用回数・信頼度の更新を書き込む"""
+        if self._usage_buffer is not None:
+            self._usage_buffer.flush(self.db)
+
     def get_all_patterns(self) -> List[DevicePattern]:
         """すべての学習パターンを取得"""
         return self.db.query(DevicePattern).order_by(
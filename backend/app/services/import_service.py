@@ -19,6 +19,24 @@ from app.services.issuer_service import IssuerService
 from app.services.device_detection_service import DeviceDetectionService
 
 
+# 商品名から抽出する製品タイプ（優先順位順：長いものから先にチェック）
+# 重要: 「手帳型」は「スタンド」「ストラップ」よりも優先
+_PRODUCT_TYPES = (
+    '手帳型カバー', '手帳型ケース', '手帳型',  # 手帳型は最優先
+    'ハードケース',
+    'iPadケース', 'iPhoneケース', 'スマホケース', 'タブレットケース',
+    'ソフトケース', 'バンパーケース', 'クリアケース', 'レザーケース',
+    'PCケース', '保護フィルム', 'ガラスフィルム',
+    # 注意: 「スタンド」「ストラップ」は付属品なので優先度を下げる
+    # 'バンパー', 'リング', 'スタンド', 'ストラップ',
+    'バンパー', 'リング',
+    'グリップ', 'ホルダー', 'アダプター', 'ケーブル', '充電器'
+)
+
+# カード収納機能を示すキーワード（あれば手帳型ケースとみなす）
+_CARD_FEATURE_RE = re.compile('カードポケット|カードバック|カード収納|カードケース|カードホルダー')
+
+
 class ImportService:
     """
     Service for importing parsed data into database.
@@ -314,8 +332,8 @@ class ImportService:
                     order_date=datetime.now().date(),
                     memo=final_memo
                 )
+                # IDはコミット時の一括INSERTで採番（行ごとのflushによる往復を避ける）
                 db.add(order)
-                db.flush()
 
                 # Get customer-specific price
                 # 優先順位: 1. 価格ルール（顧客別） > 2. 商品マスタの単価 > 3. CSVの単価
@@ -337,7 +355,7 @@ class ImportService:
                 total = subtotal + tax_amount
 
                 order_item = OrderItem(
-                    order_id=order.id,
+                    order=order,
                     product_id=product.id,
                     qty=quantity,
                     unit_price=final_unit_price,
@@ -515,8 +533,7 @@ class ImportService:
         keywords = []
 
         # 特別ルール: カードポケット/カードバック/カード収納がある場合は手帳型ケース
-        card_keywords = ['カードポケット', 'カードバック', 'カード収納', 'カードケース', 'カードホルダー']
-        has_card_feature = any(keyword in product_name for keyword in card_keywords)
+        has_card_feature = _CARD_FEATURE_RE.search(product_name) is not None
 
         # ハードケースは例外（カード機能付きハードケースもある）
         is_hard_case = 'ハードケース' in product_name
@@ -525,28 +542,17 @@ class ImportService:
         if has_card_feature and not is_hard_case:
             keywords.append('手帳型ケース')
         else:
-            # 製品タイプを抽出（優先順位順：長いものから先にチェック）
-            # 重要: 「手帳型」は「スタンド」「ストラップ」よりも優先
-            product_types = [
-                '手帳型カバー', '手帳型ケース', '手帳型',  # 手帳型は最優先
-                'ハードケース',
-                'iPadケース', 'iPhoneケース', 'スマホケース', 'タブレットケース',
-                'ソフトケース', 'バンパーケース', 'クリアケース', 'レザーケース',
-                'PCケース', '保護フィルム', 'ガラスフィルム',
-                # 注意: 「スタンド」「ストラップ」は付属品なので優先度を下げる
-                # 'バンパー', 'リング', 'スタンド', 'ストラップ',
-                'バンパー', 'リング',
-                'グリップ', 'ホルダー', 'アダプター', 'ケーブル', '充電器'
-            ]
-            for ptype in product_types:
+            # 製品タイプを抽出（優先順位順、最初に見つかったタイプのみ）
+            for ptype in _PRODUCT_TYPES:
                 if ptype in product_name:
                     keywords.append(ptype)
                     break  # 最初に見つかったタイプのみ
 
         # mirrorやcardなどのバリエーションを抽出
-        if 'mirror' in product_name.lower():
+        lowered = product_name.lower()
+        if 'mirror' in lowered:
             keywords.append('mirror')
-        if 'card' in product_name.lower():
+        if 'card' in lowered:
             keywords.append('card')
 
         # デザイン名は除外して、商品タイプとバリエーションのみ返す
@@ -5,7 +5,7 @@ Invoice Service - 請求書生成・管理サービス
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func
 
 from app.models.invoice import Invoice, InvoiceItem
@@ -74,8 +74,10 @@ class InvoiceService:
             from app.services.issuer_service import IssuerService
             issuer = IssuerService.get_or_create_default_issuer(db)
 
-        # 期間内の注文を取得
-        orders = db.query(Order).filter(
+        # 期間内の注文を取得（明細と商品は一括ロードし、注文・明細ごとの追加クエリを防ぐ）
+        orders = db.query(Order).options(
+            selectinload(Order.items).selectinload(OrderItem.product)
+        ).filter(
             Order.customer_id == customer_id,
             Order.order_date >= period_start,
             Order.order_date <= period_end
@@ -0,0 +1,142 @@
+"""
+Pattern Matcher - 学習パターンの一括部分一致照合
+
+SizePattern / ProductTypePattern の pattern 列（部分一致用）を商品名に対してまとめて照合します。
+pyahocorasick があれば Aho-Corasick オートマトンで商品名を1回走査するだけで済み、
+なければ全パターンを順に照合します。
+
+予測ヒット時の使用回数・信頼度の更新をまとめて書き込む PatternUsageBuffer も提供します。
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, case, func
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Aho-Corasick（C拡張、オプション）
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# テーブル名 → ((件数, 最大ID), 照合器)
+_matchers: Dict[str, Tuple[Tuple[int, Optional[int]], "PatternMatcher"]] = {}
+
+
+class PatternMatcher:
+    """
+    パターン文字列（大文字小文字を区別しない部分一致）の照合器
+
+    Args:
+        patterns: (パターンID, パターン文字列) の一覧
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[int, str]]):
+        self._ids_by_pattern: Dict[str, List[int]] = {}
+        # 空文字列のパターンはどの商品名にも一致する
+        self._always_ids: List[int] = []
+
+        for pattern_id, pattern in patterns:
+            pattern = pattern.lower()
+            if pattern:
+                self._ids_by_pattern.setdefault(pattern, []).append(pattern_id)
+            else:
+                self._always_ids.append(pattern_id)
+
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self._ids_by_pattern:
+            self._automaton = ahocorasick.Automaton()
+            for pattern, ids in self._ids_by_pattern.items():
+                self._automaton.add_word(pattern, ids)
+            self._automaton.make_automaton()
+
+    def match_ids(self, text: str) -> Set[int]:
+        """text に含まれるパターンのIDを返す"""
+        text = text.lower()
+        matched = set(self._always_ids)
+
+        if self._automaton is not None:
+            for _, ids in self._automaton.iter(text):
+                matched.update(ids)
+        else:
+            for pattern, ids in self._ids_by_pattern.items():
+                if pattern in text:
+                    matched.update(ids)
+
+        return matched
+
+
+def get_pattern_matcher(db: Session, model) -> PatternMatcher:
+    """
+    model（pattern 列を持つ学習パターンモデル）の照合器を取得
+
+    パターン文字列は作成後に変更されないため、件数と最大IDが変わった
+    （パターンが追加・削除された）場合のみ再構築します。
+    信頼度・使用回数の更新では再構築しません。
+    """
+    version = tuple(db.query(func.count(model.id), func.max(model.id)).one())
+
+    cached = _matchers.get(model.__tablename__)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    matcher = PatternMatcher(db.query(model.id, model.pattern).all())
+    _matchers[model.__tablename__] = (version, matcher)
+    logger.debug("Built pattern matcher for %s (%s patterns)", model.__tablename__, version[0])
+    return matcher
+
+
+class PatternUsageBuffer:
+    """
+    予測ヒット時の使用回数・信頼度の更新を溜めて、1回の executemany で書き込むバッファ
+
+    インポートのプレビューなど多数の行を予測する処理で、ヒットごとの
+    UPDATE + COMMIT を避けるために使います。
+
+    Args:
+        model: 学習パターンモデル（usage_count / confidence 列を持つ）
+        confidence_step: 1ヒットあたりの信頼度の増分（最大1.0、0なら信頼度は更新しない）
+    """
+
+    def __init__(self, model, confidence_step: float = 0.0):
+        self.model = model
+        self.confidence_step = confidence_step
+        self._hits: Dict[int, int] = {}
+
+    def record(self, pattern_obj) -> float:
+        """ヒットを記録し、反映後の信頼度を返す"""
+        hits = self._hits.get(pattern_obj.id, 0) + 1
+        self._hits[pattern_obj.id] = hits
+
+        confidence = pattern_obj.confidence
+        if self.confidence_step and confidence < 1.0:
+            confidence = min(confidence + self.confidence_step * hits, 1.0)
+        return confidence
+
+    def flush(self, db: Session) -> None:
+        """溜めた更新を書き込んでコミット"""
+        if not self._hits:
+            return
+
+        table = self.model.__table__
+        values = {'usage_count': table.c.usage_count + bindparam('hits')}
+        if self.confidence_step:
+            raised = table.c.confidence + bindparam('step')
+            values['confidence'] = case(
+                (table.c.confidence >= 1.0, table.c.confidence),
+                (raised < 1.0, raised),
+                else_=1.0
+            )
+        stmt = table.update().where(table.c.id == bindparam('pattern_id')).values(**values)
+
+        params = [
+            {'pattern_id': pattern_id, 'hits': hits, 'step': self.confidence_step * hits}
+            for pattern_id, hits in self._hits.items()
+        ]
+        db.execute(stmt, params)
+        db.commit()
+        self._hits.clear()
@@ -4,8 +4,10 @@ from datetime import date
 from typing import Optional
 from decimal import Decimal
 
+from sqlalchemy import Select, select
 from sqlalchemy.orm import Session
 
+from app.models.customer_company import CustomerCompany
 from app.models.pricing_rule import PricingRule
 from app.models.product import Product
 
@@ -80,6 +82,59 @@ class PricingService:
         # 商品が見つからない場合は0を返す（エラーケース）
         return Decimal(0)
 
+    @staticmethod
+    def rule_columns() -> tuple:
+        """価格ルールのレスポンス用カラム（SELECT・RETURNING共通）"""
+        return (
+            PricingRule.id,
+            PricingRule.customer_id,
+            PricingRule.product_id,
+            PricingRule.product_type_keyword,
+            PricingRule.price,
+            PricingRule.min_qty,
+            PricingRule.start_date,
+            PricingRule.end_date,
+            PricingRule.priority,
+        )
+
+    @staticmethod
+    def rule_rows_select() -> Select:
+        """価格ルール一覧用のCore SELECTを生成
+
+        顧客名・商品名・SKUをJOINで1クエリにまとめ、ORMインスタンスを
+        生成せずにタプル（Row）として取得します。列名はレスポンスの
+        フィールド名と一致するため、そのまま model_validate に渡せます。
+
+        Returns:
+            フィルター・ソート未適用のSELECT文
+        """
+        return (
+            select(
+                *PricingService.rule_columns(),
+                CustomerCompany.name.label("customer_name"),
+                Product.name.label("product_name"),
+                Product.sku.label("product_sku"),
+            )
+            .join(CustomerCompany, CustomerCompany.id == PricingRule.customer_id)
+            .outerjoin(Product, Product.id == PricingRule.product_id)
+        )
+
+    @staticmethod
+    def reference_names_select(customer_id: int, product_id: Optional[int]) -> Select:
+        """価格ルールが参照する顧客・商品の存在確認用SELECTを生成
+
+        スカラーサブクエリで1行にまとめ、存在確認を1往復で行います。
+        取得した名称はそのままレスポンスに使えます。存在しない側の列はNULLになります。
+
+        Returns:
+            (customer_name, product_name, product_sku) を返すSELECT文
+        """
+        return select(
+            select(CustomerCompany.name).where(CustomerCompany.id == customer_id).scalar_subquery().label("customer_name"),
+            select(Product.name).where(Product.id == product_id).scalar_subquery().label("product_name"),
+            select(Product.sku).where(Product.id == product_id).scalar_subquery().label("product_sku"),
+        )
+
     @staticmethod
     def calculate_line_total(
         unit_price: Decimal,
@@ -2,14 +2,26 @@
 
 import logging
 import re
+import time
 from typing import Optional, List, Tuple, Dict
 from sqlalchemy.orm import Session
 from sqlalchemy import text, desc
 
 from app.models.product_type_pattern import ProductTypePattern
+from app.services.pattern_matcher import PatternUsageBuffer, get_pattern_matcher
 
 logger = logging.getLogger(__name__)
 
+# 予測結果キャッシュ（商品名 → (有効期限, 予測結果)）
+PREDICTION_CACHE_TTL = 300
+PREDICTION_CACHE_MAXSIZE = 10000
+_prediction_cache: Dict[str, Tuple[float, Optional[Tuple[str, float, str]]]] = {}
+
+
+def clear_prediction_cache() -> None:
+    """予測結果キャッシュを破棄（パターンの学習・削除時に呼び出す）"""
+    _prediction_cache.clear()
+
 
 class ProductTypeLearningService:
     """
@@ -29,8 +41,10 @@ class ProductTypeLearningService:
     3. 使用回数をインクリメント
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, defer_usage_updates: bool = False):
         self.db = db
+        # Trueの場合、予測ヒット時の更新を溜めて flush_usage_updates() でまとめて書き込む
+        self._usage_buffer = PatternUsageBuffer(ProductTypePattern) if defer_usage_updates else None
 
     def learn_from_product_name(
         self,
@@ -67,6 +81,7 @@ class ProductTypeLearningService:
             existing.confidence = min(1.0, existing.confidence + 0.05)  # 最大1.0
             self.db.commit()
             self.db.refresh(existing)
+            clear_prediction_cache()
             logger.info(f"✏️ Updated pattern: {main_pattern} → {product_type} (confidence: {existing.confidence:.2f})")
             return existing
         else:
@@ -81,6 +96,7 @@ class ProductTypeLearningService:
             self.db.add(new_pattern)
             self.db.commit()
             self.db.refresh(new_pattern)
+            clear_prediction_cache()
             logger.info(f"📚 Learned new pattern: {main_pattern} → {product_type}")
             return new_pattern
 
@@ -101,35 +117,59 @@ class ProductTypeLearningService:
         # 商品名を正規化
         normalized_name = product_name.lower().strip()
 
-        # すべてのパターンを取得（信頼度順）
-        patterns = self.db.query(ProductTypePattern).order_by(
+        # 商品名に含まれるパターンを一括照合（部分一致）
+        matched_ids = get_pattern_matcher(self.db, ProductTypePattern).match_ids(normalized_name)
+        if not matched_ids:
+            return None
+
+        # マッチしたパターンのうち信頼度が最も高いもの
+        best_match = self.db.query(ProductTypePattern).filter(
+            ProductTypePattern.id.in_(matched_ids),
+            ProductTypePattern.confidence > 0
+        ).order_by(
             desc(ProductTypePattern.confidence),
             desc(ProductTypePattern.usage_count)
-        ).all()
-
-        # パターンマッチング（部分一致）
-        best_match = None
-        best_confidence = 0.0
-
-        for pattern_obj in patterns:
-            pattern = pattern_obj.pattern.lower()
-
-            if pattern in normalized_name:
-                # マッチした場合
-                if pattern_obj.confidence > best_confidence:
-                    best_match = pattern_obj
-                    best_confidence = pattern_obj.confidence
+        ).first()
 
         if best_match:
+            best_confidence = best_match.confidence
+
             # 使用回数をインクリメント
-            best_match.usage_count += 1
-            self.db.commit()
+            if self._usage_buffer is not None:
+                self._usage_buffer.record(best_match)
+            else:
+                best_match.usage_count += 1
+                self.db.commit()
 
             logger.info(f"🎯 Predicted: {product_name} → {best_match.product_type} (confidence: {best_confidence:.2f})")
             return (best_match.product_type, best_confidence, f'ml_{best_match.source}')
 
         return None
 
+    def predict_product_type_cached(self, product_name: str) -> Optional[Tuple[str, float, str]]:
+        """
+        商品名から商品タイプを予測（TTLキャッシュ付き）
+
+        同じ商品名の予測はPREDICTION_CACHE_TTL秒間キャッシュから返します。
+        キャッシュヒット時はパターンの使用回数を更新しません。
+        """
+        now = time.monotonic()
+        cached = _prediction_cache.get(product_name)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        result = self.predict_product_type(product_name)
+
+        if len(_prediction_cache) >= PREDICTION_CACHE_MAXSIZE:
+            _prediction_cache.clear()
+        _prediction_cache[product_name] = (now + PREDICTION_CACHE_TTL, result)
+        return result
+
+    def flush_usage_updates(self) -> None:
+        """defer_usage_updates=True で溜めた使用回数の更新を書き込む"""
+        if self._usage_buffer is not None:
+            self._usage_buffer.flush(self.db)
+
     def _extract_patterns(self, product_name: str, product_type: str) -> List[str]:
         """
         商品名から特徴的なパターンを抽出
@@ -183,6 +223,7 @@ class ProductTypeLearningService:
         if pattern:
             self.db.delete(pattern)
             self.db.commit()
+            clear_prediction_cache()
             logger.info(f"🗑️ Deleted pattern: {pattern.pattern} → {pattern.product_type}")
             return True
 
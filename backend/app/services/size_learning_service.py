@@ -11,6 +11,7 @@ import re
 from typing import Optional, Tuple, List, Dict
 from sqlalchemy.orm import Session
 from app.models.size_pattern import SizePattern
+from app.services.pattern_matcher import PatternUsageBuffer, get_pattern_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +19,10 @@ logger = logging.getLogger(__name__)
 class SizeLearningService:
     """サイズ学習サービス"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, defer_usage_updates: bool = False):
         self.db = db
+        # Trueの場合、予測ヒット時の更新を溜めて flush_usage_updates() でまとめて書き込む
+        self._usage_buffer = PatternUsageBuffer(SizePattern, confidence_step=0.05) if defer_usage_updates else None
 
     def learn_from_product_name(
         self,
@@ -120,61 +123,66 @@ class SizeLearningService:
         if not product_name:
             return None
 
-        # すべてのパターンを取得（信頼度が高い順）
-        query = self.db.query(SizePattern).order_by(
-            SizePattern.confidence.desc(),
-            SizePattern.usage_count.desc()
-        )
-
-        # 機種名が指定されている場合は、機種名でフィルタリング（優先）
-        if device_name:
-            device_patterns = query.filter(
-                SizePattern.device_name == device_name
+        # 商品名に含まれるパターンを一括照合し、一致したものだけを取得（信頼度が高い順）
+        matched_ids = get_pattern_matcher(self.db, SizePattern).match_ids(product_name)
+        matched = []
+        if matched_ids:
+            matched = self.db.query(SizePattern).filter(
+                SizePattern.id.in_(matched_ids)
+            ).order_by(
+                SizePattern.confidence.desc(),
+                SizePattern.usage_count.desc()
             ).all()
 
-            for pattern_obj in device_patterns:
-                if pattern_obj.pattern.lower() in product_name.lower():
-                    # 使用回数をインクリメント
-                    pattern_obj.usage_count += 1
-
-                    # 信頼度を微増（最大1.0）
-                    if pattern_obj.confidence < 1.0:
-                        pattern_obj.confidence = min(pattern_obj.confidence + 0.05, 1.0)
-
-                    self.db.commit()
+        # 機種名が指定されている場合は、機種名が一致するパターンを優先
+        if device_name:
+            for pattern_obj in matched:
+                if pattern_obj.device_name == device_name:
+                    # 使用回数をインクリメントし信頼度を微増
+                    confidence = self._record_usage(pattern_obj)
 
                     method = f"ml_{pattern_obj.source}_device"
                     logger.info(
                         f"📏 サイズ予測成功（機種一致）: {product_name[:30]}... + {device_name} → {pattern_obj.size} "
-                        f"(パターン: {pattern_obj.pattern}, 信頼度: {pattern_obj.confidence:.2f}, 方法: {method})"
+                        f"(パターン: {pattern_obj.pattern}, 信頼度: {confidence:.2f}, 方法: {method})"
                     )
 
-                    return pattern_obj.size, pattern_obj.confidence, method
+                    return pattern_obj.size, confidence, method
 
         # 機種名なしのパターンでも試す
-        all_patterns = query.all()
-        for pattern_obj in all_patterns:
-            if pattern_obj.pattern.lower() in product_name.lower():
-                # 使用回数をインクリメント
-                pattern_obj.usage_count += 1
+        if matched:
+            pattern_obj = matched[0]
 
-                # 信頼度を微増（最大1.0）
-                if pattern_obj.confidence < 1.0:
-                    pattern_obj.confidence = min(pattern_obj.confidence + 0.05, 1.0)
+            # 使用回数をインクリメントし信頼度を微増
+            confidence = self._record_usage(pattern_obj)
 
-                self.db.commit()
-
-                method = f"ml_{pattern_obj.source}"
-                logger.info(
-                    f"📏 サイズ予測成功: {product_name[:30]}... → {pattern_obj.size} "
-                    f"(パターン: {pattern_obj.pattern}, 信頼度: {pattern_obj.confidence:.2f}, 方法: {method})"
-                )
+            method = f"ml_{pattern_obj.source}"
+            logger.info(
+                f"📏 サイズ予測成功: {product_name[:30]}... → {pattern_obj.size} "
+                f"(パターン: {pattern_obj.pattern}, 信頼度: {confidence:.2f}, 方法: {method})"
+            )
 
-                return pattern_obj.size, pattern_obj.confidence, method
+            return pattern_obj.size, confidence, method
 
         logger.debug(f"サイズ予測失敗: {product_name[:50]}...")
         return None
 
+    def _record_usage(self, pattern_obj) -> float:
+        """使用回数をインクリメントし信頼度を微増（最大1.0）、反映後の信頼度を返す"""
+        if self._usage_buffer is not None:
+            return self._usage_buffer.record(pattern_obj)
+
+        pattern_obj.usage_count += 1
+        if pattern_obj.confidence < 1.0:
+            pattern_obj.confidence = min(pattern_obj.confidence + 0.05, 1.0)
+        self.db.commit()
+        return pattern_obj.confidence
+
+    def flush_usage_updates(self) -> None:
+        """defer_usage_updates=True で溜めた使用回数・信頼度の更新を書き込む"""
+        if self._usage_buffer is not None:
+            self._usage_buffer.flush(self.db)
+
     def get_all_patterns(self) -> List[SizePattern]:
         """すべての学習パターンを取得"""
         return self.db.query(SizePattern).order_by(
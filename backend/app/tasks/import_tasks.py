@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from app.core.cache import drop_cached_paths_sync
 from app.core.celery_app import celery_app
 from app.core.database import SessionLocal
 from app.models.import_job import ImportJob
@@ -104,7 +105,7 @@ def process_file_import(
         job.errors = parse_result.errors
         job.result_data = {
             'columns': parse_result.columns,
-            'data_sample': parse_result.data[:10] if parse_result.data else [],
+            'data_sample': parse_result.head(10),
             'metadata': parse_result.metadata
         }
         db.commit()
@@ -140,7 +141,8 @@ def process_file_import(
         db.close()
 
 
-@celery_app.task(bind=True, name="import_parsed_data")
+# 取込は冪等ではない（再実行で受注が重複する）ため、受信時にACKしてワーカー異常終了時も再実行しない
+@celery_app.task(bind=True, name="import_parsed_data", acks_late=False)
 def import_parsed_data(
     self,
     job_id: int,
@@ -188,6 +190,12 @@ def import_parsed_data(
             column_mapping=column_mapping
         )
 
+        # 商品・価格ルール・商品タイプ・注文統計が更新されるためレスポンスキャッシュを破棄
+        drop_cached_paths_sync(
+            "/api/v1/products*", "/api/v1/pricing-rules*", "/api/v1/product-types*",
+            "/api/v1/stats*", "/api/v1/settings/stats*"
+        )
+
         return {
             'success': result['success'],
             'job_id': job_id,
@@ -8,7 +8,8 @@ from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from decimal import Decimal
 
-from app.db.base import Base
+from app.core.database import Base
+from app.models import load_all_models
 from app.models.customer_company import CustomerCompany
 from app.models.product import Product
 from app.models.issuer_company import IssuerCompany
@@ -25,6 +26,7 @@ def engine():
     )
 
     # Create all tables
+    load_all_models()
     Base.metadata.create_all(bind=test_engine)
 
     yield test_engine
@@ -45,6 +47,11 @@ def db_session(engine):
     session.rollback()
     session.close()
 
+    # フィクスチャ・テスト内でコミットした行も削除（エンジンはセッション全体で共有）
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
 
 @pytest.fixture
 def test_issuer(db_session: Session):
@@ -53,8 +60,7 @@ def test_issuer(db_session: Session):
         name="テスト請求者株式会社",
         brand_name="テストブランド",
         tax_id="T1234567890123",
-        address="東京都千代田区",
-        postal_code="100-0001",
+        address="〒100-0001 東京都千代田区",
         tel="03-1111-2222",
         email="issuer@test.com"
     )
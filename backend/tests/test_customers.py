@@ -0,0 +1,155 @@
+"""
+Tests for customer API endpoints.
+
+取引先APIの一覧・取得・作成・更新・削除を、非同期セッション（SQLite + aiosqlite）で確認します。
+"""
+
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints import customers
+from app.core.database import Base, get_async_db
+from app.models import load_all_models
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    """テーブルを作成した空のSQLiteファイル"""
+    path = tmp_path / "customers.db"
+    engine = create_engine(f"sqlite:///{path}")
+    load_all_models()
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def app(db_path: Path):
+    """取引先APIのみを登録したアプリ（get_async_db をテスト用のSQLiteに差し替え）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    sessionmaker = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessionmaker() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(customers.router, prefix="/api/v1/customers")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+def make_client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+class TestCustomerCrud:
+    """取引先APIの一覧・取得・作成・更新・削除のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_create_get_and_list(self, app: FastAPI):
+        """
+        作成した取引先を取得・一覧できることを確認
+
+        シナリオ:
+        - コード未指定の場合は CUS から始まるコードが採番される
+        - 一覧は名前順、検索・個人フラグで絞り込める
+        - 取得時に ETag を返し、同じ ETag の再取得は 304
+        """
+        async with make_client(app) as client:
+            created = await client.post("/api/v1/customers/", json={"name": "株式会社ベータ", "code": "B001"})
+            assert created.status_code == 201, created.text
+            generated = await client.post("/api/v1/customers/", json={"name": "田中太郎", "is_individual": True})
+            assert generated.status_code == 201, generated.text
+            assert generated.json()["code"].startswith("CUS")
+
+            customer_id = created.json()["id"]
+            response = await client.get(f"/api/v1/customers/{customer_id}")
+            assert response.status_code == 200
+            assert response.json()["name"] == "株式会社ベータ"
+            etag = response.headers["etag"]
+            cached = await client.get(f"/api/v1/customers/{customer_id}", headers={"If-None-Match": etag})
+            assert cached.status_code == 304
+
+            names = [c["name"] for c in (await client.get("/api/v1/customers/")).json()]
+            assert names == sorted(names) == ["株式会社ベータ", "田中太郎"]
+            search = (await client.get("/api/v1/customers/", params={"search": "ベータ"})).json()
+            assert [c["id"] for c in search] == [customer_id]
+            individuals = (await client.get("/api/v1/customers/", params={"is_individual": True})).json()
+            assert [c["name"] for c in individuals] == ["田中太郎"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_code_is_rejected(self, app: FastAPI):
+        """既存のコードでの作成・更新は400を返すことを確認"""
+        async with make_client(app) as client:
+            await client.post("/api/v1/customers/", json={"name": "取引先A", "code": "A001"})
+            other = (await client.post("/api/v1/customers/", json={"name": "取引先B", "code": "B001"})).json()
+
+            created = await client.post("/api/v1/customers/", json={"name": "取引先C", "code": "A001"})
+            updated = await client.put(f"/api/v1/customers/{other['id']}", json={"code": "A001"})
+
+        assert created.status_code == 400
+        assert updated.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_update_and_delete(self, app: FastAPI):
+        """
+        更新・削除がコミットされることを確認
+
+        シナリオ:
+        - 更新は指定した項目だけを変更する
+        - 削除後の取得・更新・削除は404
+        """
+        async with make_client(app) as client:
+            customer = (await client.post("/api/v1/customers/", json={
+                "name": "取引先A", "code": "A001", "phone": "03-1111-2222"
+            })).json()
+            url = f"/api/v1/customers/{customer['id']}"
+
+            updated = await client.put(url, json={"name": "取引先A（新）"})
+            assert updated.status_code == 200, updated.text
+            saved = (await client.get(url)).json()
+            assert saved["name"] == "取引先A（新）"
+            assert saved["phone"] == "03-1111-2222"
+
+            assert (await client.delete(url)).status_code == 204
+            assert (await client.get(url)).status_code == 404
+            assert (await client.put(url, json={"name": "x"})).status_code == 404
+            assert (await client.delete(url)).status_code == 404
+
+
+class TestCustomerIdentifiers:
+    """識別情報の保存・自動判別のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_save_deduplicates_on_normalized_value(self, app: FastAPI):
+        """
+        表記ゆれの同じ識別情報を別の取引先に保存しないことを確認
+
+        シナリオ:
+        - 取引先Aに店舗名「Shop A」・電話番号を保存する
+        - 取引先Bに空白・大文字小文字だけが違う「shop　a」と同じ電話番号を保存しても追加されない（メールアドレスのみ追加）
+        - 自動判別は表記ゆれのある値でも取引先Aを返す
+        """
+        async with make_client(app) as client:
+            customer_a = (await client.post("/api/v1/customers/", json={"name": "取引先A", "code": "A001"})).json()
+            customer_b = (await client.post("/api/v1/customers/", json={"name": "取引先B", "code": "B001"})).json()
+
+            saved_a = await client.post(f"/api/v1/customers/{customer_a['id']}/identifiers", json={
+                "store_name": "Shop A", "phone": "03-1111-2222"
+            })
+            saved_b = await client.post(f"/api/v1/customers/{customer_b['id']}/identifiers", json={
+                "store_name": "shop　a", "phone": "03-1111-2222", "email": "b@example.com"
+            })
+            detected = await client.post("/api/v1/customers/detect", json={"identifiers": {"store_name": "SHOP A"}})
+            missing = await client.post("/api/v1/customers/999999/identifiers", json={"phone": "x"})
+
+        assert saved_a.json()["saved_count"] == 2
+        assert saved_b.json()["saved_count"] == 1
+        assert detected.json() == {"customer_id": customer_a["id"], "customer_name": "取引先A", "matched_by": "store_name"}
+        assert missing.status_code == 404
@@ -0,0 +1,69 @@
+"""
+Tests for the health check endpoint.
+
+起動時のデータベース初期化の状態（初期化中・成功・失敗）に応じた /health の応答を確認します。
+"""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+async def wait_for_db_init() -> None:
+    await main._db_init_task
+
+
+class TestHealthCheck:
+    """ヘルスチェックのテスト"""
+
+    def test_starting_until_database_initialized(self, monkeypatch):
+        """
+        DB初期化の完了まで503、完了後は200を返すことを確認
+        """
+        initialized = asyncio.Event()
+
+        async def init_db():
+            await initialized.wait()
+
+        monkeypatch.setattr(main, "init_db_async", init_db)
+
+        with TestClient(main.app) as client:
+            starting = client.get("/health")
+            client.portal.call(initialized.set)
+            client.portal.call(wait_for_db_init)
+            healthy = client.get("/health")
+
+        assert starting.status_code == 503
+        assert starting.json()["status"] == "starting"
+        assert healthy.status_code == 200
+        assert healthy.json()["status"] == "healthy"
+
+    def test_unhealthy_when_database_initialization_failed(self, monkeypatch):
+        """
+        DB初期化が例外で終了した場合は503を返し続けることを確認
+
+        シナリオ:
+        - 初期化で接続エラーが発生する（例外はログに出力され、タスクは終了する）
+        - 再起動後に初期化が成功すると200に戻る
+        """
+        async def init_db_fails():
+            raise ConnectionRefusedError("database is down")
+
+        async def init_db_ok():
+            pass
+
+        monkeypatch.setattr(main, "init_db_async", init_db_fails)
+        with TestClient(main.app) as client:
+            client.portal.call(wait_for_db_init)
+            failed = [client.get("/health") for _ in range(2)]
+
+        monkeypatch.setattr(main, "init_db_async", init_db_ok)
+        with TestClient(main.app) as client:
+            client.portal.call(wait_for_db_init)
+            recovered = client.get("/health")
+
+        assert [r.status_code for r in failed] == [503, 503]
+        assert failed[0].json()["status"] == "unhealthy"
+        assert recovered.status_code == 200
@@ -0,0 +1,98 @@
+"""
+Tests for invoice API endpoints.
+
+請求書の更新APIが変更をコミットし、更新後の値を返すことを確認します。
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import invoices
+from app.core.database import get_db
+from app.models.customer_company import CustomerCompany
+from app.models.invoice import Invoice
+from app.models.issuer_company import IssuerCompany
+
+
+@pytest.fixture
+def client(db_session: Session):
+    app = FastAPI()
+    app.include_router(invoices.router, prefix="/api/v1/invoices")
+    app.dependency_overrides[get_db] = lambda: db_session
+    return TestClient(app)
+
+
+@pytest.fixture
+def test_invoice(db_session: Session, test_issuer: IssuerCompany, test_customer: CustomerCompany):
+    invoice = Invoice(
+        invoice_no="INV-TEST-001",
+        issuer_company_id=test_issuer.id,
+        customer_id=test_customer.id,
+        period_start=date(2025, 10, 1),
+        period_end=date(2025, 10, 31),
+        issue_date=date(2025, 11, 1),
+        due_date=date(2025, 11, 30),
+        subtotal_ex_tax=Decimal("1000"),
+        tax_amount=Decimal("100"),
+        total_in_tax=Decimal("1100"),
+        status="draft"
+    )
+    db_session.add(invoice)
+    db_session.commit()
+    db_session.refresh(invoice)
+    return invoice
+
+
+class TestUpdateInvoice:
+    """請求書更新APIのテスト"""
+
+    def test_put_commits_notes_and_status(self, client: TestClient, db_session: Session, test_invoice: Invoice):
+        """
+        備考・ステータスの更新がコミットされることを確認
+
+        シナリオ:
+        - PUTのレスポンスに更新後の値と日時が含まれる
+        - セッションをロールバックしても更新後の値が残っている（コミット済み）
+        """
+        response = client.put(
+            f"/api/v1/invoices/{test_invoice.id}",
+            params={"notes": "再発行分", "status_update": "issued"}
+        )
+
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["notes"] == "再発行分"
+        assert body["status"] == "issued"
+        assert body["created_at"] and body["updated_at"]
+
+        db_session.rollback()
+        db_session.expire_all()
+        saved = db_session.get(Invoice, test_invoice.id)
+        assert saved.notes == "再発行分"
+        assert saved.status == "issued"
+
+    def test_put_without_changes_returns_invoice(self, client: TestClient, test_invoice: Invoice):
+        """更新項目がない場合は現在の請求書を返すことを確認"""
+        response = client.put(f"/api/v1/invoices/{test_invoice.id}")
+
+        assert response.status_code == 200, response.text
+        assert response.json()["invoice_no"] == "INV-TEST-001"
+
+    def test_put_invalid_status_is_rejected(self, client: TestClient, db_session: Session, test_invoice: Invoice):
+        """無効なステータスは400を返し、請求書を変更しないことを確認"""
+        response = client.put(f"/api/v1/invoices/{test_invoice.id}", params={"status_update": "unknown"})
+
+        assert response.status_code == 400
+        db_session.expire_all()
+        assert db_session.get(Invoice, test_invoice.id).status == "draft"
+
+    def test_put_missing_invoice_returns_404(self, client: TestClient):
+        """存在しない請求書は404を返すことを確認"""
+        response = client.put("/api/v1/invoices/999999", params={"notes": "x"})
+
+        assert response.status_code == 404
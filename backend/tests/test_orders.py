@@ -0,0 +1,106 @@
+"""
+Tests for order list API.
+
+受注一覧APIの要約列のみの取得（detailed=false）が、明細付きの一覧と同じ件数・合計を返すことを確認します。
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import orders
+from app.core.database import get_db
+from app.models.customer_company import CustomerCompany
+from app.models.issuer_company import IssuerCompany
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+
+
+@pytest.fixture
+def client(db_session: Session):
+    app = FastAPI()
+    app.include_router(orders.router, prefix="/api/v1/orders")
+    app.dependency_overrides[get_db] = lambda: db_session
+    return TestClient(app)
+
+
+def make_order(order_no: str, order_date: date, customer: CustomerCompany, product: Product, totals, issuer=None) -> Order:
+    order = Order(
+        source="csv",
+        order_no=order_no,
+        order_date=order_date,
+        customer_id=customer.id,
+        issuer_company_id=issuer.id if issuer else None
+    )
+    for total in totals:
+        total = Decimal(total)
+        order.items.append(OrderItem(
+            product_id=product.id,
+            qty=1,
+            unit_price=total,
+            subtotal_ex_tax=total,
+            tax_rate=Decimal("0"),
+            tax_amount=Decimal("0"),
+            total_in_tax=total
+        ))
+    return order
+
+
+@pytest.fixture
+def test_orders(
+    db_session: Session,
+    test_issuer: IssuerCompany,
+    test_customer: CustomerCompany,
+    test_individual_customer: CustomerCompany,
+    test_product_hard_case: Product
+):
+    db_session.add_all([
+        make_order("ORD-1", date(2025, 10, 1), test_customer, test_product_hard_case, ["1100.50", "550.25"], test_issuer),
+        make_order("ORD-2", date(2025, 10, 15), test_customer, test_product_hard_case, ["2200"]),
+        make_order("ORD-3", date(2025, 10, 10), test_individual_customer, test_product_hard_case, []),
+    ])
+    db_session.commit()
+
+
+class TestListOrders:
+    """受注一覧APIのテスト"""
+
+    def test_summary_rows_match_detailed_list(self, client: TestClient, test_orders, test_issuer: IssuerCompany):
+        """
+        要約列のみの一覧が明細付きの一覧と同じ順序・合計を返すことを確認
+
+        シナリオ:
+        - 注文日の新しい順
+        - 明細のない注文は件数0・合計0
+        - 発行会社のない注文は issuer_id / issuer_name が null
+        """
+        detailed = client.get("/api/v1/orders/", params={"detailed": True}).json()
+        rows = client.get("/api/v1/orders/", params={"detailed": False}).json()
+
+        assert [r["order_no"] for r in rows] == [o["order_no"] for o in detailed] == ["ORD-2", "ORD-3", "ORD-1"]
+        assert [r["item_count"] for r in rows] == [len(o["items"]) for o in detailed] == [1, 0, 2]
+        assert [Decimal(r["total_amount"]) for r in rows] == [Decimal(o["total_amount"]) for o in detailed]
+        assert Decimal(rows[2]["total_amount"]) == Decimal("1650.75")
+        assert "items" not in rows[0]
+
+        assert rows[2]["issuer_id"] == test_issuer.id
+        assert rows[2]["issuer_name"] == test_issuer.name
+        assert rows[0]["issuer_id"] is None and rows[0]["issuer_name"] is None
+        assert rows[1]["customer_name"] == "田中太郎"
+
+    def test_summary_rows_apply_filters(self, client: TestClient, test_orders, test_customer: CustomerCompany):
+        """取引先・期間・件数の条件が要約列のみの一覧にも適用されることを確認"""
+        rows = client.get("/api/v1/orders/", params={
+            "detailed": False,
+            "customer_id": test_customer.id,
+            "start_date": "2025-10-01",
+            "end_date": "2025-10-14",
+        }).json()
+        assert [r["order_no"] for r in rows] == ["ORD-1"]
+
+        rows = client.get("/api/v1/orders/", params={"detailed": False, "limit": 1}).json()
+        assert [r["order_no"] for r in rows] == ["ORD-2"]
@@ -0,0 +1,431 @@
+"""
+Tests for CSV / Excel / PDF file parsers.
+
+CSV・Excelパーサーの読み込み結果（値を文字列のまま保持すること、文字コード判定、圧縮ファイル、チャンク読み込みなど）と、
+PDFのページ抽出での共有プロセスプールの扱いを確認します。
+"""
+
+import gzip
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from app.parsers import excel_parser
+from app.parsers.base import QUALITY_CHECK_SAMPLE_ROWS, ParseResult
+from app.parsers.csv_parser import CSVParser
+from app.parsers.excel_parser import ExcelParser
+
+
+CSV_TEXT = (
+    "注文番号,商品名,数量,備考\n"
+    "001,ハードケース(花柄),2,\n"
+    "002,手帳型カバーmirror,10,①ギフト\n"
+    "003,ハードケース(無地),1,髙橋様\n"
+)
+
+EXPECTED_ROWS = [
+    {'注文番号': '001', '商品名': 'ハードケース(花柄)', '数量': '2', '備考': ''},
+    {'注文番号': '002', '商品名': '手帳型カバーmirror', '数量': '10', '備考': '①ギフト'},
+    {'注文番号': '003', '商品名': 'ハードケース(無地)', '数量': '1', '備考': '髙橋様'},
+]
+
+
+def write_csv(path: Path, text: str = CSV_TEXT, encoding: str = 'utf-8') -> Path:
+    """テスト用CSVを拡張子に応じて（.gz / .zip は圧縮して）書き出す"""
+    raw = text.encode(encoding)
+    if path.suffix == '.gz':
+        with gzip.open(path, 'wb') as f:
+            f.write(raw)
+    elif path.suffix == '.zip':
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(path.stem, raw)
+    else:
+        path.write_bytes(raw)
+    return path
+
+
+class TestCSVParser:
+    """CSVパーサーのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_parse_utf8_keeps_values_as_strings(self, tmp_path: Path):
+        """
+        UTF-8のCSVを文字列のまま読み込むことを確認
+
+        シナリオ:
+        - 先頭ゼロの注文番号・空セルを含むCSVを取り込む
+        - 数値変換やNaNへの置き換えが行われない
+        """
+        path = write_csv(tmp_path / "orders.csv")
+
+        result = await CSVParser().parse(path)
+
+        assert result.success, result.errors
+        assert result.encoding.lower().replace('_', '-') in ('utf-8', 'utf-8-sig')
+        assert result.columns == ['注文番号', '商品名', '数量', '備考']
+        assert result.row_count == 3
+        assert result.data == EXPECTED_ROWS
+
+    @pytest.mark.asyncio
+    async def test_parse_shift_jis_with_vendor_characters(self, tmp_path: Path):
+        """
+        機種依存文字（①、髙）を含むShift_JISのCSVをCP932として読み込めることを確認
+        """
+        path = write_csv(tmp_path / "orders_sjis.csv", encoding='cp932')
+
+        result = await CSVParser().parse(path)
+
+        assert result.success, result.errors
+        assert result.encoding.lower() == 'cp932'
+        assert result.data == EXPECTED_ROWS
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("file_name", ["orders.csv.gz", "orders.csv.zip"])
+    async def test_parse_compressed(self, tmp_path: Path, file_name: str):
+        """
+        圧縮されたCSV（.csv.gz / .csv.zip）を展開して読み込めることを確認
+        """
+        path = write_csv(tmp_path / file_name, encoding='cp932')
+
+        result = await CSVParser().parse(path)
+
+        assert result.success, result.errors
+        assert result.encoding.lower() == 'cp932'
+        assert result.data == EXPECTED_ROWS
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("file_name", ["orders.csv", "orders.csv.gz", "orders.csv.zip"])
+    async def test_chunked_read_matches_single_read(self, tmp_path: Path, file_name: str):
+        """
+        チャンク単位で読み込んでも一括読み込みと同じ結果になることを確認
+
+        シナリオ:
+        - 1チャンク2行、閾値1バイトにしてチャンク読み込みを強制する
+        - 行の順序・列・件数が一括読み込みと一致する
+        """
+        path = write_csv(tmp_path / file_name)
+        expected = await CSVParser().parse(path)
+
+        parser = CSVParser()
+        parser.CHUNKED_READ_MIN_BYTES = 1
+        parser.READ_CHUNK_ROWS = 2
+        result = await parser.parse(path)
+
+        assert result.success, result.errors
+        assert result.columns == expected.columns
+        assert result.row_count == 3
+        assert result.data == expected.data == EXPECTED_ROWS
+
+    def test_chunking_uses_uncompressed_size(self, tmp_path: Path):
+        """
+        チャンク読み込みの判定が圧縮後ではなく展開後のサイズで行われることを確認
+
+        シナリオ:
+        - 圧縮後は閾値未満だが展開後は閾値以上になるzipを用意する
+        - チャンク読み込み（複数のDataFrame）になる
+        """
+        text = "a,b\n" + "".join(f"{i},{i}\n" for i in range(200))
+        path = write_csv(tmp_path / "large.csv.zip", text=text)
+        parser = CSVParser()
+        parser.CHUNKED_READ_MIN_BYTES = len(text.encode()) - 1
+        parser.READ_CHUNK_ROWS = 50
+        assert path.stat().st_size < parser.CHUNKED_READ_MIN_BYTES
+
+        chunks = list(parser._read_csv_chunks(path, 'utf-8', ',', 0))
+
+        assert len(chunks) > 1
+        assert sum(len(df) for df in chunks) == 200
+
+    @pytest.mark.asyncio
+    async def test_quality_check_receives_sample_rows_only(self, tmp_path: Path, monkeypatch):
+        """
+        AI品質チェックには先頭 QUALITY_CHECK_SAMPLE_ROWS 行だけが渡されることを確認
+        """
+        text = "商品名,数量\n" + "".join(f"商品{i},{i}\n" for i in range(QUALITY_CHECK_SAMPLE_ROWS * 3))
+        path = write_csv(tmp_path / "many.csv", text=text)
+        parser = CSVParser(ai_provider=object())
+        received = []
+
+        async def fake_check(data, rules=None):
+            received.append(data)
+            return []
+
+        monkeypatch.setattr(parser, "_check_data_quality", fake_check)
+
+        result = await parser.parse(path)
+
+        assert result.success, result.errors
+        assert result.row_count == QUALITY_CHECK_SAMPLE_ROWS * 3
+        assert received == [result.data[:QUALITY_CHECK_SAMPLE_ROWS]]
+
+    def test_pyarrow_reader_keeps_values_as_strings(self, tmp_path: Path):
+        """
+        PyArrowでの読み込みで型推論による値の変化が起きないことを確認
+
+        シナリオ:
+        - 先頭ゼロのコード・郵便番号・電話番号、小数の末尾ゼロ、TRUE、20桁の番号、NA
+        - pandas（Cエンジン, dtype=str）と同じ値になる
+        """
+        pytest.importorskip("pyarrow")
+        path = write_csv(tmp_path / "codes.csv", (
+            "SKU,郵便番号,電話番号,単価,フラグ,注文番号,備考\n"
+            "0012,001-0012,09012345678,1.50,TRUE,12345678901234567890,NA\n"
+            "0100,100-0001,0312345678,2.00,false,00000000000000000001,\n"
+        ))
+        parser = CSVParser()
+
+        df = parser._read_csv_arrow(path, 'utf-8', ',', 0)
+        expected = pd.read_csv(path, **parser._read_csv_options('utf-8', ',', 0))
+
+        assert df.to_dict('records') == [
+            {'SKU': '0012', '郵便番号': '001-0012', '電話番号': '09012345678', '単価': '1.50',
+             'フラグ': 'TRUE', '注文番号': '12345678901234567890', '備考': 'NA'},
+            {'SKU': '0100', '郵便番号': '100-0001', '電話番号': '0312345678', '単価': '2.00',
+             'フラグ': 'false', '注文番号': '00000000000000000001', '備考': ''},
+        ]
+        assert df.to_dict('records') == expected.to_dict('records')
+
+    @pytest.mark.parametrize("text, encoding, skip_rows", [
+        ("\ufeff商品名,,商品名,数量\nケース,x,予備,01\n", 'utf-8', 0),
+        ("出力日: 2025-10-01\n商品名,,商品名,数量\nケース,x,予備,01\n", 'utf-8', 1),
+        ("商品名,,商品名,数量\nケース①,x,予備,01\n", 'cp932', 0),
+    ])
+    def test_pyarrow_reader_names_columns_like_pandas(self, tmp_path: Path, text: str, encoding: str, skip_rows: int):
+        """
+        PyArrowでの読み込みの列名・値がpandasと同じになることを確認
+
+        シナリオ:
+        - BOM付き、先頭の読み飛ばし行、Shift_JIS（CP932）
+        - 空の列名は「Unnamed: n」、重複した列名は「name.1」
+        """
+        pytest.importorskip("pyarrow")
+        path = write_csv(tmp_path / "header.csv", text, encoding=encoding)
+        parser = CSVParser()
+
+        df = parser._read_csv_arrow(path, encoding, ',', skip_rows)
+        expected = pd.read_csv(path, **parser._read_csv_options(encoding, ',', skip_rows))
+
+        assert df.columns.tolist() == expected.columns.tolist() == ['商品名', 'Unnamed: 1', '商品名.1', '数量']
+        assert df.to_dict('records') == expected.to_dict('records')
+
+
+def write_xlsx(path: Path) -> Path:
+    """空行・空ヘッダー・重複ヘッダー・数値セルを含むExcelを書き出す"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "受注"
+    ws.append(["注文番号", "商品名", "数量", None, "商品名"])
+    ws.append(["001", "ハードケース", 2, "メモ", "予備1"])
+    ws.append([None, None, None, None, None])
+    ws.append(["002", "手帳型カバー", 1.5, None, None])
+    ws.append(["003", None, 10.0, None, "予備3"])
+    wb.create_sheet("その他").append(["x"])
+    wb.save(path)
+    return path
+
+
+class TestExcelParser:
+    """Excelパーサーのテスト"""
+
+    def test_streaming_read_matches_pandas(self, tmp_path: Path):
+        """
+        openpyxl の行単位読み込みが pd.read_excel(dtype=str) と同じ結果になることを確認
+
+        シナリオ:
+        - 空行の除外、空ヘッダー（Unnamed: n）、重複ヘッダー（name.1）、整数値の小数（2.0 → '2'）
+        """
+        path = write_xlsx(tmp_path / "orders.xlsx")
+        parser = ExcelParser()
+
+        streamed, sheet = parser._read_rows_streaming(path, None, 0, 0)
+        expected, _ = parser._read_rows_pandas(path, 'openpyxl', None, 0, 0)
+
+        assert sheet == "受注"
+        assert streamed.columns.tolist() == ['注文番号', '商品名', '数量', 'Unnamed: 3', '商品名.1']
+        pd.testing.assert_frame_equal(
+            streamed.reset_index(drop=True),
+            expected.reset_index(drop=True),
+            check_dtype=False
+        )
+
+    @pytest.mark.asyncio
+    async def test_parse_without_calamine(self, tmp_path: Path, monkeypatch):
+        """
+        python-calamine がない環境で .xlsx を openpyxl の行単位読み込みで解析できることを確認
+        """
+        monkeypatch.setattr(excel_parser, "CALAMINE_AVAILABLE", False)
+        path = write_xlsx(tmp_path / "orders.xlsx")
+
+        result = await ExcelParser().parse(path, sheet_name="受注")
+
+        assert result.success, result.errors
+        assert result.metadata['engine'] == 'openpyxl'
+        assert result.row_count == 3
+        assert [row['数量'] for row in result.data] == ['2', '1.5', '10']
+        assert result.data[2]['商品名'] == ''
+
+    @pytest.mark.asyncio
+    async def test_calamine_matches_openpyxl(self, tmp_path: Path, monkeypatch):
+        """python-calamine での読み込み結果が openpyxl の行単位読み込みと同じになることを確認"""
+        pytest.importorskip("python_calamine")
+        path = write_xlsx(tmp_path / "orders.xlsx")
+
+        result = await ExcelParser().parse(path)
+        monkeypatch.setattr(excel_parser, "CALAMINE_AVAILABLE", False)
+        expected = await ExcelParser().parse(path)
+
+        assert result.metadata['engine'] == 'calamine'
+        assert result.columns == expected.columns
+        assert result.data == expected.data
+
+    @pytest.mark.asyncio
+    async def test_get_sheet_names(self, tmp_path: Path):
+        """シート名一覧を取得できることを確認"""
+        path = write_xlsx(tmp_path / "orders.xlsx")
+
+        assert await ExcelParser().get_sheet_names(path) == ["受注", "その他"]
+
+
+class TestParseResult:
+    """解析結果（ParseResult）のテスト"""
+
+    def test_head_does_not_materialize_table(self):
+        """
+        Arrowテーブルで保持した結果から先頭行だけを変換できることを確認
+
+        シナリオ:
+        - head() / repr() では全行の dict リストを作らない
+        - data へのアクセスで全行が変換される
+        """
+        pa = pytest.importorskip("pyarrow")
+        rows = [{'商品名': f'商品{i}', '数量': str(i)} for i in range(100)]
+        result = ParseResult(
+            success=True,
+            data=None,
+            table=pa.Table.from_pylist(rows),
+            columns=['商品名', '数量'],
+            row_count=100,
+            file_type='csv'
+        )
+
+        assert result.head(QUALITY_CHECK_SAMPLE_ROWS) == rows[:QUALITY_CHECK_SAMPLE_ROWS]
+        assert "storage='table'" in repr(result)
+        assert result._data is None
+
+        assert result.data == rows
+        assert "storage='list'" in repr(result)
+
+
+class FakeFuture:
+    """結果または例外を返す Future の代替"""
+
+    def __init__(self, result=None, error=None):
+        self._result = result
+        self._error = error
+        self.cancelled = False
+
+    def result(self):
+        if self._error:
+            raise self._error
+        return self._result
+
+    def cancel(self):
+        self.cancelled = True
+        return True
+
+
+class FakePool:
+    """ページ範囲ごとに決めた Future を返すプロセスプールの代替"""
+
+    def __init__(self, make_future):
+        self.make_future = make_future
+        self.futures = []
+        self.shutdown_calls = []
+
+    def submit(self, fn, file_path, start, end, *args):
+        future = self.make_future(start, end)
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdown_calls.append(cancel_futures)
+
+
+class FakePDF:
+    """ページ数だけを持つPDFの代替"""
+
+    def __init__(self, page_count: int):
+        self.pages = list(range(page_count))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TestPDFPageExtraction:
+    """PDFのページ抽出（共有プロセスプール）のテスト"""
+
+    @pytest.fixture
+    def pdf_parser(self, monkeypatch):
+        pdf_parser = pytest.importorskip("app.parsers.pdf_parser")
+        monkeypatch.setattr(pdf_parser, "MAX_PDF_WORKERS", 4)
+        monkeypatch.setattr(pdf_parser, "_open_pdf", lambda file_path, backend: FakePDF(80))
+        monkeypatch.setattr(
+            pdf_parser,
+            "_extract_page_range",
+            lambda file_path, start, end, *args: [{'page': i + 1} for i in range(start, end)]
+        )
+        return pdf_parser
+
+    def use_pool(self, pdf_parser, monkeypatch, pool: FakePool) -> None:
+        monkeypatch.setattr(pdf_parser, "_pool", pool)
+        monkeypatch.setattr(pdf_parser, "_get_pool", lambda: pdf_parser._pool)
+
+    def test_worker_error_is_raised_to_caller_only(self, pdf_parser, monkeypatch):
+        """
+        子プロセスでのページ抽出エラーは呼び出し元にだけ返すことを確認
+
+        シナリオ:
+        - 1つのページ範囲の抽出が例外になる
+        - 共有プールは破棄・停止されず、このリクエストの残りの抽出だけを取り消す
+        """
+        pool = FakePool(lambda start, end: FakeFuture(error=ValueError("broken page")) if start == 0 else FakeFuture([]))
+        self.use_pool(pdf_parser, monkeypatch, pool)
+
+        with pytest.raises(ValueError, match="broken page"):
+            pdf_parser._extract_pages(Path("large.pdf"), True, False, 'pdfplumber')
+
+        assert pdf_parser._pool is pool
+        assert pool.shutdown_calls == []
+        assert all(future.cancelled for future in pool.futures)
+
+    def test_broken_pool_is_replaced_and_pages_extracted_sequentially(self, pdf_parser, monkeypatch):
+        """子プロセスが異常終了した場合はプールを破棄し（他の抽出は取り消さない）、1プロセスで抽出することを確認"""
+        pool = FakePool(lambda start, end: FakeFuture(error=pdf_parser.BrokenProcessPool("worker died")))
+        self.use_pool(pdf_parser, monkeypatch, pool)
+
+        page_count, pages = pdf_parser._extract_pages(Path("large.pdf"), True, False, 'pdfplumber')
+
+        assert page_count == 80
+        assert [page['page'] for page in pages] == list(range(1, 81))
+        assert pdf_parser._pool is None
+        assert pool.shutdown_calls == [False]
+
+    def test_pool_start_failure_extracts_sequentially(self, pdf_parser, monkeypatch):
+        """子プロセスを起動できない場合（daemonプロセスなど）は1プロセスで抽出することを確認"""
+        def fail_to_start(start, end):
+            raise AssertionError("daemonic processes are not allowed to have children")
+
+        pool = FakePool(fail_to_start)
+        self.use_pool(pdf_parser, monkeypatch, pool)
+
+        page_count, pages = pdf_parser._extract_pages(Path("large.pdf"), True, False, 'pdfplumber')
+
+        assert [page['page'] for page in pages] == list(range(1, 81))
+        assert pdf_parser._pool is None
+        assert pool.shutdown_calls == [False]
@@ -0,0 +1,69 @@
+"""
+Tests for pricing rule API endpoints.
+
+価格ルールの作成・更新APIで、制約（適用対象・NOT NULL）に違反するルールを400で拒否することを確認します。
+"""
+
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import pricing_rules
+from app.core.database import get_db
+from app.models.customer_company import CustomerCompany
+from app.models.pricing_rule import PricingRule
+
+
+@pytest.fixture
+def client(db_session: Session):
+    app = FastAPI()
+    app.include_router(pricing_rules.router, prefix="/api/v1/pricing-rules")
+    app.dependency_overrides[get_db] = lambda: db_session
+    return TestClient(app)
+
+
+@pytest.fixture
+def keyword_rule(db_session: Session, test_customer: CustomerCompany) -> PricingRule:
+    rule = PricingRule(
+        customer_id=test_customer.id,
+        product_type_keyword="ハードケース",
+        price=Decimal("800"),
+        priority=0
+    )
+    db_session.add(rule)
+    db_session.commit()
+    db_session.refresh(rule)
+    return rule
+
+
+class TestPricingRuleConstraints:
+    """価格ルールの制約違反のテスト"""
+
+    def test_create_without_target_is_rejected(self, client: TestClient, test_customer: CustomerCompany):
+        """商品・商品タイプのどちらもない作成は400を返すことを確認"""
+        response = client.post("/api/v1/pricing-rules/", json={"customer_id": test_customer.id, "price": "800"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Either product_id or product_type_keyword must be provided"
+
+    def test_update_violating_constraint_is_rejected(self, client: TestClient, keyword_rule: PricingRule):
+        """
+        DBの制約に違反する更新は400を返すことを確認
+
+        シナリオ:
+        - 単価（NOT NULL）を null に更新する
+        - 変更はロールバックされ、続けて有効な更新ができる
+        """
+        url = f"/api/v1/pricing-rules/{keyword_rule.id}"
+
+        rejected = client.put(url, json={"price": None})
+        updated = client.put(url, json={"priority": 5})
+
+        assert rejected.status_code == 400
+        assert "constraint" in rejected.json()["detail"]
+        assert updated.status_code == 200, updated.text
+        assert Decimal(updated.json()["price"]) == Decimal("800")
+        assert updated.json()["priority"] == 5
@@ -0,0 +1,77 @@
+"""
+Tests for pricing rule list query counts.
+
+価格ルール一覧APIがN+1クエリを発行しないことを確認します。
+"""
+
+from contextlib import contextmanager
+from decimal import Decimal
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.pricing_rules import list_pricing_rules
+from app.models.customer_company import CustomerCompany
+from app.models.product import Product
+from app.models.pricing_rule import PricingRule
+
+
+@contextmanager
+def count_queries(engine):
+    """実行されたSQL文の数を数えるコンテキストマネージャ"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestPricingRulesQueryCount:
+    """価格ルール一覧のクエリ数テスト"""
+
+    def test_list_pricing_rules_no_n_plus_one(
+        self,
+        engine,
+        db_session: Session,
+        test_customer: CustomerCompany,
+        test_product_hard_case: Product
+    ):
+        """
+        100件の価格ルール一覧が3クエリ以内で取得できることを確認
+
+        シナリオ:
+        - 商品指定のルールと商品タイプ指定のルールを合計100件作成
+        - 一覧取得時に顧客・商品が一括ロードされる
+        """
+        # Arrange: 100件の価格ルールを作成
+        for i in range(100):
+            db_session.add(PricingRule(
+                customer_id=test_customer.id,
+                product_id=test_product_hard_case.id if i % 2 == 0 else None,
+                product_type_keyword=None if i % 2 == 0 else f"タイプ{i}",
+                price=Decimal("500") + i,
+                priority=0
+            ))
+        db_session.commit()
+        db_session.expire_all()
+
+        # Act: 一覧を取得
+        with count_queries(engine) as statements:
+            result = list_pricing_rules(
+                customer_id=test_customer.id,
+                product_id=None,
+                skip=0,
+                limit=1000,
+                db=db_session
+            )
+
+        # Assert: ルール1 + 顧客1 + 商品1 の3クエリ以内
+        assert len(result) == 100
+        assert len(statements) <= 3, f"N+1クエリが発生しています: {len(statements)}件"
+        assert all(r.customer_name == test_customer.name for r in result)
+        assert {r.product_sku for r in result if r.product_id} == {test_product_hard_case.sku}
@@ -0,0 +1,212 @@
+"""
+Tests for the Redis-backed response cache middleware.
+
+GETレスポンスのキャッシュ、304応答、期限切れエントリのバックグラウンド更新、
+更新系リクエストでのキャッシュ無効化を確認します（Redisはメモリ上の代替を使用）。
+"""
+
+import asyncio
+import fnmatch
+import json
+
+import httpx
+import pytest
+import redis
+from fastapi import Depends, FastAPI, HTTPException, Response
+
+from app.core import cache
+from app.core.cache import ResponseCacheMiddleware, cache_response, invalidate_cache
+
+
+class InMemoryRedis:
+    """テストで使う redis.asyncio.Redis の代替（キャッシュが使うコマンドのみ、TTLは無視）"""
+
+    def __init__(self):
+        self.store = {}
+        self.available = True
+
+    def _check(self):
+        if not self.available:
+            raise redis.ConnectionError("redis is down")
+
+    async def get(self, key):
+        self._check()
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        self._check()
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def scan_iter(self, match, count=None):
+        self._check()
+        for key in list(self.store):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = InMemoryRedis()
+    monkeypatch.setattr(cache, "_async_client", client)
+    return client
+
+
+@pytest.fixture
+def calls():
+    """エンドポイントが実際に実行された回数"""
+    return {"items": 0, "uncached": 0}
+
+
+@pytest.fixture
+def client(fake_redis, calls):
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+
+    @app.get("/api/v1/items", dependencies=[Depends(cache_response(max_age=60))])
+    async def list_items(q: str = ""):
+        calls["items"] += 1
+        return {"q": q, "version": calls["items"]}
+
+    @app.post("/api/v1/items", dependencies=[Depends(invalidate_cache("/api/v1/items*"))])
+    async def create_item():
+        return {"created": True}
+
+    @app.get("/api/v1/uncached")
+    async def uncached():
+        calls["uncached"] += 1
+        return {"version": calls["uncached"]}
+
+    @app.get("/api/v1/missing", dependencies=[Depends(cache_response(max_age=60))])
+    async def missing():
+        calls["items"] += 1
+        raise HTTPException(status_code=404, detail="not found")
+
+    @app.get("/api/v1/tagged", dependencies=[Depends(cache_response(max_age=60))])
+    async def tagged():
+        return Response(b'{"tagged":true}', media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/api/v1/swr", dependencies=[Depends(cache_response(max_age=60, stale_while_revalidate=600))])
+    async def swr():
+        calls["items"] += 1
+        return {"version": calls["items"]}
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+class TestResponseCacheMiddleware:
+    """レスポンスキャッシュミドルウェアのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_second_get_is_served_from_cache(self, client, calls):
+        """
+        2回目のGETはエンドポイントを実行せずキャッシュから返すことを確認
+
+        シナリオ:
+        - クエリパラメータの順序が違っても同じキャッシュを使う
+        """
+        async with client:
+            first = await client.get("/api/v1/items?q=a&page=1")
+            second = await client.get("/api/v1/items?page=1&q=a")
+
+        assert first.status_code == second.status_code == 200
+        assert first.headers.get("x-cache") is None
+        assert second.headers["x-cache"] == "HIT"
+        assert second.json() == first.json() == {"q": "a", "version": 1}
+        assert second.headers["content-type"] == "application/json"
+        assert calls["items"] == 1
+
+    @pytest.mark.asyncio
+    async def test_routes_without_cache_declaration_are_not_cached(self, client, calls, fake_redis):
+        """cache_response() を宣言していないルートは保存しないことを確認"""
+        async with client:
+            await client.get("/api/v1/uncached")
+            response = await client.get("/api/v1/uncached")
+
+        assert response.json() == {"version": 2}
+        assert calls["uncached"] == 2
+        assert fake_redis.store == {}
+
+    @pytest.mark.asyncio
+    async def test_error_responses_are_not_cached(self, client, calls):
+        """200以外のレスポンスは保存しないことを確認"""
+        async with client:
+            await client.get("/api/v1/missing")
+            response = await client.get("/api/v1/missing")
+
+        assert response.status_code == 404
+        assert calls["items"] == 2
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_matching_paths(self, client, calls):
+        """
+        更新系リクエストが成功すると宣言したパスのキャッシュを削除することを確認
+        """
+        async with client:
+            await client.get("/api/v1/items")
+            await client.post("/api/v1/items")
+            response = await client.get("/api/v1/items")
+
+        assert response.headers.get("x-cache") is None
+        assert response.json()["version"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_etag_returns_not_modified(self, client):
+        """
+        キャッシュ済みのETagとIf-None-Matchが一致すれば本文なしの304を返すことを確認
+        """
+        async with client:
+            await client.get("/api/v1/tagged")
+            response = await client.get("/api/v1/tagged", headers={"If-None-Match": '"v1"'})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == '"v1"'
+        assert response.headers["x-cache"] == "HIT"
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_returned_and_refreshed(self, client, calls, fake_redis):
+        """
+        有効期間切れのエントリを返しつつバックグラウンドで更新することを確認
+
+        シナリオ:
+        - 有効期間切れのエントリには古い本文を X-Cache: STALE で返す
+        - バックグラウンド更新の完了後は新しい本文がキャッシュから返る
+        """
+        async with client:
+            await client.get("/api/v1/swr")
+            key = cache.build_cache_key("/api/v1/swr", "")
+            entry = json.loads(fake_redis.store[key])
+            entry["fresh_until"] = 0
+            fake_redis.store[key] = json.dumps(entry)
+
+            stale = await client.get("/api/v1/swr")
+            await asyncio.gather(*cache._refresh_tasks)
+            refreshed = await client.get("/api/v1/swr")
+
+        assert stale.headers["x-cache"] == "STALE"
+        assert stale.json() == {"version": 1}
+        assert refreshed.headers["x-cache"] == "HIT"
+        assert refreshed.json() == {"version": 2}
+        assert calls["items"] == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_serves_uncached(self, client, calls, fake_redis):
+        """Redisに接続できない場合もキャッシュなしでレスポンスを返すことを確認"""
+        fake_redis.available = False
+
+        async with client:
+            first = await client.get("/api/v1/items")
+            second = await client.get("/api/v1/items")
+            written = await client.post("/api/v1/items")
+
+        assert first.status_code == second.status_code == written.status_code == 200
+        assert second.json()["version"] == 2
+        assert calls["items"] == 2
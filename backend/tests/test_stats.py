@@ -0,0 +1,243 @@
+"""
+Tests for order statistics endpoints.
+
+注文統計（SQLでのGROUP BY集計）の結果を、分類・加算ルールごとに確認します。
+"""
+
+import json
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints.stats import get_detailed_order_stats, get_order_summary
+from app.core.database import Base
+from app.models import load_all_models
+from app.models.customer_company import CustomerCompany
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+
+
+def add_item(order: Order, product: Product, product_type: str, device: str, size: str, qty: int) -> None:
+    order.items.append(OrderItem(
+        product_id=product.id,
+        qty=qty,
+        unit_price=Decimal("1000"),
+        subtotal_ex_tax=Decimal("1000") * qty,
+        tax_amount=Decimal("100") * qty,
+        total_in_tax=Decimal("1100") * qty,
+        product_type=product_type,
+        device_info=device,
+        size_info=size
+    ))
+
+
+def create_stats_db(path: Path):
+    """空の統計用SQLiteファイルを作成し、同期エンジンを返す"""
+    engine = create_engine(f"sqlite:///{path}")
+    load_all_models()
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def stats_db(tmp_path: Path):
+    """
+    統計用の注文データを登録したSQLiteファイル
+
+    取引先A:
+    - 10/01 ハードケース iPhone 15 ×3
+    - 10/01 手帳型カバー（mirror）AQUOS wish4 サイズL ×2（機種が分かるためハードケースにも加算）
+    - 10/01 手帳型カバー 機種・サイズ不明 ×4（ハードケースには加算しない）
+    - 10/05 ハードケース iPhone 15 ×1
+    取引先B:
+    - 10/03 ハードケース Pixel 8 ×5
+    """
+    path = tmp_path / "stats.db"
+    engine = create_stats_db(path)
+
+    with Session(engine) as db:
+        customer_a = CustomerCompany(code="A001", name="取引先A")
+        customer_b = CustomerCompany(code="B001", name="取引先B")
+        hard = Product(sku="HC001", name="ハードケース(花柄)", default_price=Decimal("1000"))
+        mirror = Product(sku="FC001", name="手帳型カバーmirror(花柄)", default_price=Decimal("1500"))
+        plain = Product(sku="FC002", name="手帳型カバー(無地)", default_price=Decimal("1500"))
+        db.add_all([customer_a, customer_b, hard, mirror, plain])
+        db.flush()
+
+        order_a1 = Order(source="csv", order_no="A-1", order_date=date(2025, 10, 1), customer_id=customer_a.id)
+        add_item(order_a1, hard, "ハードケース", "iPhone 15", "-", 3)
+        add_item(order_a1, mirror, "手帳型カバー", "AQUOS wish4", "L", 2)
+        add_item(order_a1, plain, "手帳型カバー", "", "-", 4)
+        order_a2 = Order(source="csv", order_no="A-2", order_date=date(2025, 10, 5), customer_id=customer_a.id)
+        add_item(order_a2, hard, "ハードケース", "iPhone 15", "", 1)
+        order_b = Order(source="csv", order_no="B-1", order_date=date(2025, 10, 3), customer_id=customer_b.id)
+        add_item(order_b, hard, "ハードケース", "Pixel 8", "", 5)
+        db.add_all([order_a1, order_a2, order_b])
+        db.commit()
+        ids = {"a": customer_a.id, "b": customer_b.id, "hard": hard.id}
+
+    engine.dispose()
+    return path, ids
+
+
+@asynccontextmanager
+async def async_session(path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        async with AsyncSession(engine) as db:
+            yield db
+    finally:
+        await engine.dispose()
+
+
+class TestOrderSummary:
+    """注文統計サマリーのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_summary_totals(self, stats_db):
+        """
+        合計値を確認
+
+        シナリオ:
+        - 機種が分かる手帳ケースはハードケース統計に加算される
+        - サイズ不明（'-'）の手帳ケースはサイズ別に含めない
+        """
+        path, _ = stats_db
+        async with async_session(path) as db:
+            response = await get_order_summary(db=db, customer_id=None)
+
+        body = json.loads(response.body)
+        assert body["total_orders"] == 15
+        assert body["hardcase_by_device"]["total"] == 11
+        assert body["notebook_by_size"]["total"] == 2
+        assert body["notebook_by_device"]["total"] == 6
+
+    @pytest.mark.asyncio
+    async def test_summary_filters_by_customer(self, stats_db):
+        """取引先を指定するとその取引先の注文だけを集計することを確認"""
+        path, ids = stats_db
+        async with async_session(path) as db:
+            response = await get_order_summary(db=db, customer_id=ids["b"])
+
+        body = json.loads(response.body)
+        assert body["total_orders"] == 5
+        assert body["hardcase_by_device"] == {"total": 5, "top_devices": [{"device": "Pixel 8", "count": 5}]}
+        assert body["notebook_by_size"] == {"total": 0, "top_sizes": []}
+        assert body["notebook_by_device"] == {"total": 0, "top_devices": []}
+
+    @pytest.mark.asyncio
+    async def test_summary_without_orders_returns_sample(self, tmp_path: Path):
+        """注文がない場合はサンプルデータを返すことを確認"""
+        path = tmp_path / "empty.db"
+        create_stats_db(path).dispose()
+
+        async with async_session(path) as db:
+            response = await get_order_summary(db=db, customer_id=None)
+
+        assert json.loads(response.body)["total_orders"] == 156
+
+    @pytest.mark.asyncio
+    async def test_summary_top5_rankings(self, stats_db):
+        """
+        上位5件のランキングを確認
+
+        シナリオ:
+        - 個数の多い順、同数はキーの昇順
+        - 機種が空の手帳ケースは「不明」として集計される
+        - 6機種以上あっても上位5件のみ
+        """
+        path, ids = stats_db
+        engine = create_engine(f"sqlite:///{path}")
+        with Session(engine) as db:
+            hard = db.get(Product, ids["hard"])
+            order = Order(source="csv", order_no="B-2", order_date=date(2025, 10, 4), customer_id=ids["b"])
+            for device in ["Xperia 10 V", "Galaxy A54", "Pixel 7", "AQUOS sense8"]:
+                add_item(order, hard, "ハードケース", device, "", 1)
+            db.add(order)
+            db.commit()
+        engine.dispose()
+
+        async with async_session(path) as db:
+            response = await get_order_summary(db=db, customer_id=None)
+
+        body = json.loads(response.body)
+        assert body["hardcase_by_device"]["top_devices"] == [
+            {"device": "Pixel 8", "count": 5},
+            {"device": "iPhone 15", "count": 4},
+            {"device": "AQUOS wish4", "count": 2},
+            {"device": "AQUOS sense8", "count": 1},
+            {"device": "Galaxy A54", "count": 1},
+        ]
+        assert body["notebook_by_size"]["top_sizes"] == [{"size": "L", "count": 2}]
+        assert body["notebook_by_device"]["top_devices"] == [
+            {"device": "不明", "count": 4},
+            {"device": "AQUOS wish4", "count": 2},
+        ]
+
+
+class TestDetailedOrderStats:
+    """詳細注文統計のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_detailed_hardcase_stats_by_date(self, stats_db):
+        """
+        機種×日付のハードケース統計を確認
+
+        シナリオ:
+        - 機種は個数の多い順、日付別は日付順
+        - 機種が分かる手帳ケースも件数・個数に加算される
+        """
+        path, ids = stats_db
+        async with async_session(path) as db:
+            response = await get_detailed_order_stats(db=db, customer_id=ids["a"])
+
+        body = json.loads(response.body)
+        assert body["total_orders"] == 10
+        assert body["hardcase_stats"] == [
+            {
+                "device": "iPhone 15",
+                "count": 2,
+                "quantity": 4,
+                "by_date": [
+                    {"date": "2025-10-01", "count": 1, "quantity": 3},
+                    {"date": "2025-10-05", "count": 1, "quantity": 1},
+                ]
+            },
+            {
+                "device": "AQUOS wish4",
+                "count": 1,
+                "quantity": 2,
+                "by_date": [{"date": "2025-10-01", "count": 1, "quantity": 2}]
+            },
+        ]
+
+    @pytest.mark.asyncio
+    async def test_detailed_notebook_stats_by_type(self, stats_db):
+        """
+        種類別の手帳ケース統計を確認
+
+        シナリオ:
+        - 手帳ケースの種類は商品名（mirror）から判定し、該当なしは「その他」
+        - ハードケースのみの明細は種類別統計に含めない
+        """
+        path, ids = stats_db
+        async with async_session(path) as db:
+            response = await get_detailed_order_stats(db=db, customer_id=ids["a"])
+
+        body = json.loads(response.body)
+        assert body["notebook_stats_by_type"] == {
+            "mirror": {
+                "size_stats": [{"size": "L", "count": 1, "quantity": 2}],
+                "device_stats": [{"device": "AQUOS wish4", "count": 1, "quantity": 2}]
+            },
+            "その他": {
+                "size_stats": [],
+                "device_stats": [{"device": "不明", "count": 1, "quantity": 4}]
+            },
+        }